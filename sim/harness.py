@@ -0,0 +1,226 @@
+"""Load and drive src/main.py inside the simulated vex module.
+
+Example::
+
+    from sim.harness import Simulation
+    sim = Simulation()
+    program = sim.load()
+    sim.run_autonomous()
+    print(sim.world.x_mm, sim.world.y_mm, sim.world.heading_deg)
+"""
+
+import __future__
+import builtins
+import os
+import sys
+import types
+
+SIM_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_ROOT = os.path.dirname(SIM_DIR)
+MAIN_PATH = os.path.join(REPO_ROOT, "src", "main.py")
+
+if SIM_DIR not in sys.path:
+    sys.path.insert(0, SIM_DIR)
+
+import vex  # noqa: E402  (the stand-in module in sim/vex)
+
+AUTONOMOUS_MS = 15000
+DRIVER_CONTROL_MS = 105000
+
+
+def compile_program(path=MAIN_PATH, source=None):
+    """Compile the robot program for CPython.
+
+    The brain does not evaluate annotations, but CPython does; main.py has
+    forward references in its annotations, so they are compiled lazily.
+    """
+    if source is None:
+        with open(path) as f:
+            source = f.read()
+    return compile(source, path, "exec", flags=__future__.annotations.compiler_flag, dont_inherit=True)
+
+
+class SerialPort:
+    """Stand-in for the brain's USB serial port, where the program's standard output goes.
+
+    Bytes are passed to ``sink`` (a binary file object, e.g. one end of a
+    pseudo-terminal) or discarded if there is none. A sink that would block
+    (a full pty) loses the bytes, like a port nobody is reading.
+    """
+
+    def __init__(self, sink=None):
+        self.sink = sink
+        self.bytes_written = 0
+        self.bytes_lost = 0
+
+    def write(self, data):
+        data = bytes(data)
+        self.bytes_written += len(data)
+        if self.sink is not None:
+            try:
+                written = self.sink.write(data)
+                self.sink.flush()
+            except BlockingIOError as e:
+                written = e.characters_written
+            if written is None:
+                written = 0  # Unbuffered non-blocking files return None when they would block
+            if written < len(data):
+                self.bytes_lost += len(data) - written
+        return len(data)
+
+    def flush(self):
+        pass
+
+
+class _ProgramStdout:
+    """The program's ``sys.stdout``: text and binary writes both go to the serial port."""
+
+    def __init__(self, port):
+        self.buffer = port
+
+    def write(self, text):
+        return self.buffer.write(text.encode())
+
+    def flush(self):
+        pass
+
+
+class _ProgramSys(types.ModuleType):
+    """The program's ``sys`` module: the real one, with stdout going to the serial port."""
+
+    def __init__(self, port):
+        super().__init__("sys")
+        self.stdout = _ProgramStdout(port)
+
+    def __getattr__(self, name):
+        return getattr(sys, name)
+
+
+class Simulation:
+    """One simulated robot: virtual clock, physics world and the loaded program.
+
+    ``serial`` is where the program's USB serial output goes: a binary file
+    object, or None to discard it. ``self.serial`` counts the bytes written.
+    """
+
+    def __init__(self, noise=None, blocks=None, physics_step_ms=5.0, sd_files=None, serial=None):
+        self.state = vex.reset(noise, blocks, physics_step_ms, sd_files)
+        self.kernel = self.state.kernel
+        self.world = self.state.world
+        self.serial = SerialPort(serial)
+        self.program = None
+
+    # ---------------------------------------------------------------- access
+    @property
+    def now_ms(self):
+        return self.kernel.now_ms
+
+    @property
+    def brain(self):
+        return self.state.brain
+
+    @property
+    def controller(self):
+        return self.state.controllers[0] if self.state.controllers else None
+
+    @property
+    def competition(self):
+        return self.state.competition
+
+    # ----------------------------------------------------------------- setup
+    def load(self, path=MAIN_PATH, code=None, module_name="main"):
+        """Execute the robot program's top level, as the brain does at program start."""
+        module = types.ModuleType(module_name)
+        module.__file__ = path
+        module.__builtins__ = self._program_builtins()
+        sys.modules[module_name] = module
+        exec(code if code is not None else compile_program(path), module.__dict__)
+        self.program = module
+        return module
+
+    def _program_builtins(self):
+        """Builtins for the program, with ``import sys`` and ``print()`` going to the serial port"""
+        program_sys = _ProgramSys(self.serial)
+
+        def program_import(name, *args, **kwargs):
+            if name == "sys":
+                return program_sys
+            return builtins.__import__(name, *args, **kwargs)
+
+        def program_print(*args, **kwargs):
+            kwargs.setdefault("file", program_sys.stdout)
+            builtins.print(*args, **kwargs)
+
+        return dict(builtins.__dict__, __import__=program_import, print=program_print)
+
+    def advance(self, duration_ms):
+        """Let every simulated thread run for ``duration_ms`` of virtual time."""
+        vex.wait(duration_ms, vex.MSEC)
+
+    # ------------------------------------------------------------ field control
+    def run_autonomous(self, duration_ms=AUTONOMOUS_MS, field_control=True):
+        """Run a full autonomous period and disable the robot afterwards."""
+        comp = self.competition
+        comp.field_control = field_control
+        comp.start_autonomous()
+        self.advance(duration_ms)
+        comp.disable()
+        self.advance(20)
+
+    def run_driver_control(self, duration_ms=DRIVER_CONTROL_MS, inputs=None, field_control=True):
+        """Run driver control, replaying ``inputs`` (a list of ``InputEvent``) if given."""
+        comp = self.competition
+        comp.field_control = field_control
+        comp.start_driver_control()
+        if inputs:
+            self.kernel.spawn(self._play_inputs, (list(inputs), self.now_ms), "input_player")
+        self.advance(duration_ms)
+        comp.disable()
+        self.advance(20)
+
+    def run_match(self, driver_inputs=None, auton_ms=AUTONOMOUS_MS, driver_ms=DRIVER_CONTROL_MS):
+        """Autonomous, then driver control, like a match on a field controller."""
+        self.run_autonomous(auton_ms)
+        self.run_driver_control(driver_ms, driver_inputs)
+
+    def _play_inputs(self, events, start_ms):
+        controller = self.controller
+        for event in sorted(events, key=lambda e: e.time_ms):
+            delay = start_ms + event.time_ms - self.kernel.now_ms
+            if delay > 0:
+                vex.wait(delay, vex.MSEC)
+            event.apply(controller, self.brain)
+
+    def touch(self, x, y, hold_ms=50):
+        """Tap the brain screen at (x, y)."""
+        self.brain.screen.touch(x, y)
+        self.advance(hold_ms)
+        self.brain.screen.release()
+
+
+class InputEvent:
+    """A timestamped controller (or touchscreen) input change.
+
+    ``control`` is an axis number (1-4), a button name as used in
+    ControllerSettings ("R1", "Up", ...) or "touch" for the brain screen, in
+    which case ``value`` is an (x, y) tuple or None for release.
+    """
+
+    def __init__(self, time_ms, control, value):
+        self.time_ms = time_ms
+        self.control = control
+        self.value = value
+
+    def apply(self, controller, brain=None):
+        if self.control == "touch":
+            if self.value is None:
+                brain.screen.release()
+            else:
+                brain.screen.touch(*self.value)
+        elif isinstance(self.control, int):
+            getattr(controller, "axis" + str(self.control)).set(self.value)
+        else:
+            getattr(controller, "button" + self.control).set(bool(self.value))
+
+    def __repr__(self):
+        return "InputEvent(" + str(self.time_ms) + ", " + repr(self.control) + ", " + repr(self.value) + ")"
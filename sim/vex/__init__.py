@@ -0,0 +1,970 @@
+"""Desktop stand-in for the VEX V5 ``vex`` Python module.
+
+Only the parts of the API used by src/main.py are provided. Devices talk to a
+shared physics model (``_world.World``) and all timing runs on a virtual clock
+(``_kernel.Kernel``), so programs run headless and faster than real time.
+
+A simulation is (re)started with ``reset()``; ``sim.harness`` wraps that and
+loads the robot program.
+"""
+
+from ._kernel import Kernel, SimulationDeadlock, ThreadKilled
+from ._world import Block, Noise, RobotGeometry, World
+
+__all__ = [
+    "Brain", "Controller", "Motor", "MotorGroup", "Inertial", "Optical", "Pneumatics", "Timer", "Thread",
+    "Competition", "Event", "wait", "Ports", "GearSetting", "Color", "FontType", "LedStateType",
+    "DirectionType", "VelocityUnits", "PercentUnits", "RotationUnits", "TimeUnits", "BrakeType",
+    "CurrentUnits", "TemperatureUnits", "VoltageUnits", "TorqueUnits", "PowerUnits",
+    "FORWARD", "REVERSE", "PERCENT", "RPM", "DEGREES", "TURNS", "MSEC", "SECONDS", "BRAKE", "COAST", "HOLD",
+    "LEFT", "RIGHT", "AMP", "VOLT", "WATT",
+]
+
+
+# =============================================================================
+# SIMULATION STATE
+# =============================================================================
+
+class _Sim:
+    kernel = None
+    world = None
+    brain = None
+    sd_files = {}
+    controllers = []
+    competition = None
+    device_calls = 0    # Number of device API calls made by the program
+    call_log = None     # Optional list of (time_ms, device, method, args) for instrumented runs
+
+
+def reset(noise=None, blocks=None, physics_step_ms=5.0, sd_files=None):
+    """Start a fresh simulation and make the calling thread its main task.
+
+    ``sd_files`` preloads the SD card (filename -> bytes), e.g. with the files
+    saved by a previous run, to simulate a power cycle.
+    """
+    _Sim.kernel = Kernel(physics_step_ms)
+    _Sim.world = World(noise, blocks)
+    _Sim.kernel.add_advance_hook(_Sim.world.step)
+    _Sim.kernel.adopt_current_thread("main")
+    _Sim.brain = None
+    _Sim.controllers = []
+    _Sim.competition = None
+    _Sim.device_calls = 0
+    _Sim.call_log = None
+    _Sim.sd_files = {name: bytes(data) for name, data in (sd_files or {}).items()}
+    return _Sim
+
+
+def state():
+    """Return the live simulation state (kernel, world, brain, controllers, competition)."""
+    return _Sim
+
+
+def _record(device, method, args=()):
+    _Sim.device_calls += 1
+    if _Sim.call_log is not None:
+        _Sim.call_log.append((_Sim.kernel.now_ms, device, method, args))
+
+
+def _spawn_callback(callback, args=()):
+    if callback is not None:
+        _Sim.kernel.spawn(callback, args, getattr(callback, "__name__", "callback"))
+
+
+# =============================================================================
+# ENUMS AND UNITS
+# =============================================================================
+
+class _Enum:
+    def __init__(self, kind, value, name):
+        self.kind = kind
+        self.value = value
+        self.name = name
+
+    def __repr__(self):
+        return self.name
+
+    def __eq__(self, other):
+        return isinstance(other, _Enum) and other.kind == self.kind and other.value == self.value
+
+    def __ne__(self, other):
+        return not self.__eq__(other)
+
+    def __hash__(self):
+        return hash((self.kind, self.value))
+
+
+class DirectionType:
+    FORWARD = _Enum("direction", 0, "FORWARD")
+    REVERSE = _Enum("direction", 1, "REVERSE")
+
+
+class VelocityUnits:
+    PERCENT = _Enum("units", 0, "PERCENT")
+    RPM = _Enum("units", 1, "RPM")
+
+
+class PercentUnits:
+    PERCENT = VelocityUnits.PERCENT
+
+
+class RotationUnits:
+    DEG = _Enum("rotation", 0, "DEGREES")
+    REV = _Enum("rotation", 1, "TURNS")
+
+
+class TimeUnits:
+    SECONDS = _Enum("time", 0, "SECONDS")
+    MSEC = _Enum("time", 1, "MSEC")
+
+
+class BrakeType:
+    COAST = _Enum("brake", 0, "COAST")
+    BRAKE = _Enum("brake", 1, "BRAKE")
+    HOLD = _Enum("brake", 2, "HOLD")
+
+
+class CurrentUnits:
+    AMP = _Enum("current", 0, "AMP")
+
+
+class TemperatureUnits:
+    CELSIUS = _Enum("temperature", 0, "CELSIUS")
+    FAHRENHEIT = _Enum("temperature", 1, "FAHRENHEIT")
+
+
+class VoltageUnits:
+    VOLT = _Enum("voltage", 0, "VOLT")
+    MV = _Enum("voltage", 1, "MV")
+
+
+class TorqueUnits:
+    NM = _Enum("torque", 0, "NM")
+
+
+class PowerUnits:
+    WATT = _Enum("power", 0, "WATT")
+
+
+class LedStateType:
+    OFF = _Enum("led", 0, "OFF")
+    ON = _Enum("led", 1, "ON")
+
+
+class FontType:
+    MONO12 = _Enum("font", 12, "MONO12")
+    MONO15 = _Enum("font", 15, "MONO15")
+    MONO20 = _Enum("font", 20, "MONO20")
+    MONO30 = _Enum("font", 30, "MONO30")
+    MONO40 = _Enum("font", 40, "MONO40")
+    PROP20 = _Enum("font", 120, "PROP20")
+
+
+class GearSetting:
+    RATIO_36_1 = 0
+    RATIO_18_1 = 1
+    RATIO_6_1 = 2
+
+
+class Ports:
+    pass
+
+
+for _i in range(1, 22):
+    setattr(Ports, "PORT" + str(_i), _i - 1)
+
+
+class Color:
+    BLACK = 0x000000
+    WHITE = 0xFFFFFF
+    RED = 0xFF0000
+    GREEN = 0x00FF00
+    BLUE = 0x001287
+    YELLOW = 0xFFFF00
+    ORANGE = 0xFF8000
+    PURPLE = 0xFF00FF
+    CYAN = 0x00FFFF
+    TRANSPARENT = -1
+
+
+FORWARD = DirectionType.FORWARD
+REVERSE = DirectionType.REVERSE
+PERCENT = VelocityUnits.PERCENT
+RPM = VelocityUnits.RPM
+DEGREES = RotationUnits.DEG
+TURNS = RotationUnits.REV
+MSEC = TimeUnits.MSEC
+SECONDS = TimeUnits.SECONDS
+COAST = BrakeType.COAST
+BRAKE = BrakeType.BRAKE
+HOLD = BrakeType.HOLD
+AMP = CurrentUnits.AMP
+VOLT = VoltageUnits.VOLT
+WATT = PowerUnits.WATT
+LEFT = _Enum("turn", 0, "LEFT")
+RIGHT = _Enum("turn", 1, "RIGHT")
+
+
+def _to_ms(value, units):
+    return value * 1000.0 if units == SECONDS else float(value)
+
+
+# =============================================================================
+# TIMING AND THREADS
+# =============================================================================
+
+def wait(time, units=MSEC):
+    """Block the calling thread for the given amount of virtual time."""
+    _Sim.kernel.sleep(_to_ms(time, units))
+
+
+class Timer:
+    def __init__(self):
+        self._start_ms = _Sim.kernel.now_ms
+
+    def time(self, units=MSEC):
+        elapsed = _Sim.kernel.now_ms - self._start_ms
+        return elapsed / 1000.0 if units == SECONDS else elapsed
+
+    def value(self):
+        return self.time(SECONDS)
+
+    def clear(self):
+        self._start_ms = _Sim.kernel.now_ms
+
+    def reset(self):
+        self.clear()
+
+    def system(self):
+        return int(_Sim.kernel.now_ms)
+
+    def system_high_res(self):
+        return int(_Sim.kernel.now_ms * 1000)
+
+    def event(self, callback, delay):
+        def _delayed():
+            wait(delay, MSEC)
+            callback()
+        _spawn_callback(_delayed)
+
+
+class Thread:
+    def __init__(self, callback, args=()):
+        self._task = _Sim.kernel.spawn(callback, args, getattr(callback, "__name__", "thread"))
+
+    def stop(self):
+        _Sim.kernel.kill(self._task)
+
+    @staticmethod
+    def sleep_for(duration, units=MSEC):
+        wait(duration, units)
+
+
+class Event:
+    def __init__(self, callback=None, args=()):
+        self._callbacks = []
+        if callback is not None:
+            self._callbacks.append((callback, args))
+
+    def __call__(self, callback, args=()):
+        self._callbacks.append((callback, args))
+
+    def set(self, callback, args=()):
+        self._callbacks.append((callback, args))
+
+    def broadcast(self):
+        for callback, args in self._callbacks:
+            _spawn_callback(callback, args)
+
+    def broadcast_and_wait(self, timeout=60000):
+        for callback, args in self._callbacks:
+            callback(*args)
+
+
+# =============================================================================
+# BRAIN
+# =============================================================================
+
+class _Screen:
+    """Brain screen: keeps a text grid and a count of drawing operations."""
+
+    ROWS = 12
+    COLUMNS = 48
+    CELL_WIDTH = 10
+    CELL_HEIGHT = 20
+
+    def __init__(self):
+        self.row = 1
+        self.column = 1
+        self.text = [[" "] * self.COLUMNS for _ in range(self.ROWS)]
+        self.draw_ops = 0
+        self.clears = 0
+        self.renders = 0
+        self.double_buffered = False
+        self.touch_x = 0
+        self.touch_y = 0
+        self.touching = False
+        self._pressed = []
+        self._released = []
+        self._font_width = 10
+        self._font_height = 20
+
+    def _op(self, method, args=()):
+        self.draw_ops += 1
+        _record("brain.screen", method, args)
+
+    # Text
+    def print(self, *args, sep=" "):
+        self._op("print", args)
+        message = sep.join(str(a) for a in args)
+        if 1 <= self.row <= self.ROWS:
+            line = self.text[self.row - 1]
+            for ch in message:
+                if 1 <= self.column <= self.COLUMNS:
+                    line[self.column - 1] = ch
+                self.column += 1
+
+    def print_at(self, *args, x=0, y=0, sep=" ", opaque=True):
+        self._op("print_at", args)
+
+    def set_cursor(self, row, column):
+        self._op("set_cursor", (row, column))
+        self.row = row
+        self.column = column
+
+    def new_line(self):
+        self._op("new_line")
+        self.row += 1
+        self.column = 1
+
+    def next_row(self):
+        self.new_line()
+
+    def clear_screen(self, color=Color.BLACK):
+        self._op("clear_screen")
+        self.clears += 1
+        self.text = [[" "] * self.COLUMNS for _ in range(self.ROWS)]
+
+    def clear_row(self, row=None, color=Color.BLACK):
+        self._op("clear_row", (row,))
+        row = self.row if row is None else row
+        if 1 <= row <= self.ROWS:
+            self.text[row - 1] = [" "] * self.COLUMNS
+
+    def clear_line(self, row=None, color=Color.BLACK):
+        self.clear_row(row, color)
+
+    def row_text(self, row):
+        return "".join(self.text[row - 1]).rstrip()
+
+    # Drawing
+    def set_pen_color(self, color):
+        self._op("set_pen_color")
+
+    def set_fill_color(self, color):
+        self._op("set_fill_color")
+
+    def set_pen_width(self, width):
+        self._op("set_pen_width")
+
+    def set_font(self, font):
+        self._op("set_font")
+        size = font.value % 100 if isinstance(font, _Enum) else 20
+        self._font_height = size
+        self._font_width = max(1, size // 2)
+
+    def draw_rectangle(self, x, y, width, height, color=None):
+        self._op("draw_rectangle", (x, y, width, height))
+
+    def draw_line(self, x1, y1, x2, y2):
+        self._op("draw_line")
+
+    def draw_pixel(self, x, y):
+        self._op("draw_pixel")
+
+    def draw_circle(self, x, y, radius, color=None):
+        self._op("draw_circle")
+
+    def get_string_width(self, text):
+        self._op("get_string_width")
+        return len(str(text)) * self._font_width
+
+    def get_string_height(self, text):
+        self._op("get_string_height")
+        return self._font_height
+
+    def render(self):
+        self._op("render")
+        self.double_buffered = True
+        self.renders += 1
+        return True
+
+    # Touch
+    def pressed(self, callback, args=()):
+        self._pressed.append((callback, args))
+
+    def released(self, callback, args=()):
+        self._released.append((callback, args))
+
+    def pressing(self):
+        return self.touching
+
+    def x_position(self):
+        return self.touch_x
+
+    def y_position(self):
+        return self.touch_y
+
+    def touch(self, x, y):
+        """Simulate a finger landing at (x, y)."""
+        self.touch_x = x
+        self.touch_y = y
+        self.touching = True
+        for callback, args in self._pressed:
+            _spawn_callback(callback, args)
+
+    def release(self):
+        """Simulate the finger lifting off the screen."""
+        self.touching = False
+        for callback, args in self._released:
+            _spawn_callback(callback, args)
+
+
+class _Battery:
+    def voltage(self, units=VOLT):
+        _record("brain.battery", "voltage")
+        volts = _Sim.world.battery_voltage
+        return volts * 1000.0 if units == VoltageUnits.MV else volts
+
+    def current(self, units=AMP):
+        _record("brain.battery", "current")
+        return _Sim.world.battery_current
+
+    def capacity(self, units=PERCENT):
+        _record("brain.battery", "capacity")
+        return 100
+
+
+class _SdCard:
+    """SD card backed by an in-memory dictionary (or a host directory if given)."""
+
+    def __init__(self):
+        self.files = _Sim.sd_files
+        self.inserted = True
+
+    def is_inserted(self):
+        return self.inserted
+
+    def exists(self, *args):
+        return self.inserted and args[0] in self.files
+
+    def filesize(self, filename):
+        return len(self.files.get(filename, b""))
+
+    def size(self, filename):
+        return self.filesize(filename)
+
+    def loadfile(self, filename, *args):
+        _record("brain.sdcard", "loadfile", (filename,))
+        if not self.inserted:
+            return bytearray()
+        return bytearray(self.files.get(filename, b""))
+
+    def savefile(self, filename, buffer=bytearray()):
+        _record("brain.sdcard", "savefile", (filename,))
+        if not self.inserted:
+            return 0
+        self.files[filename] = bytes(buffer)
+        return len(buffer)
+
+    def appendfile(self, filename, buffer=bytearray()):
+        _record("brain.sdcard", "appendfile", (filename,))
+        if not self.inserted:
+            return 0
+        self.files[filename] = self.files.get(filename, b"") + bytes(buffer)
+        return len(buffer)
+
+
+class _ThreeWirePort:
+    def __init__(self, name):
+        self.name = name
+
+
+class _ThreeWire:
+    def __init__(self):
+        for letter in "abcdefgh":
+            setattr(self, letter, _ThreeWirePort(letter))
+
+
+class Brain:
+    def __init__(self):
+        self.screen = _Screen()
+        self.timer = Timer()
+        self.battery = _Battery()
+        self.sdcard = _SdCard()
+        self.three_wire_port = _ThreeWire()
+        _Sim.brain = self
+
+    def program_stop(self):
+        raise ThreadKilled()
+
+
+# =============================================================================
+# CONTROLLER
+# =============================================================================
+
+class _Axis:
+    def __init__(self, name):
+        self.name = name
+        self.value = 0
+        self._changed = []
+
+    def position(self, units=PERCENT):
+        _record("controller." + self.name, "position")
+        return self.value
+
+    def changed(self, callback, args=()):
+        self._changed.append((callback, args))
+
+    def set(self, value):
+        """Simulate the stick moving to ``value`` (-100..100)."""
+        if value != self.value:
+            self.value = value
+            for callback, args in self._changed:
+                _spawn_callback(callback, args)
+
+
+class _Button:
+    def __init__(self, name):
+        self.name = name
+        self.down = False
+        self._pressed = []
+        self._released = []
+
+    def pressing(self):
+        _record("controller." + self.name, "pressing")
+        return self.down
+
+    def pressed(self, callback, args=()):
+        self._pressed.append((callback, args))
+
+    def released(self, callback, args=()):
+        self._released.append((callback, args))
+
+    def set(self, down):
+        """Simulate the button being pressed (True) or released (False)."""
+        if down == self.down:
+            return
+        self.down = down
+        for callback, args in (self._pressed if down else self._released):
+            _spawn_callback(callback, args)
+
+
+class _ControllerScreen:
+    ROWS = 3
+    COLUMNS = 19
+
+    def __init__(self):
+        self.row = 1
+        self.column = 1
+        self.text = [[" "] * self.COLUMNS for _ in range(self.ROWS)]
+
+    def print(self, *args, sep=" "):
+        _record("controller.screen", "print", args)
+        message = sep.join(str(a) for a in args)
+        if 1 <= self.row <= self.ROWS:
+            line = self.text[self.row - 1]
+            for ch in message:
+                if 1 <= self.column <= self.COLUMNS:
+                    line[self.column - 1] = ch
+                self.column += 1
+
+    def set_cursor(self, row, column):
+        _record("controller.screen", "set_cursor", (row, column))
+        self.row = row
+        self.column = column
+
+    def clear_line(self, row=None):
+        _record("controller.screen", "clear_line", (row,))
+        row = self.row if row is None else row
+        if 1 <= row <= self.ROWS:
+            self.text[row - 1] = [" "] * self.COLUMNS
+
+    def clear_row(self, row=None):
+        self.clear_line(row)
+
+    def clear_screen(self):
+        _record("controller.screen", "clear_screen")
+        self.text = [[" "] * self.COLUMNS for _ in range(self.ROWS)]
+
+    def new_line(self):
+        self.row += 1
+        self.column = 1
+
+    def next_row(self):
+        self.new_line()
+
+    def row_text(self, row):
+        return "".join(self.text[row - 1]).rstrip()
+
+
+class Controller:
+    def __init__(self, *args):
+        self.axis1 = _Axis("axis1")
+        self.axis2 = _Axis("axis2")
+        self.axis3 = _Axis("axis3")
+        self.axis4 = _Axis("axis4")
+        for name in ("A", "B", "X", "Y", "L1", "L2", "R1", "R2", "Up", "Down", "Left", "Right"):
+            setattr(self, "button" + name, _Button(name))
+        self.screen = _ControllerScreen()
+        _Sim.controllers.append(self)
+
+    def rumble(self, pattern):
+        _record("controller", "rumble", (pattern,))
+
+
+# =============================================================================
+# DEVICES
+# =============================================================================
+
+class Motor:
+    def __init__(self, port, *args):
+        gearing = GearSetting.RATIO_18_1
+        reversed_ = False
+        for arg in args:
+            if isinstance(arg, bool):
+                reversed_ = arg
+            elif isinstance(arg, int):
+                gearing = arg
+        self.port = port
+        self.reversed = reversed_
+        self._model = _Sim.world.register_motor(port + 1, gearing)
+        self._velocity_pct = 50.0
+        self._stopping = COAST
+        self._name = "motor" + str(port + 1)
+
+    def _speed_pct(self, velocity, units):
+        if units == RPM:
+            return velocity / self._model.free_rpm * 100.0
+        return float(velocity)
+
+    def spin(self, direction, velocity=None, units=PERCENT):
+        _record(self._name, "spin", (direction, velocity))
+        speed = self._velocity_pct if velocity is None else self._speed_pct(velocity, units)
+        if direction == REVERSE:
+            speed = -speed
+        self._model.target_deg = None
+        self._model.command_pct = max(-100.0, min(100.0, speed))
+
+    def spin_for(self, direction, rotation, units=DEGREES, velocity=None, units_v=PERCENT, wait=True):
+        _record(self._name, "spin_for", (direction, rotation))
+        degrees = rotation * 360.0 if units == TURNS else float(rotation)
+        if direction == REVERSE:
+            degrees = -degrees
+        speed = self._velocity_pct if velocity is None else self._speed_pct(velocity, units_v)
+        self._model.command_pct = abs(speed)
+        self._model.target_deg = self._model.position_deg + degrees
+        if wait:
+            while self._model.target_deg is not None:
+                _Sim.kernel.sleep(5)
+            return True
+        return False
+
+    def spin_to_position(self, rotation, units=DEGREES, velocity=None, units_v=PERCENT, wait=True):
+        degrees = rotation * 360.0 if units == TURNS else float(rotation)
+        delta = degrees - self._model.position_deg
+        return self.spin_for(FORWARD, delta, DEGREES, velocity, units_v, wait)
+
+    def stop(self, mode=None):
+        _record(self._name, "stop", (mode,))
+        self._model.target_deg = None
+        self._model.command_pct = 0.0
+        if mode is not None and mode != COAST:
+            # Active braking: bleed speed faster than coasting
+            self._model.velocity_pct *= 0.5
+
+    def set_velocity(self, velocity, units=PERCENT):
+        _record(self._name, "set_velocity", (velocity,))
+        self._velocity_pct = self._speed_pct(velocity, units)
+
+    def set_stopping(self, mode):
+        _record(self._name, "set_stopping", (mode,))
+        self._stopping = mode
+
+    def set_max_torque(self, value, units=PERCENT):
+        _record(self._name, "set_max_torque", (value,))
+
+    def set_timeout(self, value, units=MSEC):
+        _record(self._name, "set_timeout", (value,))
+
+    def reset_position(self):
+        self._model.position_deg = 0.0
+
+    def set_position(self, value, units=DEGREES):
+        self._model.position_deg = value * 360.0 if units == TURNS else float(value)
+
+    def position(self, units=DEGREES):
+        _record(self._name, "position")
+        degrees = self._model.position_deg
+        return degrees / 360.0 if units == TURNS else degrees
+
+    def velocity(self, units=PERCENT):
+        _record(self._name, "velocity")
+        if units == RPM:
+            return self._model.velocity_pct / 100.0 * self._model.free_rpm
+        return self._model.velocity_pct
+
+    def is_spinning(self):
+        _record(self._name, "is_spinning")
+        return self._model.is_spinning()
+
+    def is_done(self):
+        return not self.is_spinning()
+
+    def current(self, units=AMP):
+        _record(self._name, "current")
+        return self._model.current_a
+
+    def temperature(self, units=TemperatureUnits.CELSIUS):
+        _record(self._name, "temperature")
+        celsius = self._model.temperature_c
+        if units == TemperatureUnits.FAHRENHEIT:
+            return celsius * 9.0 / 5.0 + 32.0
+        if units == PERCENT:
+            return max(0.0, min(100.0, (celsius - 20.0) / 50.0 * 100.0))
+        return celsius
+
+    def power(self, units=WATT):
+        _record(self._name, "power")
+        return self._model.current_a * _Sim.world.battery_voltage
+
+    def torque(self, units=TorqueUnits.NM):
+        _record(self._name, "torque")
+        return self._model.current_a * 0.6
+
+    def efficiency(self, units=PERCENT):
+        return 0.0 if self._model.current_a == 0 else 60.0
+
+    def installed(self):
+        return True
+
+
+class MotorGroup:
+    def __init__(self, *motors):
+        self._motors = list(motors)
+
+    def spin(self, direction, velocity=None, units=PERCENT):
+        for m in self._motors:
+            m.spin(direction, velocity, units)
+
+    def spin_for(self, direction, rotation, units=DEGREES, velocity=None, units_v=PERCENT, wait=True):
+        for m in self._motors:
+            m.spin_for(direction, rotation, units, velocity, units_v, False)
+        if wait:
+            while self.is_spinning():
+                _Sim.kernel.sleep(5)
+            return True
+        return False
+
+    def stop(self, mode=None):
+        for m in self._motors:
+            m.stop(mode)
+
+    def set_velocity(self, velocity, units=PERCENT):
+        for m in self._motors:
+            m.set_velocity(velocity, units)
+
+    def set_stopping(self, mode):
+        for m in self._motors:
+            m.set_stopping(mode)
+
+    def set_max_torque(self, value, units=PERCENT):
+        for m in self._motors:
+            m.set_max_torque(value, units)
+
+    def reset_position(self):
+        for m in self._motors:
+            m.reset_position()
+
+    def position(self, units=DEGREES):
+        return self._motors[0].position(units) if self._motors else 0.0
+
+    def velocity(self, units=PERCENT):
+        return self._motors[0].velocity(units) if self._motors else 0.0
+
+    def is_spinning(self):
+        return any(m.is_spinning() for m in self._motors)
+
+    def is_done(self):
+        return not self.is_spinning()
+
+    def current(self, units=AMP):
+        return sum(m.current(units) for m in self._motors)
+
+    def temperature(self, units=TemperatureUnits.CELSIUS):
+        if not self._motors:
+            return 0.0
+        return sum(m.temperature(units) for m in self._motors) / len(self._motors)
+
+    def count(self):
+        return len(self._motors)
+
+
+class Inertial:
+    CALIBRATION_MS = 2000.0
+
+    def __init__(self, port=None):
+        self.port = port
+        self._calibrated_at = None
+        self._heading_offset = 0.0
+
+    def calibrate(self):
+        _record("inertial", "calibrate")
+        self._calibrated_at = _Sim.kernel.now_ms + self.CALIBRATION_MS
+
+    def is_calibrating(self):
+        _record("inertial", "is_calibrating")
+        return self._calibrated_at is not None and _Sim.kernel.now_ms < self._calibrated_at
+
+    def installed(self):
+        return True
+
+    def heading(self, units=DEGREES):
+        _record("inertial", "heading")
+        if self.is_calibrating():
+            return 0.0
+        return (_Sim.world.gyro_heading() + self._heading_offset) % 360.0
+
+    def rotation(self, units=DEGREES):
+        return self.heading(units)
+
+    def set_heading(self, value, units=DEGREES):
+        self._heading_offset = value - _Sim.world.gyro_heading()
+
+    def reset_heading(self):
+        self.set_heading(0.0)
+
+    def set_rotation(self, value, units=DEGREES):
+        self.set_heading(value, units)
+
+    def reset_rotation(self):
+        self.reset_heading()
+
+
+class Optical:
+    def __init__(self, port=None):
+        self.port = port
+        self.light_on = False
+        self.light_power = 0
+        self.detect_threshold = 100
+        self._detected = []
+        self._lost = []
+
+    def set_light(self, state):
+        _record("optical", "set_light", (state,))
+        self.light_on = state == LedStateType.ON
+
+    def set_light_power(self, value, units=PERCENT):
+        _record("optical", "set_light_power", (value,))
+        self.light_power = value
+
+    def object_detect_threshold(self, value):
+        _record("optical", "object_detect_threshold", (value,))
+        self.detect_threshold = value
+
+    def hue(self):
+        _record("optical", "hue")
+        return _Sim.world.optical_hue()
+
+    def brightness(self, readraw=False):
+        _record("optical", "brightness")
+        return 80.0 if _Sim.world.block_at_sensor() is not None else 5.0
+
+    def color(self):
+        return Color.RED if self.hue() < 30 else Color.BLUE
+
+    def is_near_object(self):
+        _record("optical", "is_near_object")
+        return _Sim.world.block_at_sensor() is not None
+
+    def object_detected(self, callback, args=()):
+        self._detected.append((callback, args))
+
+    def object_lost(self, callback, args=()):
+        self._lost.append((callback, args))
+
+    def installed(self):
+        return True
+
+
+class Pneumatics:
+    def __init__(self, port=None):
+        self.port = port
+        self._open = False
+        self.transitions = 0
+        self._name = "pneumatics" if getattr(port, "name", None) is None else "pneumatics." + port.name
+
+    def open(self):
+        _record(self._name, "open")
+        if not self._open:
+            self.transitions += 1
+        self._open = True
+
+    def close(self):
+        _record(self._name, "close")
+        if self._open:
+            self.transitions += 1
+        self._open = False
+
+    def value(self):
+        return 1 if self._open else 0
+
+
+# =============================================================================
+# COMPETITION
+# =============================================================================
+
+class Competition:
+    def __init__(self, driver_control, autonomous):
+        self.driver_control = driver_control
+        self.autonomous = autonomous
+        self.mode = "DISABLED"      # "DISABLED", "AUTONOMOUS" or "DRIVER"
+        self.field_control = False
+        self.competition_switch = False
+        self._task = None
+        _Sim.competition = self
+
+    def is_enabled(self):
+        return self.mode != "DISABLED"
+
+    def is_driver_control(self):
+        return self.mode == "DRIVER"
+
+    def is_autonomous(self):
+        return self.mode == "AUTONOMOUS"
+
+    def is_competition_switch(self):
+        return self.competition_switch
+
+    def is_field_control(self):
+        return self.field_control
+
+    def _enter(self, mode, callback):
+        if self._task is not None:
+            _Sim.kernel.kill(self._task)
+            self._task = None
+        self.mode = mode
+        if callback is not None:
+            self._task = _Sim.kernel.spawn(callback, (), mode.lower())
+
+    def start_autonomous(self):
+        """Field control: enable the autonomous period."""
+        self._enter("AUTONOMOUS", self.autonomous)
+
+    def start_driver_control(self):
+        """Field control: enable the driver control period."""
+        self._enter("DRIVER", self.driver_control)
+
+    def disable(self):
+        """Field control: disable the robot and stop the running period's thread."""
+        self._enter("DISABLED", None)
@@ -0,0 +1,162 @@
+"""Virtual clock and cooperative thread scheduler for the simulated vex module.
+
+Every vex ``Thread`` (and every event callback) runs on its own OS thread, but
+only one of them is ever allowed to execute at a time. A thread gives up the
+baton by calling ``wait()``; the kernel then hands it to whichever thread has
+the earliest wake-up time and advances the virtual clock to that time, stepping
+the physics model along the way. Runs are therefore deterministic and can go
+much faster than real time.
+"""
+
+import heapq
+import sys
+import threading
+import traceback
+
+
+class ThreadKilled(BaseException):
+    """Raised inside a simulated thread that has been stopped.
+
+    Derives from BaseException so that the robot program's ``except Exception``
+    handlers do not swallow it, matching how the brain tears threads down.
+    """
+
+
+class SimulationDeadlock(RuntimeError):
+    """Raised when no simulated thread is runnable."""
+
+
+class Task:
+    """A simulated thread of execution."""
+
+    def __init__(self, kernel, target, args, name):
+        self.kernel = kernel
+        self.target = target
+        self.args = args
+        self.name = name
+        self.killed = False
+        self.done = False
+        self.wake_ms = kernel.now_ms
+        self._baton = threading.Event()
+        self._os_thread = None
+
+    def _start_os_thread(self):
+        self._os_thread = threading.Thread(target=self._bootstrap, name="sim:" + self.name, daemon=True)
+        self._os_thread.start()
+
+    def _bootstrap(self):
+        self._baton.wait()
+        self._baton.clear()
+        try:
+            if not self.killed:
+                self.target(*self.args)
+        except ThreadKilled:
+            pass
+        except BaseException as e:  # noqa: BLE001 - mirror the brain printing thread crashes
+            self.kernel.record_error(self, e)
+        finally:
+            self.done = True
+            self.kernel._task_exited(self)
+
+
+class Kernel:
+    """Discrete-event scheduler that owns the virtual clock."""
+
+    def __init__(self, physics_step_ms=5.0):
+        self.now_ms = 0.0
+        self.physics_step_ms = physics_step_ms
+        self.errors = []
+        self.context_switches = 0
+        self._ready = []
+        self._sequence = 0
+        self._current = None
+        self._advance_hooks = []
+
+    # ------------------------------------------------------------------ clock
+    def add_advance_hook(self, hook):
+        """Register ``hook(now_ms, dt_ms)``, called for every physics step."""
+        self._advance_hooks.append(hook)
+
+    def _advance_to(self, target_ms):
+        while self.now_ms < target_ms:
+            dt = min(self.physics_step_ms, target_ms - self.now_ms)
+            for hook in self._advance_hooks:
+                hook(self.now_ms, dt)
+            self.now_ms += dt
+
+    # ------------------------------------------------------------------ tasks
+    @property
+    def current(self):
+        return self._current
+
+    def adopt_current_thread(self, name="main"):
+        """Turn the calling OS thread into the first simulated task."""
+        task = Task(self, None, (), name)
+        self._current = task
+        return task
+
+    def spawn(self, target, args=(), name=None):
+        """Create a simulated thread that becomes runnable at the current time."""
+        task = Task(self, target, tuple(args), name or getattr(target, "__name__", "thread"))
+        task._start_os_thread()
+        self._push(task, self.now_ms)
+        return task
+
+    def kill(self, task):
+        """Stop a simulated thread the next time it is scheduled."""
+        if task is None or task.done:
+            return
+        task.killed = True
+        if task is self._current:
+            raise ThreadKilled()
+        # Wake it now so it unwinds promptly; the stale heap entry is skipped once it is done
+        self._push(task, self.now_ms)
+
+    def sleep(self, duration_ms):
+        """Block the current task for ``duration_ms`` of virtual time."""
+        task = self._current
+        if task is None:
+            raise RuntimeError("wait() called outside the simulation")
+        self._push(task, self.now_ms + max(0.0, duration_ms))
+        self._switch_from(task)
+        if task.killed:
+            raise ThreadKilled()
+
+    def _push(self, task, wake_ms):
+        task.wake_ms = wake_ms
+        self._sequence += 1
+        heapq.heappush(self._ready, (wake_ms, self._sequence, task))
+
+    def _pop_runnable(self):
+        while self._ready:
+            wake_ms, _, task = heapq.heappop(self._ready)
+            if task.done:
+                continue
+            self._advance_to(wake_ms)
+            return task
+        raise SimulationDeadlock("no runnable simulated threads")
+
+    def _switch_from(self, task):
+        nxt = self._pop_runnable()
+        self._current = nxt
+        if nxt is task:
+            return
+        self.context_switches += 1
+        nxt._baton.set()
+        task._baton.wait()
+        task._baton.clear()
+
+    def _task_exited(self, task):
+        try:
+            nxt = self._pop_runnable()
+        except SimulationDeadlock:
+            self._current = None
+            return
+        self._current = nxt
+        self.context_switches += 1
+        nxt._baton.set()
+
+    def record_error(self, task, error):
+        self.errors.append((self.now_ms, task.name, error))
+        sys.stderr.write("[sim] thread '" + task.name + "' crashed at " + str(int(self.now_ms)) + " ms\n")
+        traceback.print_exception(type(error), error, error.__traceback__, file=sys.stderr)
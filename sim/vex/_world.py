@@ -0,0 +1,270 @@
+"""Physics model for the simulated robot.
+
+The model is deliberately simple: first-order motor response, an H-drive
+(two tank sides plus a strafe wheel) integrated on a flat field, and an intake
+that moves blocks past the optical sensors. It is meant for timing, sequencing
+and rough pose checks, not for tuning PID gains.
+"""
+
+import math
+import random
+
+
+class Noise:
+    """Per-run disturbances applied to the physics model. All default to none."""
+
+    def __init__(self, left_slip=0.0, right_slip=0.0, strafe_slip=0.0, gyro_drift_dps=0.0,
+                 battery_sag=0.0, sensor_noise=0.0, seed=None):
+        self.left_slip = left_slip              # Fraction of wheel travel lost on the left side (0.05 = 5%)
+        self.right_slip = right_slip            # Fraction of wheel travel lost on the right side
+        self.strafe_slip = strafe_slip          # Fraction of wheel travel lost on the strafe wheel
+        self.gyro_drift_dps = gyro_drift_dps    # Inertial heading drift in degrees per second
+        self.battery_sag = battery_sag          # Fraction of battery voltage lost under full load
+        self.sensor_noise = sensor_noise        # Standard deviation of optical hue noise (hue units)
+        self.rng = random.Random(seed)
+
+    @classmethod
+    def randomized(cls, rng, scale=1.0):
+        """Draw a random disturbance set, ``scale`` widens every distribution."""
+        return cls(
+            left_slip=abs(rng.gauss(0.0, 0.03 * scale)),
+            right_slip=abs(rng.gauss(0.0, 0.03 * scale)),
+            strafe_slip=abs(rng.gauss(0.0, 0.06 * scale)),
+            gyro_drift_dps=rng.gauss(0.0, 0.05 * scale),
+            battery_sag=abs(rng.gauss(0.08, 0.04 * scale)),
+            sensor_noise=abs(rng.gauss(0.0, 4.0 * scale)),
+            seed=rng.randrange(1 << 30),
+        )
+
+
+class RobotGeometry:
+    """Port assignments and dimensions of the robot described in src/main.py."""
+
+    LEFT_DRIVE_PORTS = (7, 10)
+    RIGHT_DRIVE_PORTS = (9, 8)
+    STRAFE_PORTS = (11,)
+    BOTTOM_INTAKE_PORT = 6
+    TOP_INTAKE_PORT = 20
+    UNLOADING_PORT = 19
+    INERTIAL_PORT = 18
+    OPTICAL_PORTS = (4, 5)
+
+    TRACK_WIDTH_MM = 300.0          # Distance between the left and right wheel contact patches
+    INTAKE_REACH_MM = 180.0         # Distance from the robot centre to the intake mouth
+    CAPTURE_RADIUS_MM = 90.0        # Blocks within this distance of the intake mouth are picked up
+
+
+class MotorModel:
+    """Physical state of one smart motor."""
+
+    FREE_SPEED_RPM = {0: 100.0, 1: 200.0, 2: 600.0}  # Keyed by GearSetting value (36:1, 18:1, 6:1)
+    TIME_CONSTANT_MS = 60.0
+    NO_LOAD_CURRENT_A = 0.25        # Current drawn at free speed
+    STALL_CURRENT_A = 2.5
+    AMBIENT_C = 24.0
+    HEATING = 0.0009                # Degrees per ms per amp squared
+    COOLING = 0.00002               # Fraction of the temperature rise shed per ms
+
+    def __init__(self, port, gearing):
+        self.port = port
+        self.free_rpm = self.FREE_SPEED_RPM.get(gearing, 200.0)
+        self.command_pct = 0.0      # Requested velocity (-100..100)
+        self.target_deg = None      # Position target when running spin_for
+        self.velocity_pct = 0.0
+        self.position_deg = 0.0
+        self.load = 0.0             # Extra mechanical load (0..1) applied by the world
+        self.current_a = 0.0
+        self.temperature_c = self.AMBIENT_C
+        self.voltage_scale = 1.0
+
+    def step(self, dt_ms):
+        command = self.command_pct
+        if self.target_deg is not None:
+            remaining = self.target_deg - self.position_deg
+            if abs(remaining) < 1.0:
+                command = 0.0
+                self.target_deg = None
+                self.command_pct = 0.0
+            else:
+                command = math.copysign(min(abs(self.command_pct), 100.0), remaining)
+                # Slow down in the last few degrees like the brain's position controller
+                command = math.copysign(min(abs(command), abs(remaining) * 2.0 + 5.0), remaining)
+        command *= self.voltage_scale * (1.0 - 0.5 * self.load)
+        alpha = min(1.0, dt_ms / self.TIME_CONSTANT_MS)
+        self.velocity_pct += (command - self.velocity_pct) * alpha
+        self.position_deg += self.velocity_pct / 100.0 * self.free_rpm * 6.0 * dt_ms / 1000.0
+
+        effort = abs(command) / 100.0
+        self.current_a = self.NO_LOAD_CURRENT_A * effort + (self.STALL_CURRENT_A - self.NO_LOAD_CURRENT_A) * \
+            max(0.0, effort - abs(self.velocity_pct) / 100.0 * (1.0 - self.load))
+        self.temperature_c += (self.HEATING * self.current_a * self.current_a
+                               - self.COOLING * (self.temperature_c - self.AMBIENT_C)) * dt_ms
+
+    def is_spinning(self):
+        return self.target_deg is not None or abs(self.velocity_pct) > 0.5
+
+    def surface_speed_mm_s(self, wheel_diameter_mm):
+        return self.velocity_pct / 100.0 * self.free_rpm / 60.0 * math.pi * wheel_diameter_mm
+
+
+class Block:
+    """A game block on the field or inside the robot."""
+
+    def __init__(self, color, x_mm=0.0, y_mm=0.0):
+        self.color = color          # "RED" or "BLUE"
+        self.x_mm = x_mm
+        self.y_mm = y_mm
+        self.path_pos = 0.0         # Position along the intake path (0 = mouth, 1 = storage)
+
+
+class World:
+    """Field, robot pose and intake contents."""
+
+    WHEEL_DIAMETER_MM = 105.0
+    SENSOR_WINDOW = (0.15, 0.35)    # Section of the intake path the optical sensors look at
+    PATH_SPEED = 2.5                # Path lengths per second at full intake speed
+    NOMINAL_VOLTAGE = 12.8
+
+    def __init__(self, noise=None, blocks=None, geometry=RobotGeometry):
+        self.noise = noise or Noise()
+        self.geometry = geometry
+        self.motors = {}
+        self.pneumatics = {}
+        self.x_mm = 0.0
+        self.y_mm = 0.0
+        self.heading_deg = 0.0      # Clockwise from the starting direction, like the inertial sensor
+        self.gyro_offset_deg = 0.0
+        self.field_blocks = list(blocks) if blocks is not None else self.default_blocks()
+        self.in_transit = []
+        self.stored = []
+        self.scored = []
+        self.rejected = []
+        self.battery_voltage = self.NOMINAL_VOLTAGE
+        self.battery_current = 0.0
+
+    @staticmethod
+    def default_blocks():
+        """Blocks placed along the path of the autonomous routines (for both starting sides)."""
+        blocks = []
+        for side in (1, -1):
+            for i in range(4):
+                blocks.append(Block("RED" if i % 2 == 0 else "BLUE", side * 150.0, 820.0 + i * 110.0))
+        return blocks
+
+    # --------------------------------------------------------------- devices
+    def register_motor(self, port, gearing):
+        model = self.motors.get(port)
+        if model is None:
+            model = self.motors[port] = MotorModel(port, gearing)
+        return model
+
+    def motor(self, port):
+        return self.motors.get(port)
+
+    # --------------------------------------------------------------- physics
+    def step(self, now_ms, dt_ms):
+        total_current = 0.0
+        scale = self.battery_voltage / self.NOMINAL_VOLTAGE
+        for model in self.motors.values():
+            model.voltage_scale = min(1.0, scale + 0.1)
+            model.step(dt_ms)
+            total_current += model.current_a
+        self.battery_current = total_current
+        self.battery_voltage = self.NOMINAL_VOLTAGE * (1.0 - self.noise.battery_sag * min(1.0, total_current / 15.0))
+        self._step_drive(dt_ms)
+        self._step_intake(dt_ms)
+        self.gyro_offset_deg += self.noise.gyro_drift_dps * dt_ms / 1000.0
+
+    def _side_speed(self, ports, slip):
+        speeds = [self.motors[p].surface_speed_mm_s(self.WHEEL_DIAMETER_MM) for p in ports if p in self.motors]
+        if not speeds:
+            return 0.0
+        return sum(speeds) / len(speeds) * (1.0 - slip)
+
+    def _step_drive(self, dt_ms):
+        g = self.geometry
+        v_left = self._side_speed(g.LEFT_DRIVE_PORTS, self.noise.left_slip)
+        v_right = self._side_speed(g.RIGHT_DRIVE_PORTS, self.noise.right_slip)
+        v_strafe = self._side_speed(g.STRAFE_PORTS, self.noise.strafe_slip)
+        dt = dt_ms / 1000.0
+        forward = (v_left + v_right) / 2.0
+        omega_deg = math.degrees((v_left - v_right) / g.TRACK_WIDTH_MM)
+        heading = math.radians(self.heading_deg)
+        # Heading 0 faces +y, clockwise positive; strafing right moves towards +x at heading 0
+        self.x_mm += (forward * math.sin(heading) + v_strafe * math.cos(heading)) * dt
+        self.y_mm += (forward * math.cos(heading) - v_strafe * math.sin(heading)) * dt
+        self.heading_deg = (self.heading_deg + omega_deg * dt) % 360.0
+
+    def _intake_mouth(self):
+        heading = math.radians(self.heading_deg)
+        reach = self.geometry.INTAKE_REACH_MM
+        return self.x_mm + reach * math.sin(heading), self.y_mm + reach * math.cos(heading)
+
+    def _step_intake(self, dt_ms):
+        g = self.geometry
+        bottom = self.motors.get(g.BOTTOM_INTAKE_PORT)
+        top = self.motors.get(g.TOP_INTAKE_PORT)
+        unloading = self.motors.get(g.UNLOADING_PORT)
+        if bottom is None or top is None or unloading is None:
+            return
+        bottom_speed = bottom.velocity_pct / 100.0
+        dt = dt_ms / 1000.0
+
+        # Pick up blocks in front of the intake mouth
+        if bottom_speed > 0.2:
+            mouth_x, mouth_y = self._intake_mouth()
+            for block in list(self.field_blocks):
+                if math.hypot(block.x_mm - mouth_x, block.y_mm - mouth_y) < g.CAPTURE_RADIUS_MM:
+                    self.field_blocks.remove(block)
+                    block.path_pos = 0.0
+                    self.in_transit.append(block)
+
+        # Move blocks along the intake path
+        for block in list(self.in_transit):
+            block.path_pos += bottom_speed * self.PATH_SPEED * dt
+            if block.path_pos >= 1.0:
+                self.in_transit.remove(block)
+                if top.velocity_pct < -20.0:
+                    self.rejected.append(block)
+                else:
+                    self.stored.append(block)
+            elif block.path_pos < 0.0:
+                self.in_transit.remove(block)
+                self.scored.append(block)
+
+        # Push stored blocks back out when the unloading roller runs
+        if self.stored and abs(unloading.velocity_pct) > 20.0 and abs(bottom_speed) > 0.2:
+            if not self.in_transit or all(b.path_pos < 0.6 for b in self.in_transit):
+                block = self.stored.pop(0)
+                if bottom_speed < 0:
+                    block.path_pos = 1.0
+                    self.in_transit.append(block)
+                else:
+                    self.scored.append(block)
+
+        load = 0.8 if self.in_transit else 0.0
+        bottom.load = load
+        top.load = load * 0.5
+
+    # --------------------------------------------------------------- sensors
+    def block_at_sensor(self):
+        low, high = self.SENSOR_WINDOW
+        for block in self.in_transit:
+            if low <= block.path_pos <= high:
+                return block
+        return None
+
+    def optical_hue(self):
+        block = self.block_at_sensor()
+        if block is None:
+            hue = 40.0
+        elif block.color == "RED":
+            hue = 5.0
+        else:
+            hue = 215.0
+        if self.noise.sensor_noise:
+            hue += self.noise.rng.gauss(0.0, self.noise.sensor_noise)
+        return hue % 360.0
+
+    def gyro_heading(self):
+        return (self.heading_deg + self.gyro_offset_deg) % 360.0
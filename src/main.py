@@ -9,6 +9,8 @@
 
 # Library imports
 from vex import *
+import gc
+import sys
 
 # ============================================================================
 # PYTHON BUILT-IN FUNCTIONS THAT AREN'T BUILT IN TO VEX PYTHON
@@ -26,87 +28,127 @@ def enumerate(iterable, start=0):
 # TYPES
 # ============================================================================
 class AllianceColor:
+    """Alliance color. Stored as a small integer code; NAMES gives the name for each code."""
+    __slots__ = ("code",)
+
+    UNKNOWN_CODE = 0
+    RED_CODE = 1
+    BLUE_CODE = 2
+    NAMES = ("UNKNOWN", "RED", "BLUE")
+
     def __init__(self, color_name: str = "UNKNOWN"):
         self.set(color_name)
         
     def set_to_default(self):
-        self.__color_name = "RED"
+        self.code = AllianceColor.RED_CODE
 
     def set(self, color_name: str):
         if isinstance(color_name, str):
-            if color_name.upper() in ['RED', 'BLUE', 'UNKNOWN']:
-                self.__color_name = color_name.upper()
+            if color_name.upper() in AllianceColor.NAMES:
+                self.code = AllianceColor.NAMES.index(color_name.upper())
             else:
                 raise ValueError("Invalid color name. Choose 'RED', 'BLUE', or 'UNKNOWN'.")
         elif isinstance(color_name, AllianceColor):
-            self.__color_name = color_name.color_name
+            self.code = color_name.code
         else:
             raise TypeError("Color name must be a string.")
 
     def __eq__(self, other: object) -> bool:
         if isinstance(other, AllianceColor):
-            return self.__color_name == other.__color_name
+            return self.code == other.code
         return False
 
     def __ne__(self, other: object) -> bool:
         if isinstance(other, AllianceColor):
-            return self.__color_name != other.__color_name
+            return self.code != other.code
         return True
     
     def __invert__(self):
-        if self.__color_name == 'UNKNOWN':
+        if self.code == AllianceColor.UNKNOWN_CODE:
             return AllianceColor('UNKNOWN')
         
-        if self.__color_name == 'RED':
+        if self.code == AllianceColor.RED_CODE:
             return AllianceColor('BLUE')
         else:
             return AllianceColor('RED')
     
     def __str__(self) -> str:
-        return self.__color_name
+        return AllianceColor.NAMES[self.code]
     
     def __hash__(self) -> int:
-        return hash(self.__color_name)
+        return self.code
     
 class Side:
+    """Starting side. Stored as a small integer code; NAMES gives the name for each code."""
+    __slots__ = ("code",)
+
+    LEFT_CODE = 0
+    RIGHT_CODE = 1
+    NAMES = ("LEFT", "RIGHT")
+
     def __init__(self, default):
         self.set(default)
         
     def set(self, value):
         if isinstance(value, Side):
-            self.__side = value.__side
-        elif value.upper() in ['LEFT', 'RIGHT']:
-            self.__side = value.upper()
+            self.code = value.code
+        elif value.upper() in Side.NAMES:
+            self.code = Side.NAMES.index(value.upper())
         else:
             raise ValueError("Invalid side name. Choose 'LEFT' or 'RIGHT'.")
         
     def __invert__(self):
-        if self.__side == 'LEFT':
-            self.__side = 'RIGHT'
-        else:
-            self.__side = 'LEFT'
+        return Side(Side.NAMES[1 - self.code])
 
     def __eq__(self, value: object) -> bool:
         if isinstance(value, Side):
-            return self.__side == value.__side
+            return self.code == value.code
         if isinstance(value, str):
-            return self.__side.lower() == value.lower()
+            return Side.NAMES[self.code] == value.upper()
         return False
     
     def __str__(self) -> str:
-        return self.__side
+        return Side.NAMES[self.code]
     
     def __ne__(self, value: object) -> bool:
         if isinstance(value, Side):
-            return self.__side != value.__side
+            return self.code != value.code
         if isinstance(value, str):
-            return self.__side.lower() != value.lower()
+            return Side.NAMES[self.code] != value.upper()
         return True
     
     def __hash__(self) -> int:
-        return hash(self.__side)
+        return self.code
+
+class RobotStateSnapshot:
+    """
+    One consistent set of robot state values. A snapshot is never changed after it is published; writers publish
+    a new one with RobotState.update(). Readers should get one snapshot per tick and read every value from it.
+    """
+    FIELDS = (
+        "current_alliance_color", "current_braking_mode", "starting_side", "auton_mode", "recording_enabled",
+        "color_rejection_enabled"
+    )
+
+    def __init__(self, version, current_alliance_color, current_braking_mode, starting_side, auton_mode,
+                 recording_enabled, color_rejection_enabled=True):
+        self.version = version  # Increases by one with every published change
+        self.current_alliance_color = current_alliance_color
+        self.current_braking_mode = current_braking_mode
+        self.starting_side = starting_side
+        self.auton_mode = auton_mode
+        self.recording_enabled = recording_enabled
+        self.color_rejection_enabled = color_rejection_enabled  # Cleared by routines that pick up blocks of both colors
+
+    def replace(self, **changes):
+        """Make a new snapshot with some values changed and the next version number"""
+        values = {}
+        for name in self.FIELDS:
+            values[name] = changes.pop(name) if name in changes else getattr(self, name)
+        if changes:
+            raise AttributeError("Unknown robot state value: " + ", ".join(changes))
+        return RobotStateSnapshot(self.version + 1, **values)
 
-    
 
 # =============================================================================
 # SETTINGS CONFIGURATION
@@ -141,18 +183,128 @@ class ControllerSettings:
     DESCORER_TRIGGER_BUTTON = 'X'
     MATCH_LOAD_UNLOADER_TOGGLE_BUTTON = 'Y'
 
-    COLOR_SWITCH_BUTTON = "A"  # Button to switch alliance color
+    COLOR_SWITCH_BUTTON = "A"  # Button to switch alliance color. Hold to disable color detection.
     BRAKING_SWITCH_BUTTON = "B"  # Button to switch braking mode
 
+    # Button gestures
+    LONG_PRESS_MS = 1000    # Hold time for a long press
+    DOUBLE_TAP_MS = 300     # Longest gap between releasing and pressing again for a double tap
+
+class IntakeSettings:
+    """Intake motor duty and thermal settings"""
+    ADAPTIVE_DUTY_ENABLED = True    # When True, the intake idles at a lower speed until a block is detected
+    IDLE_SPEED_PERCENT = 40         # Intake speed while no block is near
+    BOOST_SPEED_PERCENT = 100       # Intake speed while a block is being pulled in
+    BOOST_HOLD_MS = 750             # Time to stay at boost speed after the last detection
+    NO_LOAD_CURRENT_AMPS = 0.4      # Bottom intake motor current with nothing in the rollers
+    CURRENT_RISE_AMPS = 0.5         # Current above no-load that counts as a block entering the rollers
+    SPIN_UP_IGNORE_MS = 250         # Current is ignored for this long after a speed change, since spin-up draws extra current
+
+    MAX_TEMPERATURE_C = 55              # Motor temperature at which V5 motors start limiting their current
+    THERMAL_WARNING_HEADROOM_C = 5      # Warn the driver when the hottest intake motor is this close to the limit
+    THERMAL_READOUT_INTERVAL_MS = 1000  # How often the thermal headroom is shown on the controller
+
+class BlockManipulationSettings:
+    """Block manipulation state machine settings"""
+    MIN_STATE_DWELL_MS = 0      # Minimum time a state is held before a requested change is applied. Changes to IDLE are never delayed.
+    TRANSITION_SETTLE_MS = 0    # Time after entering a state before its per-tick logic starts running.
+
+class AutonSettings:
+    """Autonomous routine settings"""
+    EXECUTOR_TICK_MS = 10           # How often the routine executor updates the active steps
+    AUTON_PERIOD_MS = 15000         # Length of the autonomous period, used for the slack in the profile report
+
+    CAPTURE_TIMEOUT_MS = 2000       # Longest wait for the capture system after driving into the blocks
+    CAPTURE_BLOCK_COUNT = 3         # Capture ends as soon as this many blocks have passed the optical sensors
+    CAPTURE_CLEAR_MS = 300          # ...or once the sensors and intake current have been clear for this long
+
+    OUTPUT_TIMEOUT_MS = 5000        # Longest time spent outputting blocks
+    OUTPUT_MIN_MS = 500             # Always output for at least this long
+    OUTPUT_CLEAR_MS = 400           # Output ends once the sensors and intake current have been clear for this long
+
+class SchedulerSettings:
+    """Timed action scheduler and worker pool settings"""
+    SLOT_MS = 10            # Timer wheel resolution
+    SLOT_COUNT = 64         # Timer wheel slots (one revolution is SLOT_MS * SLOT_COUNT). Longer delays take extra revolutions.
+    MAX_ENTRIES = 16        # Most timed actions that can be pending at once
+    WORKER_COUNT = 1        # Worker threads for blocking actions
+    MAX_QUEUED_JOBS = 2     # Blocking actions waiting for a worker. Further requests are dropped.
+    WORKER_POLL_MS = 20     # How often an idle worker checks for new jobs
+
+class MemorySettings:
+    """Garbage collection scheduling for the control loops"""
+    MANAGED_COLLECTION_ENABLED = True   # Turn automatic collection off during control ticks and collect in slack time
+    COLLECT_AFTER_BYTES = 8 * 1024      # Collect once this much has been allocated since the last collection
+    MIN_FREE_BYTES = 16 * 1024          # Collect straight away, slack or not, if free heap falls below this
+    MIN_SLACK_MS = 3                    # Least time left before the next tick for a collection to start
+    FALLBACK_INTERVAL_MS = 1000         # Collection interval when the runtime can't report heap usage
+    DISABLED_CHECK_MS = 200             # How often automatic collection is checked for being left off after the robot is disabled
+
+class SupervisorSettings:
+    """Restart policy for the autonomous and driver control tasks"""
+    DRIVER_CONTROL_MAX_RESTARTS = 10    # Restarts per driver control period before giving up
+    AUTONOMOUS_MAX_RESTARTS = 0         # A restarted routine would start over from the wrong position, so don't
+    INITIAL_BACKOFF_MS = 50             # Wait before the first restart. Doubles after each crash.
+    MAX_BACKOFF_MS = 1000
+    STABLE_RUN_MS = 5000                # A task that ran this long before crashing restarts with the initial backoff
+    CRASH_HISTORY_SIZE = 8              # Most recent crashes kept for diagnostics
+
+class SensorSettings:
+    """Sensor startup settings"""
+    CALIBRATION_START_MS = 100      # is_calibrating() is ignored for this long after calibrate(), while the sensor starts up
+    CALIBRATION_TIMEOUT_MS = 3000   # Longest time turn_for() waits for the inertial sensor to finish calibrating
+
+class RecordingSettings:
+    """Driver control recording and autonomous playback settings"""
+    FILENAME = "drive_recording.bin"   # Recording file on the SD card
+    TICK_MS = 20                        # Recording and playback period. Matches the driver control loop.
+    MAX_DURATION_MS = 15000             # Recordings stop and are saved after this long (one autonomous period)
+
+class TelemetrySettings:
+    """USB serial telemetry settings"""
+    ENABLED = True              # Stream channel samples and log messages over the brain's USB serial port
+    PERIOD_MS = 50              # How often the channels are sampled and queued frames are sent
+    QUEUE_SIZE = 12             # Frames waiting to be sent. New frames are dropped while the queue is full.
+    MAX_BYTES_PER_SEND = 512    # Most bytes written each period, so a slow port never holds up the other threads
+    CHANNELS_INTERVAL = 20      # The channel list is repeated every this many samples so a reader can join at any time
+    # Channels sent with each sample, from Telemetry.CHANNEL_TABLE
+    CHANNELS = ("heading", "left_rpm", "right_rpm", "strafe_rpm", "forward", "strafe", "turn",
+                "intake_amps", "intake_temp", "bms_state", "loop_ms", "battery_v", "dropped")
+
 class RobotState:
-    """Robot state configuration. Edited by the main program."""
+    """
+    Robot state configuration, shared by every thread. Read it with RobotState.get(), which returns an immutable
+    snapshot, and change it with RobotState.update(). Only one thread runs at a time between waits, so publishing
+    a snapshot is atomic and no locks are needed.
+    """
     # =========================== CONFIGURED SETTINGS ===========================
     # Edit these values to change the initial robot configuration
 
-    current_alliance_color = AllianceColor("red")  # Default alliance color: 'RED' or 'BLUE'
-    current_braking_mode = COAST # Braking mode for drivetrain motors: BRAKE, COAST, or HOLD
-    starting_side = Side("RIGHT") # Starting side for autonomous: 'LEFT' or 'RIGHT'
-    auton_mode = "COMPLEX"  # "COMPLEX" or "SIMPLE"
+    _snapshot = RobotStateSnapshot(
+        version=0,
+        current_alliance_color=AllianceColor("red"),  # Default alliance color: 'RED' or 'BLUE'
+        current_braking_mode=COAST, # Braking mode for drivetrain motors: BRAKE, COAST, or HOLD
+        starting_side=Side("RIGHT"), # Starting side for autonomous: 'LEFT' or 'RIGHT'
+        auton_mode="COMPLEX",  # "COMPLEX", "SIMPLE" or "PLAYBACK"
+        recording_enabled=False,  # Record driver control for autonomous playback
+    )
+
+    @classmethod
+    def get(cls):
+        """Get the current state snapshot"""
+        return cls._snapshot
+
+    @classmethod
+    def update(cls, **changes):
+        """
+        Publish a new snapshot with some values changed. AllianceColor and Side values must be new objects,
+        never ones taken from a snapshot and modified.
+
+        Returns:
+            The new snapshot
+        """
+        cls._snapshot = cls._snapshot.replace(**changes)
+        return cls._snapshot
     
 
 
@@ -201,8 +353,8 @@ class Logger:
         """Get the current log level"""
         return self.current_log_level
 
-    def _should_log(self, level):
-        """Check if a message should be logged based on current log level"""
+    def is_enabled_for(self, level):
+        """Check if messages at a level are processed. Use it to skip building messages that would be discarded."""
         return level >= self.current_log_level
 
     def _log_to_brain(self, message: str):
@@ -247,10 +399,12 @@ class Logger:
 
     def _log_internal(self, level, message, screen_target=ScreenTarget.BOTH):
         """Internal logging function"""
-        if not self._should_log(level):
+        if not self.is_enabled_for(level):
             return
 
         formatted_message = self._format_message(level, message)
+        if Telemetry.running:
+            Telemetry.log(level, message)
         
         # Screen output
         if screen_target == ScreenTarget.BRAIN:
@@ -284,6 +438,225 @@ class Logger:
 
 
 
+# =============================================================================
+# TELEMETRY
+# =============================================================================
+
+# Telemetry frame layout (integers are little endian):
+#   Sync bytes 0xA5 0x5A, payload length (1 byte), payload, checksum (sum of the payload bytes, 1 byte)
+#   Payload: frame type, sequence number (2 bytes), time in ms (4 bytes), then depending on the type:
+#     SAMPLE:   one signed 2 byte value per channel, in the order of the last CHANNELS frame
+#     CHANNELS: channel count, then for each channel: scale, name length, name
+#     LOG:      log level, message (UTF-8, cut to fit the frame)
+# A channel's reading is its value divided by its scale. tools/telemetry.py decodes the stream.
+class TelemetryFrame:
+    SYNC_0 = 0xA5
+    SYNC_1 = 0x5A
+    SAMPLE = 1
+    CHANNELS = 2
+    LOG = 3
+    PAYLOAD_OFFSET = 3      # Sync bytes and payload length come first
+    FIELDS_SIZE = 7         # Frame type, sequence number and time
+    MAX_PAYLOAD = 160
+    MAX_SIZE = PAYLOAD_OFFSET + MAX_PAYLOAD + 1
+
+class Telemetry:
+    """
+    Streams channel samples and log messages to the brain's USB serial port as compact binary frames. Frames are
+    built in a fixed ring of buffers and written by a sender thread every TelemetrySettings.PERIOD_MS. When the
+    ring is full, new frames are dropped (their sequence numbers are skipped), so logging never waits on the port.
+    """
+    # Channels that can be sent: name -> (scale, reading function). Readings are sent as round(reading * scale).
+    CHANNEL_TABLE = {
+        "heading": (10, lambda: Sensors.inertia_sensor.heading()),
+        "left_rpm": (1, lambda: Motors.left_motor_group.velocity(RPM)),
+        "right_rpm": (1, lambda: Motors.right_motor_group.velocity(RPM)),
+        "strafe_rpm": (1, lambda: Motors.strafe_motor.velocity(RPM)),
+        "forward": (1, lambda: DriverControl._forward),
+        "strafe": (1, lambda: DriverControl._strafe),
+        "turn": (1, lambda: DriverControl._turn),
+        "intake_amps": (100, lambda: Motors.bottom_intake_motor.current(CurrentUnits.AMP)),
+        "intake_temp": (1, lambda: Motors.bottom_intake_motor.temperature(TemperatureUnits.CELSIUS)),
+        "bms_state": (1, lambda: (block_manipulation_system.get_state() or 0) if block_manipulation_system else 0),
+        "loop_ms": (10, lambda: DriverControl.loop_time_ms),
+        "battery_v": (100, lambda: brain.battery.voltage()),
+        "heap_kb": (1, lambda: MemoryManager.memory_in_use // 1024 if MemoryManager.memory_in_use else 0),
+        "dropped": (1, lambda: Telemetry.dropped_frames),
+    }
+
+    running = False
+    sent_frames = 0
+    dropped_frames = 0
+
+    _port = None
+    _buffers = [bytearray(TelemetryFrame.MAX_SIZE) for _ in range(TelemetrySettings.QUEUE_SIZE)]
+    _lengths = [0] * TelemetrySettings.QUEUE_SIZE
+    _head = 0           # Ring index of the oldest queued frame
+    _count = 0          # Frames queued
+    _sequence = 0
+    _channels = ()      # (name, scale, reading function) for each channel sent
+    _samples_until_channels = 0
+
+    @classmethod
+    def start(cls):
+        """Open the USB serial port and start the sender thread"""
+        if cls.running or not TelemetrySettings.ENABLED:
+            return
+        channels = []
+        size = TelemetryFrame.FIELDS_SIZE + 1
+        for name in TelemetrySettings.CHANNELS:
+            entry = cls.CHANNEL_TABLE.get(name)
+            if entry is None:
+                logger.warning("Unknown telemetry channel: " + name, ScreenTarget.BRAIN)
+                continue
+            size += 2 + len(name)
+            if size > TelemetryFrame.MAX_PAYLOAD:
+                logger.warning("Too many telemetry channels", ScreenTarget.BRAIN)
+                break
+            channels.append((name, entry[0], entry[1]))
+        cls._channels = tuple(channels)
+
+        try:
+            cls._port = cls._open_port()
+        except Exception as e:
+            logger.error("Telemetry unavailable: " + str(e), ScreenTarget.BRAIN)
+            return
+        cls.running = True
+        Thread(cls._run_thread)
+
+    @staticmethod
+    def _open_port():
+        """Get the USB serial port. The brain sends the program's standard output there."""
+        return getattr(sys.stdout, "buffer", sys.stdout)
+
+    @classmethod
+    def log(cls, level, message):
+        """Queue a log message. Called by the logger for every message it processes while telemetry is running."""
+        if not cls.running:
+            return
+        buffer = cls._begin_frame(TelemetryFrame.LOG)
+        if buffer is None:
+            return  # Dropped; don't spend time encoding it
+        data = message.encode()
+        size = min(len(data), TelemetryFrame.MAX_PAYLOAD - TelemetryFrame.FIELDS_SIZE - 1)
+        offset = TelemetryFrame.PAYLOAD_OFFSET + TelemetryFrame.FIELDS_SIZE
+        buffer[offset] = level
+        buffer[offset + 1:offset + 1 + size] = data[:size]
+        cls._end_frame(TelemetryFrame.FIELDS_SIZE + 1 + size)
+
+    @classmethod
+    def _queue_sample(cls):
+        """Read every channel and queue a sample frame"""
+        buffer = cls._begin_frame(TelemetryFrame.SAMPLE)
+        if buffer is None:
+            return
+        offset = TelemetryFrame.PAYLOAD_OFFSET + TelemetryFrame.FIELDS_SIZE
+        for _, scale, read in cls._channels:
+            value = int(round(read() * scale))
+            if value > 32767:
+                value = 32767
+            elif value < -32768:
+                value = -32768
+            buffer[offset] = value & 0xFF
+            buffer[offset + 1] = (value >> 8) & 0xFF
+            offset += 2
+        cls._end_frame(offset - TelemetryFrame.PAYLOAD_OFFSET)
+
+    @classmethod
+    def _queue_channels(cls):
+        """Queue the channel list frame"""
+        buffer = cls._begin_frame(TelemetryFrame.CHANNELS)
+        if buffer is None:
+            return
+        offset = TelemetryFrame.PAYLOAD_OFFSET + TelemetryFrame.FIELDS_SIZE
+        buffer[offset] = len(cls._channels)
+        offset += 1
+        for name, scale, _ in cls._channels:
+            buffer[offset] = scale
+            buffer[offset + 1] = len(name)
+            buffer[offset + 2:offset + 2 + len(name)] = name.encode()
+            offset += 2 + len(name)
+        cls._end_frame(offset - TelemetryFrame.PAYLOAD_OFFSET)
+
+    @classmethod
+    def _begin_frame(cls, frame_type):
+        """
+        Claim the next free buffer and write the frame's sync bytes, type, sequence number and time
+
+        Returns:
+            The buffer, or None if the queue is full and the frame is dropped
+        """
+        sequence = cls._sequence
+        cls._sequence = (sequence + 1) & 0xFFFF
+        if cls._count >= TelemetrySettings.QUEUE_SIZE:
+            cls.dropped_frames += 1
+            return None
+        buffer = cls._buffers[(cls._head + cls._count) % TelemetrySettings.QUEUE_SIZE]
+        now = int(brain.timer.time(MSEC))
+        buffer[0] = TelemetryFrame.SYNC_0
+        buffer[1] = TelemetryFrame.SYNC_1
+        buffer[3] = frame_type
+        buffer[4] = sequence & 0xFF
+        buffer[5] = sequence >> 8
+        buffer[6] = now & 0xFF
+        buffer[7] = (now >> 8) & 0xFF
+        buffer[8] = (now >> 16) & 0xFF
+        buffer[9] = (now >> 24) & 0xFF
+        return buffer
+
+    @classmethod
+    def _end_frame(cls, payload_size):
+        """Write the length and checksum of the frame started by _begin_frame() and add it to the queue"""
+        index = (cls._head + cls._count) % TelemetrySettings.QUEUE_SIZE
+        buffer = cls._buffers[index]
+        end = TelemetryFrame.PAYLOAD_OFFSET + payload_size
+        checksum = 0
+        for i in range(TelemetryFrame.PAYLOAD_OFFSET, end):
+            checksum += buffer[i]
+        buffer[2] = payload_size
+        buffer[end] = checksum & 0xFF
+        cls._lengths[index] = end + 1
+        cls._count += 1
+
+    @classmethod
+    def send(cls):
+        """Write queued frames to the port, up to TelemetrySettings.MAX_BYTES_PER_SEND bytes"""
+        budget = TelemetrySettings.MAX_BYTES_PER_SEND
+        while cls._count:
+            length = cls._lengths[cls._head]
+            if length > budget and budget < TelemetrySettings.MAX_BYTES_PER_SEND:
+                return  # Sent next period. A frame bigger than the whole budget goes out on its own.
+            try:
+                cls._port.write(memoryview(cls._buffers[cls._head])[:length])
+            except Exception as e:
+                cls.running = False
+                logger.error("Telemetry stopped: " + str(e), ScreenTarget.BRAIN)
+                return
+            budget -= length
+            cls._head = (cls._head + 1) % TelemetrySettings.QUEUE_SIZE
+            cls._count -= 1
+            cls.sent_frames += 1
+
+    @classmethod
+    def _run_thread(cls):
+        """Sample the channels and send the queued frames every period"""
+        while cls.running:
+            try:
+                if cls._samples_until_channels <= 0:
+                    cls._queue_channels()
+                    cls._samples_until_channels = TelemetrySettings.CHANNELS_INTERVAL
+                cls._queue_sample()
+                cls._samples_until_channels -= 1
+                cls.send()
+            except Exception as e:
+                # Stop queueing frames that would never be sent
+                cls.running = False
+                logger.error("Telemetry stopped: " + str(e), ScreenTarget.BRAIN)
+                return
+            wait(TelemetrySettings.PERIOD_MS, MSEC)
+
+
+
 # =============================================================================
 # CUSTOM COMPONENTS
 # =============================================================================
@@ -338,6 +711,83 @@ class CustomController(Controller):
         else:
             raise ValueError("Invalid button name")
 
+class ButtonGesture:
+    """
+    Recognizes short presses, long presses and double taps on a controller button from its pressed and released
+    events, without blocking the event thread. Timeouts run on the Scheduler, so it must be ticked.
+
+    With only a short press action, it is reported as soon as the button is pressed. With a long press action it
+    is reported when the button is released, and with a double tap action only once DOUBLE_TAP_MS has passed
+    without a second press.
+    """
+    def __init__(self, button, on_short_press=None, on_long_press=None, on_double_tap=None):
+        """
+        Args:
+            button: Controller button to watch
+            on_short_press: Called for a short press
+            on_long_press: Called once the button has been held for LONG_PRESS_MS (before it is released)
+            on_double_tap: Called when the button is pressed again within DOUBLE_TAP_MS of a short press
+        """
+        self.on_short_press = on_short_press
+        self.on_long_press = on_long_press
+        self.on_double_tap = on_double_tap
+
+        self._is_pressed = False
+        self._long_press_fired = False
+        self._second_press = False
+        self._long_press_timer = None
+        self._tap_timer = None
+
+        button.pressed(self._pressed)
+        button.released(self._released)
+
+    def _pressed(self):
+        self._is_pressed = True
+        self._long_press_fired = False
+
+        # A press while waiting to see if a tap was a double tap
+        if self._tap_timer is not None:
+            Scheduler.cancel(self._tap_timer)
+            self._tap_timer = None
+            self._second_press = True
+
+        if self.on_long_press is not None:
+            self._long_press_timer = Scheduler.schedule(ControllerSettings.LONG_PRESS_MS, self._long_press_timeout)
+        elif self.on_double_tap is None and self.on_short_press is not None:
+            self.on_short_press()  # Nothing to tell it apart from, so don't wait for the release
+
+    def _released(self):
+        self._is_pressed = False
+        if self._long_press_timer is not None:
+            Scheduler.cancel(self._long_press_timer)
+            self._long_press_timer = None
+
+        if self._long_press_fired:
+            self._second_press = False
+            return
+
+        if self._second_press:
+            self._second_press = False
+            self.on_double_tap()
+        elif self.on_double_tap is not None:
+            self._tap_timer = Scheduler.schedule(ControllerSettings.DOUBLE_TAP_MS, self._tap_timeout)
+            if self._tap_timer is None:
+                self._tap_timeout()  # Scheduler full; report the short press now rather than lose it
+        elif self.on_short_press is not None and self.on_long_press is not None:
+            self.on_short_press()
+
+    def _long_press_timeout(self):
+        self._long_press_timer = None
+        if self._is_pressed:
+            self._long_press_fired = True
+            self._second_press = False
+            self.on_long_press()
+
+    def _tap_timeout(self):
+        self._tap_timer = None
+        if self.on_short_press is not None:
+            self.on_short_press()
+
 class WheelMotor(Motor):
     def __init__(self, port, gear_setting=GearSetting.RATIO_18_1, reversed=False, wheel_diameter_mm=100.0):
         super().__init__(port, gear_setting, reversed)
@@ -383,6 +833,19 @@ class Drivetrain:
         # Movement Override. When True, manual control should NOT be applied.
         self.movement_override = False
 
+        # Motion started by start_drive_for_blind or start_turn_for, finished by update_motion
+        self._motion = Drivetrain.Motion.NONE
+        self._motion_start_time = 0
+        self._motion_timeout_ms = 0
+        self._target_heading = 0
+        self._turn_angle = 0
+        self._turn_speed = 0
+        self._saved_braking_mode = COAST
+        self._saved_left_speed = 0
+        self._saved_right_speed = 0
+        self._saved_strafe_speed = 0
+        self.last_motion_timed_out = False
+
     def drive(self, forward, strafe, turn):
         """
         Drive the robot using arcade-style controls
@@ -400,6 +863,12 @@ class Drivetrain:
         self.right_motor.spin(FORWARD, right_speed, PERCENT)
         self.strafe_motor.spin(FORWARD, strafe_speed, PERCENT)
 
+    class Motion:
+        NONE = 0
+        DRIVE = 1
+        TURN = 2
+        TURN_WAITING = 3    # A turn waiting for the inertial sensor to finish calibrating
+
     def drive_for_blind(self, forward, right, speed=100, brake_type=BRAKE):
         """
         Drive the robot for a specific distance using arcade-style controls.
@@ -412,9 +881,17 @@ class Drivetrain:
             speed: Speed percentage (0 to 100)
             brake_type: Type of braking to apply at the end of movement (BRAKE, COAST, or HOLD)
         """
+        self.start_drive_for_blind(forward, right, speed, brake_type)
+        self.wait_for_motion()
+
+    def start_drive_for_blind(self, forward, right, speed=100, brake_type=BRAKE):
+        """
+        Start a blind drive without waiting for it to finish. Takes the same arguments as drive_for_blind.
+        update_motion() must then be called repeatedly until it returns True.
+        """
         self.movement_override = True
 
-        drivetrain.stop()
+        self.stop()
 
         left_distance = forward
         right_distance = forward
@@ -426,13 +903,13 @@ class Drivetrain:
         strafe_motor_rotations = strafe_distance / (3.14159 * self.strafe_motor.wheel_diameter_mm) * 360
 
         # Store current braking mode and set to BRAKE for precise stopping
-        current_braking_mode = RobotState.current_braking_mode
+        self._saved_braking_mode = RobotState.get().current_braking_mode
         self.set_stopping_mode(brake_type)
 
         # Store current motor speeds
-        left_motor_speed = self.left_motor.velocity(PERCENT)
-        right_motor_speed = self.right_motor.velocity(PERCENT)
-        strafe_motor_speed = self.strafe_motor.velocity(PERCENT)
+        self._saved_left_speed = self.left_motor.velocity(PERCENT)
+        self._saved_right_speed = self.right_motor.velocity(PERCENT)
+        self._saved_strafe_speed = self.strafe_motor.velocity(PERCENT)
 
         # Update motor speeds to 100% for driving
         self.left_motor.set_velocity(speed, PERCENT)
@@ -442,22 +919,8 @@ class Drivetrain:
         self.left_motor.spin_for(FORWARD, left_motor_rotations, DEGREES, wait=False)
         self.right_motor.spin_for(FORWARD, right_motor_rotations, DEGREES, wait=False)
         self.strafe_motor.spin_for(FORWARD, strafe_motor_rotations, DEGREES, wait=False)
-        
-        # Wait for motors to stop spinning
-        timer = Timer()
-        while (self.left_motor.is_spinning() or self.right_motor.is_spinning() or self.strafe_motor.is_spinning()) \
-            and timer.time() < 5000: # 5 second timeout
-            wait(10, MSEC)
 
-        # Restore previous braking mode
-        self.set_stopping_mode(current_braking_mode)
-
-        # Restore previous motor speeds
-        self.left_motor.set_velocity(left_motor_speed, PERCENT)
-        self.right_motor.set_velocity(right_motor_speed, PERCENT)
-        self.strafe_motor.set_velocity(strafe_motor_speed, PERCENT)
-
-        self.movement_override = False
+        self._begin_motion(Drivetrain.Motion.DRIVE, 5000)  # 5 second timeout
 
     def turn_for(self, angle_degrees, speed=50, timeout_ms=5000):
         """
@@ -468,17 +931,41 @@ class Drivetrain:
             speed: Speed percentage (0 to 100)
             timeout_ms: Maximum time to wait for turn completion in milliseconds (default 5000ms)
         """
+        # Turns need a calibrated heading. Nothing else waits for the inertial sensor.
+        if not Sensors.wait_for_heading(SensorSettings.CALIBRATION_TIMEOUT_MS):
+            logger.warning("Inertial sensor not calibrated - turn may be inaccurate")
+        self.start_turn_for(angle_degrees, speed, timeout_ms)
+        self.wait_for_motion()
+
+    def start_turn_for(self, angle_degrees, speed=50, timeout_ms=5000):
+        """
+        Start a turn without waiting for it to finish. Takes the same arguments as turn_for.
+        update_motion() must then be called repeatedly until it returns True.
+
+        If the inertial sensor is still calibrating, the motors start once update_motion() finds it ready. The
+        wait counts towards timeout_ms.
+        """
         self.movement_override = True
-        drivetrain.stop()
+        self.stop()
         
         # Store current braking mode and set to BRAKE for precise stopping
-        current_braking_mode = RobotState.current_braking_mode
+        self._saved_braking_mode = RobotState.get().current_braking_mode
         self.set_stopping_mode(BRAKE)
-        
+
+        self._turn_angle = angle_degrees
+        self._turn_speed = speed
+        self._begin_motion(Drivetrain.Motion.TURN_WAITING, timeout_ms)
+        if Sensors.is_heading_ready():
+            self._start_turning()
+
+    def _start_turning(self):
+        """Spin the motors for the turn set up by start_turn_for"""
+        speed = self._turn_speed
+
         # Calculate headings
         initial_heading = self.inertia_sensor.heading()
-        target_heading = (initial_heading + angle_degrees) % 360
-        heading_difference = self._normalize_angle_difference(target_heading - initial_heading)
+        self._target_heading = (initial_heading + self._turn_angle) % 360
+        heading_difference = self._normalize_angle_difference(self._target_heading - initial_heading)
         
         # Turn based on shortest path
         if heading_difference > 0:
@@ -489,28 +976,69 @@ class Drivetrain:
             # Turn counter-clockwise
             self.left_motor.spin(REVERSE, speed, PERCENT)
             self.right_motor.spin(FORWARD, speed, PERCENT)
-        
-        # Start timeout timer
-        start_time = brain.timer.time(MSEC)
-        
-        # Continue turning until target heading is reached or timeout
-        while brain.timer.time(MSEC) - start_time < timeout_ms:
-            current_heading = self.inertia_sensor.heading()
-            heading_difference = self._normalize_angle_difference(target_heading - current_heading)
-            
-            # Stop if within tolerance
-            if abs(heading_difference) < 1.0:
-                break
-            
+
+        self._motion = Drivetrain.Motion.TURN
+
+    def update_motion(self):
+        """
+        Check on the motion started by start_drive_for_blind or start_turn_for, finishing it once it is done.
+        Returns True when no motion is running anymore.
+        """
+        if self._motion == Drivetrain.Motion.NONE:
+            return True
+
+        if self._motion == Drivetrain.Motion.DRIVE:
+            # Done once all motors have stopped spinning
+            done = not (self.left_motor.is_spinning() or self.right_motor.is_spinning() or self.strafe_motor.is_spinning())
+        elif self._motion == Drivetrain.Motion.TURN_WAITING:
+            done = False
+            if Sensors.is_heading_ready():
+                self._start_turning()
+        else:
+            # Done once within tolerance of the target heading
+            heading_difference = self._normalize_angle_difference(self._target_heading - self.inertia_sensor.heading())
+            done = abs(heading_difference) < 1.0
+
+        timed_out = not done and brain.timer.time(MSEC) - self._motion_start_time >= self._motion_timeout_ms
+        if not (done or timed_out):
+            return False
+
+        self._finish_motion(timed_out)
+        return True
+
+    def wait_for_motion(self):
+        """Block until the current motion is finished"""
+        while not self.update_motion():
             wait(10, MSEC)
+
+    def _begin_motion(self, motion, timeout_ms):
+        """Record the start of a motion"""
+        self._motion = motion
+        self._motion_timeout_ms = timeout_ms
+        self._motion_start_time = brain.timer.time(MSEC)
+
+    def _finish_motion(self, timed_out):
+        """Stop the current motion and restore the settings it changed"""
+        if self._motion == Drivetrain.Motion.TURN_WAITING:
+            logger.warning("Inertial sensor not calibrated - turn skipped")
+            self.stop()
+        elif self._motion == Drivetrain.Motion.TURN:
+            if timed_out:
+                logger.warning("Turn timed out before reaching target heading")
+
+            # Stop motors
+            self.stop()
         else:
-            logger.warning("Turn timed out before reaching target heading")
-        
-        # Stop motors
-        self.stop()
-        
+            # Restore previous motor speeds
+            self.left_motor.set_velocity(self._saved_left_speed, PERCENT)
+            self.right_motor.set_velocity(self._saved_right_speed, PERCENT)
+            self.strafe_motor.set_velocity(self._saved_strafe_speed, PERCENT)
+
         # Restore previous braking mode
-        self.set_stopping_mode(current_braking_mode)
+        self.set_stopping_mode(self._saved_braking_mode)
+
+        self.last_motion_timed_out = timed_out
+        self._motion = Drivetrain.Motion.NONE
         self.movement_override = False
 
     def stop(self, brake_type=BRAKE):
@@ -557,6 +1085,219 @@ class Drivetrain:
 
 
 
+# =============================================================================
+# MEMORY MANAGEMENT
+# =============================================================================
+
+class MemoryManager:
+    """
+    Garbage collection scheduling for the control loops. While a control period runs, automatic collection is
+    off and the loops call collect_in_slack() after each tick, so collections happen in the time left before the
+    next tick instead of at whichever allocation happens to fill the heap. MicroPython only does full collections;
+    keeping the allocations between them small keeps each one short.
+    """
+    managing = False            # Automatic collection is off and the control loops collect
+    collections = 0             # Collections since the match started
+    worst_pause_ms = 0          # Longest collection since the match started
+    last_pause_ms = 0           # Duration of the last collection, used to predict the next one
+    memory_in_use = None        # Heap in use after the last tick (bytes), None if the runtime can't report it
+    memory_total = None         # Heap size (bytes)
+    peak_memory = None          # Most heap in use since the match started (bytes)
+
+    _can_measure = hasattr(gc, "mem_alloc") and hasattr(gc, "mem_free")
+    _memory_after_collect = 0   # Heap in use right after the last collection
+    _last_collect_time = 0
+    _watchdog_started = False
+
+    @classmethod
+    def get_memory_in_use(cls):
+        """Get the heap in use in bytes, or None if the runtime can't report it"""
+        return gc.mem_alloc() if cls._can_measure else None
+
+    @classmethod
+    def reset_stats(cls):
+        """Start a new match's statistics"""
+        cls.collections = 0
+        cls.worst_pause_ms = 0
+        cls.peak_memory = None
+
+    @classmethod
+    def start_control(cls):
+        """Turn automatic collection off for a control period, starting it with a clean heap"""
+        if not MemorySettings.MANAGED_COLLECTION_ENABLED:
+            return
+        cls.collect()
+        gc.disable()
+        cls.managing = True
+        if not cls._watchdog_started:
+            cls._watchdog_started = True
+            Thread(cls._watchdog_thread)
+
+    @classmethod
+    def _watchdog_thread(cls):
+        """
+        Turn automatic collection back on once the robot is disabled. The field stops the control period's
+        thread without returning from it, and other threads keep allocating after that.
+        """
+        while True:
+            if cls.managing and not comp.is_enabled():
+                cls.stop_control()
+            wait(MemorySettings.DISABLED_CHECK_MS, MSEC)
+
+    @classmethod
+    def stop_control(cls):
+        """Turn automatic collection back on"""
+        if cls.managing:
+            cls.managing = False
+            gc.enable()
+
+    @classmethod
+    def collect(cls):
+        """
+        Run a collection and record how long it took
+
+        Returns:
+            Duration of the collection in milliseconds
+        """
+        start_time = brain.timer.system_high_res()
+        gc.collect()
+        pause = (brain.timer.system_high_res() - start_time) / 1000
+        cls.collections += 1
+        cls.last_pause_ms = pause
+        if pause > cls.worst_pause_ms:
+            cls.worst_pause_ms = pause
+        cls._last_collect_time = brain.timer.time()
+        if cls._can_measure:
+            cls._memory_after_collect = gc.mem_alloc()
+        return pause
+
+    @classmethod
+    def collect_in_slack(cls, slack_ms):
+        """
+        Called by the control loops after each tick. Collects if enough has been allocated since the last
+        collection and the expected pause fits in slack_ms. Collects regardless of slack if free heap runs low,
+        since with automatic collection off a full heap raises MemoryError instead of collecting.
+
+        Returns:
+            Time spent collecting in milliseconds
+        """
+        if not cls.managing:
+            return 0
+
+        if cls._can_measure:
+            in_use = gc.mem_alloc()
+            free = gc.mem_free()
+            cls.memory_in_use = in_use
+            cls.memory_total = in_use + free
+            if cls.peak_memory is None or in_use > cls.peak_memory:
+                cls.peak_memory = in_use
+            if free < MemorySettings.MIN_FREE_BYTES:
+                return cls.collect()
+            due = in_use - cls._memory_after_collect >= MemorySettings.COLLECT_AFTER_BYTES
+        else:
+            due = brain.timer.time() - cls._last_collect_time >= MemorySettings.FALLBACK_INTERVAL_MS
+
+        if due and slack_ms >= MemorySettings.MIN_SLACK_MS and slack_ms > cls.last_pause_ms:
+            return cls.collect()
+        return 0
+
+    @classmethod
+    def get_summary(cls):
+        """Get a one line summary of heap usage and collection pauses"""
+        if cls.memory_in_use is None:
+            heap = "Heap -"
+        else:
+            heap = "Heap " + str(cls.memory_in_use // 1024) + "/" + str(cls.memory_total // 1024) + "KB"
+        return heap + "  GC max " + str(round(cls.worst_pause_ms, 1)) + "ms"
+
+    @classmethod
+    def report(cls):
+        """Log heap usage and collection pauses for the match so far"""
+        message = "GC: " + str(cls.collections) + " runs, worst " + str(round(cls.worst_pause_ms, 1)) + "ms"
+        if cls.peak_memory is not None:
+            message += ", peak heap " + str(cls.peak_memory // 1024) + "KB"
+        logger.info(message, ScreenTarget.BRAIN)
+
+
+# =============================================================================
+# STARTUP PROFILING
+# =============================================================================
+
+class Startup:
+    """
+    Startup phase timing. Each top level phase calls mark() when it finishes. Inertial calibration runs in the
+    background while the rest of startup continues; only turns wait for it. Once it is done, the phase timings are
+    logged and saved to the SD card as CSV (the configuration screen usually covers the log at that point).
+    """
+    FILENAME = "startup_profile.csv"
+
+    phase_times = []            # (phase name, time it finished in ms since program start, heap in use in bytes or None)
+    interactive_time = None     # Time the configuration screen was first shown
+    heading_ready_time = None   # Time the inertial sensor finished calibrating
+    peak_memory = None          # Most heap in use at any mark (bytes), None if the runtime can't report it
+
+    @classmethod
+    def mark(cls, name):
+        """Record that a startup phase has finished"""
+        memory = MemoryManager.get_memory_in_use()
+        if memory is not None and (cls.peak_memory is None or memory > cls.peak_memory):
+            cls.peak_memory = memory
+        cls.phase_times.append((name, brain.timer.time(MSEC), memory))
+
+    @classmethod
+    def mark_interactive(cls):
+        """Record that the configuration screen is shown and accepting touches"""
+        if cls.interactive_time is None:
+            cls.mark("Config screen shown")
+            cls.interactive_time = brain.timer.time(MSEC)
+
+    @classmethod
+    def get_summary(cls):
+        """Get a one line summary of the startup timings"""
+        screen = "-" if cls.interactive_time is None else str(int(cls.interactive_time)) + "ms"
+        heading = "-" if cls.heading_ready_time is None else str(int(cls.heading_ready_time)) + "ms"
+        return "Startup: screen " + screen + "  heading " + heading
+
+    @classmethod
+    def _calibration_thread(cls):
+        """Wait for the inertial sensor in the background, then report the startup timings"""
+        if Sensors.wait_for_heading(SensorSettings.CALIBRATION_TIMEOUT_MS):
+            cls.mark("Inertial calibrated")
+            cls.heading_ready_time = brain.timer.time(MSEC)
+        else:
+            logger.warning("Inertial sensor calibration timed out")
+        cls.report()
+
+    @classmethod
+    def start_calibration(cls):
+        """Start inertial calibration and the thread that waits for it"""
+        Sensors.start_inertial_calibration()
+        Thread(cls._calibration_thread)
+
+    @classmethod
+    def report(cls):
+        """Log the time each startup phase took and save the timings to the SD card"""
+        lines = ["phase,end_ms,duration_ms,heap_bytes"]
+        previous_time = 0
+        for name, time, memory in cls.phase_times:
+            message = name + ": " + str(int(time - previous_time)) + "ms"
+            if memory is not None:
+                message += " " + str(memory // 1024) + "KB"
+            logger.info(message, ScreenTarget.BRAIN)
+            lines.append(name + "," + str(int(time)) + "," + str(int(time - previous_time)) + "," +
+                         ("" if memory is None else str(memory)))
+            previous_time = time
+        if cls.heading_ready_time is not None:
+            logger.info("IMU ready " + str(int(cls.heading_ready_time)) + "ms", ScreenTarget.CONTROLLER)
+
+        if not brain.sdcard.is_inserted():
+            return
+        try:
+            brain.sdcard.savefile(cls.FILENAME, bytearray("\n".join(lines) + "\n", "utf-8"))
+        except Exception as e:
+            logger.error("Failed to save startup profile: " + str(e), ScreenTarget.BRAIN)
+
+
 # =============================================================================
 # ROBOT CONFIGURATION
 # =============================================================================
@@ -598,9 +1339,12 @@ class Sensors:
     intake_optical_sensor_right = Optical(Ports.PORT5)
     intake_optical_sensor_left = Optical(Ports.PORT4)
 
+    heading_ready = False  # True once the inertial sensor has finished calibrating
+    _calibration_start_time = None
+
     @classmethod
     def initialize_sensors(cls):
-        """Initialize sensors"""
+        """Initialize the optical sensors"""
         # Set light power for optical sensors
         cls.intake_optical_sensor_left.set_light_power(100)
         cls.intake_optical_sensor_right.set_light_power(100)
@@ -609,10 +1353,48 @@ class Sensors:
         cls.intake_optical_sensor_left.object_detect_threshold(40)
         cls.intake_optical_sensor_right.object_detect_threshold(40)
 
-        # Calibrate inertial sensor
+    @classmethod
+    def start_inertial_calibration(cls):
+        """Start calibrating the inertial sensor. Returns immediately; use is_heading_ready() to check on it."""
         logger.info("Calibrating inertial sensor...")
+        cls.heading_ready = False
+        cls._calibration_start_time = brain.timer.time(MSEC)
         cls.inertia_sensor.calibrate()
-        logger.info("Inertial sensor calibration complete.")
+
+    @classmethod
+    def is_heading_ready(cls):
+        """Check if the inertial sensor has finished calibrating"""
+        if not cls.heading_ready and cls._calibration_start_time is not None:
+            elapsed = brain.timer.time(MSEC) - cls._calibration_start_time
+            if elapsed >= SensorSettings.CALIBRATION_START_MS and not cls.inertia_sensor.is_calibrating():
+                cls.heading_ready = True
+                logger.info("Inertial sensor calibration complete.")
+        return cls.heading_ready
+
+    @classmethod
+    def wait_for_heading(cls, timeout_ms):
+        """
+        Wait until the inertial sensor has finished calibrating
+
+        Args:
+            timeout_ms: Longest time to wait
+
+        Returns:
+            True if the heading is ready
+        """
+        start_time = brain.timer.time(MSEC)
+        while not cls.is_heading_ready():
+            if brain.timer.time(MSEC) - start_time >= timeout_ms:
+                return False
+            wait(10, MSEC)
+        return True
+
+    @classmethod
+    def is_block_in_intake(cls):
+        """Check if either intake optical sensor sees an object"""
+        return cls.intake_optical_sensor_right.is_near_object() or cls.intake_optical_sensor_left.is_near_object()
+
+Startup.mark("Devices")
 
 
 # Create logger instance (requires brain and controller to be initialized)
@@ -621,7 +1403,199 @@ logger = Logger(brain, controller)
 # Drivetrain instance using motor groups
 drivetrain = Drivetrain(Motors.left_motor_group, Motors.right_motor_group, Motors.strafe_motor, Sensors.inertia_sensor)
 
-Sensors.initialize_sensors()
+Startup.mark("Logger and drivetrain")
+
+# =============================================================================
+# SCHEDULING
+# =============================================================================
+
+class ScheduledAction:
+    """A pending Scheduler action. Instances are pooled and reused."""
+    def __init__(self):
+        self.deadline = 0
+        self.callback = None
+        self.slot = 0
+
+class Scheduler:
+    """
+    Timer wheel for short delayed actions, like closing a solenoid after a few hundred milliseconds. The driver
+    control loop and the autonomous executor call tick(); actions run on that thread, so they must not block.
+    Actions come from a fixed pool, so scheduling never creates threads or allocates.
+    """
+    _slots = [[] for _ in range(SchedulerSettings.SLOT_COUNT)]
+    _free_entries = [ScheduledAction() for _ in range(SchedulerSettings.MAX_ENTRIES)]
+    _next_slot_time = None  # Start time of the first slot that hasn't been processed yet
+    _ticking_slot = None    # Slot being processed by tick(); cancelled entries in it are freed by tick()
+
+    @classmethod
+    def schedule(cls, delay_ms, callback):
+        """
+        Run callback after delay_ms, on the next tick after that
+
+        Returns:
+            The ScheduledAction, which can be passed to cancel(), or None if too many actions are pending
+        """
+        if not cls._free_entries:
+            logger.error("Scheduler full - action dropped")
+            return None
+        entry = cls._free_entries.pop()
+        entry.deadline = brain.timer.time(MSEC) + delay_ms
+        entry.callback = callback
+        if cls._next_slot_time is None:
+            cls._next_slot_time = brain.timer.time(MSEC) // SchedulerSettings.SLOT_MS * SchedulerSettings.SLOT_MS
+        slot = int(entry.deadline // SchedulerSettings.SLOT_MS) % SchedulerSettings.SLOT_COUNT
+        entry.slot = slot
+        cls._slots[slot].append(entry)
+        return entry
+
+    @classmethod
+    def cancel(cls, entry):
+        """
+        Cancel a pending action and return its entry to the pool. Only pass actions that haven't run yet, since
+        they are reused afterwards.
+        """
+        if entry is None or entry.callback is None:
+            return
+        entry.callback = None
+        if entry.slot == cls._ticking_slot:
+            return  # tick() is walking this slot and frees the entry when it gets to it
+        cls._slots[entry.slot].remove(entry)
+        cls._free_entries.append(entry)
+
+    @classmethod
+    def tick(cls):
+        """Run the actions that are due. Called from the control loops."""
+        if cls._next_slot_time is None:
+            return  # Nothing has been scheduled yet
+        now = brain.timer.time(MSEC)
+        current_slot_time = now // SchedulerSettings.SLOT_MS * SchedulerSettings.SLOT_MS
+
+        # Process every slot that has started since the last tick. After a long gap, one revolution covers them all.
+        oldest_slot_time = current_slot_time - (SchedulerSettings.SLOT_COUNT - 1) * SchedulerSettings.SLOT_MS
+        slot_time = max(cls._next_slot_time, oldest_slot_time)
+        while slot_time <= current_slot_time:
+            cls._ticking_slot = int(slot_time // SchedulerSettings.SLOT_MS) % SchedulerSettings.SLOT_COUNT
+            entries = cls._slots[cls._ticking_slot]
+            i = 0
+            while i < len(entries):
+                entry = entries[i]
+                if entry.callback is not None and entry.deadline > now:
+                    i += 1  # Due in a later revolution (or later in this slot)
+                    continue
+                entries.pop(i)
+                callback = entry.callback
+                entry.callback = None
+                cls._free_entries.append(entry)
+                if callback is not None:
+                    try:
+                        callback()
+                    except Exception as e:
+                        logger.error("Scheduled action failed: " + str(e))
+            slot_time += SchedulerSettings.SLOT_MS
+        cls._ticking_slot = None
+
+        # The current slot may still have entries due later in it, so it is processed again next tick
+        cls._next_slot_time = current_slot_time
+
+class TaskSupervisor:
+    """
+    Runs a task function and restarts it in a loop when it raises, waiting longer after each crash (exponential
+    backoff). Gives up after max_restarts restarts in one run. Crashes from every task are kept in crash_history.
+    """
+    crash_history = []  # (time in ms, task name, error message), oldest first
+
+    def __init__(self, name, task, max_restarts, on_crash=None):
+        """
+        Args:
+            name: Task name for logs and the crash history
+            task: Function to run. Returning ends the task normally.
+            max_restarts: Restarts allowed per call to run()
+            on_crash: Optional function called after each crash, before any restart (e.g. to stop the motors)
+        """
+        self.name = name
+        self.task = task
+        self.max_restarts = max_restarts
+        self.on_crash = on_crash
+        self.restarts = 0           # Restarts during the current run
+        self.total_restarts = 0     # Restarts since the program started
+
+    def run(self):
+        """Run the task until it returns or has crashed more than max_restarts times. Blocks."""
+        self.restarts = 0
+        backoff_ms = SupervisorSettings.INITIAL_BACKOFF_MS
+        while True:
+            start_time = brain.timer.time(MSEC)
+            try:
+                self.task()
+                return
+            except Exception as e:
+                self._record_crash(e)
+
+            if self.on_crash is not None:
+                try:
+                    self.on_crash()
+                except Exception as e:
+                    logger.error(self.name + " crash handler failed: " + str(e))
+
+            if self.restarts >= self.max_restarts:
+                logger.critical(self.name + " stopped after " + str(self.restarts) + " restarts", ScreenTarget.BOTH)
+                return
+
+            if brain.timer.time(MSEC) - start_time >= SupervisorSettings.STABLE_RUN_MS:
+                backoff_ms = SupervisorSettings.INITIAL_BACKOFF_MS
+            logger.error("Restarting " + self.name + " in " + str(backoff_ms) + "ms", ScreenTarget.BOTH)
+            wait(backoff_ms, MSEC)
+            backoff_ms = min(backoff_ms * 2, SupervisorSettings.MAX_BACKOFF_MS)
+            self.restarts += 1
+            self.total_restarts += 1
+
+    def _record_crash(self, error):
+        """Log a crash and add it to the crash history"""
+        logger.critical(self.name + " crashed: " + str(error))
+        history = TaskSupervisor.crash_history
+        history.append((brain.timer.time(MSEC), self.name, str(error)))
+        if len(history) > SupervisorSettings.CRASH_HISTORY_SIZE:
+            history.pop(0)
+
+class WorkerPool:
+    """
+    Fixed set of worker threads for actions that block, like fine control drives. Jobs run in the order they were
+    submitted; if too many are waiting, new ones are dropped instead of piling up threads.
+    """
+    _queue = []
+    _workers_started = False
+
+    @classmethod
+    def submit(cls, job):
+        """
+        Queue a job to run on a worker thread
+
+        Returns:
+            True if the job was queued
+        """
+        if not cls._workers_started:
+            cls._workers_started = True
+            for _ in range(SchedulerSettings.WORKER_COUNT):
+                Thread(cls._worker_thread)
+        if len(cls._queue) >= SchedulerSettings.MAX_QUEUED_JOBS:
+            logger.debug("Worker queue full - job dropped")
+            return False
+        cls._queue.append(job)
+        return True
+
+    @classmethod
+    def _worker_thread(cls):
+        """Run queued jobs one at a time"""
+        while True:
+            if cls._queue:
+                job = cls._queue.pop(0)
+                try:
+                    job()
+                except Exception as e:
+                    logger.error("Worker job failed: " + str(e))
+            else:
+                wait(SchedulerSettings.WORKER_POLL_MS, MSEC)
+
 
 # =============================================================================
 # BLOCK MANIPULATION SYSTEMS
@@ -629,10 +1603,41 @@ Sensors.initialize_sensors()
 
 class BlockManipulationSystem:
     def __init__(self):
-        self._state = BlockManipulationSystem.State.IDLE
         self._intaking = self._Intaking()
         self._outputting = self._Outputting()
 
+        State = BlockManipulationSystem.State
+
+        # State table: state -> (entry action, per-tick action, exit action). None means no action.
+        # Static outputs (solenoids, lights, fixed motor speeds) belong in the entry action so they
+        # are applied once; only logic that depends on sensors runs every tick.
+        self._state_table = {
+            State.IDLE: (self._handle_idle, None, None),
+            State.INTAKING: (self._intaking.enter, self._intaking.handle_intaking, self._intaking.exit),
+            State.OUTPUTTING_LOW: (self._outputting.handle_output_low, None, None),
+            State.OUTPUTTING_MEDIUM: (self._outputting.handle_output_medium, None, None),
+            State.OUTPUTTING_HIGH: (self._outputting.handle_output_high, None, None),
+        }
+
+        # Allowed transitions: state -> states it may change to. Requests for other transitions are ignored.
+        self._transitions = {
+            State.IDLE: (State.INTAKING, State.OUTPUTTING_LOW, State.OUTPUTTING_MEDIUM, State.OUTPUTTING_HIGH),
+            State.INTAKING: (State.IDLE, State.OUTPUTTING_LOW, State.OUTPUTTING_MEDIUM, State.OUTPUTTING_HIGH),
+            State.OUTPUTTING_LOW: (State.IDLE, State.INTAKING, State.OUTPUTTING_MEDIUM, State.OUTPUTTING_HIGH),
+            State.OUTPUTTING_MEDIUM: (State.IDLE, State.INTAKING, State.OUTPUTTING_LOW, State.OUTPUTTING_HIGH),
+            State.OUTPUTTING_HIGH: (State.IDLE, State.INTAKING, State.OUTPUTTING_LOW, State.OUTPUTTING_MEDIUM),
+        }
+
+        self._state = None  # No state has been entered yet; the first update enters the requested state
+        self._requested_state = State.IDLE
+        self._state_entered_time = 0
+
+        # Number of times each transition has happened, keyed by (from_state, to_state)
+        self.transition_counts = {}
+
+        # Highest intake motor temperature seen (C)
+        self.peak_temperature = 0
+
     class State:
         IDLE = 0
         INTAKING = 1
@@ -641,72 +1646,182 @@ class BlockManipulationSystem:
         OUTPUTTING_HIGH = 4
 
     def set_state(self, new_state):
-        self._state = new_state
+        """Request a state change. It is applied on the next update."""
+        self._requested_state = new_state
 
     def set_and_update_state(self, new_state):
         self.set_state(new_state)
         self.update()
 
+    def get_state(self):
+        """Get the state the system is currently in"""
+        return self._state
+
     def update(self):
-        """Main tick function to update the system based on current state"""
-        if self._state == BlockManipulationSystem.State.INTAKING:
-            self._intaking.handle_intaking()
-        elif self._state == BlockManipulationSystem.State.OUTPUTTING_LOW:
-            self._outputting.handle_output_low()
-        elif self._state == BlockManipulationSystem.State.OUTPUTTING_MEDIUM:
-            self._outputting.handle_output_medium()
-        elif self._state == BlockManipulationSystem.State.OUTPUTTING_HIGH:
-            self._outputting.handle_output_high()
-        else:
-            self._handle_idle()
+        """Main tick function. Applies any pending state change, then runs the current state's per-tick logic."""
+        current_time = brain.timer.time()
+
+        if self._requested_state != self._state and self._can_leave_state(current_time):
+            self._transition(self._requested_state, current_time)
+
+        tick_action = self._state_table[self._state][1]
+        if tick_action is not None and \
+            current_time - self._state_entered_time >= BlockManipulationSettings.TRANSITION_SETTLE_MS:
+            tick_action()
+
+    def _can_leave_state(self, current_time):
+        """Check whether the current state may be left yet"""
+        if self._state is None or self._requested_state == BlockManipulationSystem.State.IDLE:
+            return True
+        if self._requested_state not in self._transitions[self._state]:
+            return False
+        return current_time - self._state_entered_time >= BlockManipulationSettings.MIN_STATE_DWELL_MS
+
+    def _transition(self, new_state, current_time):
+        """Run the exit action of the current state and the entry action of the new one"""
+        if self._state is not None:
+            exit_action = self._state_table[self._state][2]
+            if exit_action is not None:
+                exit_action()
+
+        key = (self._state, new_state)
+        self.transition_counts[key] = self.transition_counts.get(key, 0) + 1
+
+        self._state = new_state
+        self._state_entered_time = current_time
+
+        entry_action = self._state_table[new_state][0]
+        if entry_action is not None:
+            entry_action()
 
     class _Intaking:
+        _state_version = None       # Version of the robot state the values below were derived from
+        _alliance_color = None      # None when color rejection is off
         reject_current_block = False
         last_trigger_time = 0
-        def handle_intaking(self):
-            """Intaking logic"""
-            self._check_current_block()
+        _top_motor_direction = None
+
+        # Adaptive duty state
+        _speed = 0
+        _speed_changed_time = 0
+        _last_detection_time = 0
+        _block_near = False
+
+        # Block colors, created once so that ticks don't allocate them
+        RED = AllianceColor("RED")
+        BLUE = AllianceColor("BLUE")
+        UNKNOWN = AllianceColor("UNKNOWN")
+
+        def enter(self):
+            """Intaking entry actions"""
+            current_time = brain.timer.time()
+            self._block_near = False
+            self._speed = IntakeSettings.IDLE_SPEED_PERCENT if IntakeSettings.ADAPTIVE_DUTY_ENABLED else IntakeSettings.BOOST_SPEED_PERCENT
+            self._speed_changed_time = current_time
+
             Solenoids.intake_solenoid.open()  # Expand/extend the intake
-            Motors.bottom_intake_motor.spin(FORWARD, 100, PERCENT)
-            Motors.top_intake_motor.spin(FORWARD if not self.reject_current_block else REVERSE, 100, PERCENT)
+            Motors.bottom_intake_motor.spin(FORWARD, self._speed, PERCENT)
             Motors.unloading_motor.stop(BRAKE)
-
-        def _check_current_block(self):
-            """Check if the current block should be rejected based on vision sensor"""     
-            def classify_color(hue):
-                if 0 <= hue <= 10:
-                    return AllianceColor("red")
-                elif 80 <= hue <= 255:
-                    return AllianceColor("blue")
-                else:
-                    return AllianceColor("unknown")
-                
-            # Check that system is active (alliance color is known)
-            if RobotState.current_alliance_color == AllianceColor("unknown"):
-                self.reject_current_block = False
-                return
+            self._top_motor_direction = None  # Other states may have changed the top motor; always command it on entry
+            self._spin_top_motor(REVERSE if self.reject_current_block else FORWARD)
 
             # Turn on intake color sensor lights
             Sensors.intake_optical_sensor_left.set_light(LedStateType.ON)
             Sensors.intake_optical_sensor_right.set_light(LedStateType.ON)
 
-            # Get current object from vision sensor
-            left_hue = classify_color(Sensors.intake_optical_sensor_left.hue())
-            right_hue = classify_color(Sensors.intake_optical_sensor_right.hue())
+        def handle_intaking(self):
+            """Per-tick intaking logic. Only the motor speed and top motor direction depend on the current block."""
+            self._update_duty()
+            self._check_current_block()
+            self._spin_top_motor(REVERSE if self.reject_current_block else FORWARD)
 
-            # logger.info("Color: Left Hue: " + str(Sensors.intake_optical_sensor_left.hue()), ScreenTarget.BRAIN)
+        def exit(self):
+            """Intaking exit actions"""
+            Sensors.intake_optical_sensor_left.set_light(LedStateType.OFF)
+            Sensors.intake_optical_sensor_right.set_light(LedStateType.OFF)
 
-            if Sensors.intake_optical_sensor_right.is_near_object() or Sensors.intake_optical_sensor_left.is_near_object():
-                # Red object detection
-                if left_hue == AllianceColor("red") or right_hue == AllianceColor("red"):
-                    self.reject_current_block = (RobotState.current_alliance_color != AllianceColor("red"))
-                    self.last_trigger_time = brain.timer.time()
-                    logger.debug("Red block detected - accepting", ScreenTarget.BOTH)
-                    return
+        def _spin_top_motor(self, direction, force=False):
+            """Spin the top intake motor, only sending a command when the direction changes"""
+            if direction == self._top_motor_direction and not force:
+                return
+            Motors.top_intake_motor.spin(direction, self._speed, PERCENT)
+            self._top_motor_direction = direction
+
+        def _update_duty(self):
+            """
+            Pick the intake speed for this tick. In adaptive mode the intake idles at a lower speed
+            and boosts to full power while a block is near the optical sensors or loading the rollers.
+            """
+            current_time = brain.timer.time()
+            self._block_near = Sensors.is_block_in_intake()
+
+            if not IntakeSettings.ADAPTIVE_DUTY_ENABLED:
+                return
 
-                # Blue object detection
-                if left_hue == AllianceColor("blue") or right_hue == AllianceColor("blue"):
-                    self.reject_current_block = (RobotState.current_alliance_color != AllianceColor("blue"))
+            block_detected = self._block_near
+            if not block_detected and current_time - self._speed_changed_time > IntakeSettings.SPIN_UP_IGNORE_MS:
+                # Spin-up draws extra current, so only trust the current reading once the speed has settled
+                intake_current = Motors.bottom_intake_motor.current(CurrentUnits.AMP)
+                block_detected = intake_current > IntakeSettings.NO_LOAD_CURRENT_AMPS + IntakeSettings.CURRENT_RISE_AMPS
+
+            if block_detected:
+                self._last_detection_time = current_time
+
+            if current_time - self._last_detection_time < IntakeSettings.BOOST_HOLD_MS:
+                speed = IntakeSettings.BOOST_SPEED_PERCENT
+            else:
+                speed = IntakeSettings.IDLE_SPEED_PERCENT
+
+            if speed != self._speed:
+                self._speed = speed
+                self._speed_changed_time = current_time
+                Motors.bottom_intake_motor.spin(FORWARD, speed, PERCENT)
+                self._spin_top_motor(self._top_motor_direction, force=True)
+
+        def _classify_color(self, hue):
+            """Get the color of a block from its hue"""
+            if 0 <= hue <= 10:
+                return self.RED
+            elif 80 <= hue <= 255:
+                return self.BLUE
+            else:
+                return self.UNKNOWN
+
+        def _check_current_block(self):
+            """Check if the current block should be rejected based on vision sensor"""
+            RED = self.RED
+            BLUE = self.BLUE
+
+            # Re-derive the alliance color only when the robot state has changed
+            state = RobotState.get()
+            if state.version != self._state_version:
+                self._state_version = state.version
+                color = state.current_alliance_color
+                enabled = state.color_rejection_enabled and color != self.UNKNOWN
+                self._alliance_color = color if enabled else None
+
+            # Check that system is active (alliance color is known and rejection is enabled)
+            if self._alliance_color is None:
+                self.reject_current_block = False
+                return
+
+            # Get current object from vision sensor
+            left_hue = self._classify_color(Sensors.intake_optical_sensor_left.hue())
+            right_hue = self._classify_color(Sensors.intake_optical_sensor_right.hue())
+
+            # logger.info("Color: Left Hue: " + str(Sensors.intake_optical_sensor_left.hue()), ScreenTarget.BRAIN)
+
+            if self._block_near:
+                # Red object detection
+                if left_hue == RED or right_hue == RED:
+                    self.reject_current_block = (self._alliance_color != RED)
+                    self.last_trigger_time = brain.timer.time()
+                    logger.debug("Red block detected - accepting", ScreenTarget.BOTH)
+                    return
+
+                # Blue object detection
+                if left_hue == BLUE or right_hue == BLUE:
+                    self.reject_current_block = (self._alliance_color != BLUE)
                     self.last_trigger_time = brain.timer.time()
                     logger.debug("Blue block detected - rejecting", ScreenTarget.BOTH)
                     return
@@ -718,26 +1833,26 @@ class BlockManipulationSystem:
 
     class _Outputting:
         def handle_output_low(self):
-            """Output low logic"""
+            """Output low entry actions"""
             Motors.bottom_intake_motor.spin(REVERSE, 100, PERCENT)
             Motors.top_intake_motor.stop(BRAKE)
             Motors.unloading_motor.spin(REVERSE, 100, PERCENT)
 
         def handle_output_medium(self):
-            """Output medium logic"""
+            """Output medium entry actions"""
             Motors.bottom_intake_motor.spin(FORWARD, 100, PERCENT)
             Motors.top_intake_motor.spin(REVERSE, 100, PERCENT)
             Motors.unloading_motor.spin(REVERSE, 100, PERCENT)
 
         def handle_output_high(self):
-            """Output high logic"""
+            """Output high entry actions"""
             Solenoids.intake_solenoid.close()  # Retract/contract the intake
             Motors.bottom_intake_motor.spin(FORWARD, 100, PERCENT)
             Motors.top_intake_motor.spin(FORWARD, 100, PERCENT)
             Motors.unloading_motor.spin(REVERSE, 100, PERCENT)
     
     def _handle_idle(self):
-        """Idle state - stop all motors"""
+        """Idle entry actions - stop all motors"""
         Motors.bottom_intake_motor.stop(BRAKE)
         Motors.top_intake_motor.stop(BRAKE)
         Motors.unloading_motor.stop(BRAKE)
@@ -746,7 +1861,693 @@ class BlockManipulationSystem:
         Sensors.intake_optical_sensor_left.set_light(LedStateType.OFF)
         Sensors.intake_optical_sensor_right.set_light(LedStateType.OFF)
 
-block_manipulation_system = BlockManipulationSystem()
+    def get_thermal_headroom(self):
+        """Get how many degrees (C) the hottest intake motor can heat up before it starts limiting its current"""
+        hottest = max(
+            Motors.bottom_intake_motor.temperature(TemperatureUnits.CELSIUS),
+            Motors.top_intake_motor.temperature(TemperatureUnits.CELSIUS),
+            Motors.unloading_motor.temperature(TemperatureUnits.CELSIUS)
+        )
+        if hottest > self.peak_temperature:
+            self.peak_temperature = hottest
+        return IntakeSettings.MAX_TEMPERATURE_C - hottest
+
+# The block manipulation system isn't needed until a competition mode starts, so it is created on first use
+block_manipulation_system = None
+
+def ensure_block_manipulation_system():
+    """Create the block manipulation system if it doesn't exist yet, and return it"""
+    global block_manipulation_system
+    if block_manipulation_system is None:
+        block_manipulation_system = BlockManipulationSystem()
+    return block_manipulation_system
+
+
+
+# =============================================================================
+# COMPLETION CONDITIONS
+# =============================================================================
+
+class CompletionCondition:
+    """
+    Base class for sensor checks that end an autonomous phase early.
+    Subclasses override reset() (called when the phase starts) and is_met() (called every poll).
+    """
+    def reset(self):
+        """Reset any tracking state at the start of a phase"""
+        pass
+
+    def is_met(self):
+        """Check if the phase is complete"""
+        return False
+
+class BlocksCounted(CompletionCondition):
+    """Met once a number of blocks have passed the intake optical sensors"""
+    def __init__(self, count):
+        self.count = count
+        self._blocks_seen = 0
+        self._was_near = False
+
+    def reset(self):
+        self._blocks_seen = 0
+        self._was_near = False
+
+    def is_met(self):
+        block_near = Sensors.is_block_in_intake()
+        if block_near and not self._was_near:
+            self._blocks_seen += 1
+        self._was_near = block_near
+        return self._blocks_seen >= self.count
+
+class IntakeUnloaded(CompletionCondition):
+    """Met once the bottom intake motor current has stayed at its no-load level for a time"""
+    def __init__(self, duration_ms):
+        self.duration_ms = duration_ms
+        self._unloaded_since = None
+
+    def reset(self):
+        self._unloaded_since = None
+
+    def is_met(self):
+        current_time = brain.timer.time()
+        if Motors.bottom_intake_motor.current(CurrentUnits.AMP) > IntakeSettings.NO_LOAD_CURRENT_AMPS:
+            self._unloaded_since = None
+            return False
+        if self._unloaded_since is None:
+            self._unloaded_since = current_time
+        return current_time - self._unloaded_since >= self.duration_ms
+
+class NoProximity(CompletionCondition):
+    """Met once neither intake optical sensor has seen an object for a time"""
+    def __init__(self, duration_ms):
+        self.duration_ms = duration_ms
+        self._clear_since = None
+
+    def reset(self):
+        self._clear_since = None
+
+    def is_met(self):
+        current_time = brain.timer.time()
+        if Sensors.is_block_in_intake():
+            self._clear_since = None
+            return False
+        if self._clear_since is None:
+            self._clear_since = current_time
+        return current_time - self._clear_since >= self.duration_ms
+
+class AnyOf(CompletionCondition):
+    """Met when any of the given conditions is met"""
+    def __init__(self, *conditions):
+        self.conditions = conditions
+
+    def reset(self):
+        for condition in self.conditions:
+            condition.reset()
+
+    def is_met(self):
+        # Check every condition so that edge-counting conditions see every poll
+        met = False
+        for condition in self.conditions:
+            if condition.is_met():
+                met = True
+        return met
+
+class AllOf(CompletionCondition):
+    """Met when all of the given conditions are met"""
+    def __init__(self, *conditions):
+        self.conditions = conditions
+
+    def reset(self):
+        for condition in self.conditions:
+            condition.reset()
+
+    def is_met(self):
+        met = True
+        for condition in self.conditions:
+            if not condition.is_met():
+                met = False
+        return met
+
+
+
+# =============================================================================
+# AUTONOMOUS ROUTINES
+# =============================================================================
+
+# Routines are built from steps. The executor calls start() on a step once, then update() every
+# cycle until it returns True, then finish(). Steps never block, so several can be active at once.
+class RoutineStep:
+    """Base class for autonomous routine steps"""
+    name = "Step"  # Short description shown in the autonomous profile
+    uses_drivetrain = False  # True if the step commands the drivetrain
+    sets_intake = False  # True if the step changes the block manipulation system state
+    timed_out = False  # Set by steps that can end on a timeout, once they finish
+
+    def start(self):
+        """Called once when the step becomes active. Steps are reused between runs, so this resets any per-run state."""
+        pass
+
+    def update(self):
+        """Called every cycle while the step is active. Returns True once the step is done."""
+        return True
+
+    def finish(self):
+        """Called once after update() returned True"""
+        pass
+
+    def validate(self):
+        """Check the step's arguments. Raises ValueError if the step can't be run."""
+        pass
+
+    def children(self):
+        """Get the steps contained in this step"""
+        return ()
+
+class Drive(RoutineStep):
+    """Blind drive for a distance. See Drivetrain.drive_for_blind."""
+    uses_drivetrain = True
+
+    def __init__(self, forward, right, speed=100, brake_type=BRAKE):
+        self.forward = forward
+        self.right = right
+        self.speed = speed
+        self.brake_type = brake_type
+        self.name = "Drive " + str(forward) + "," + str(right) + " @" + str(speed)
+
+    def start(self):
+        self.timed_out = False
+        drivetrain.start_drive_for_blind(self.forward, self.right, self.speed, self.brake_type)
+
+    def update(self):
+        return drivetrain.update_motion()
+
+    def finish(self):
+        self.timed_out = drivetrain.last_motion_timed_out
+
+    def validate(self):
+        if not 0 < self.speed <= 100:
+            raise ValueError("Drive speed must be between 0 and 100")
+
+class Turn(RoutineStep):
+    """Turn by an angle using the inertial sensor. See Drivetrain.turn_for. Waits for calibration without blocking."""
+    uses_drivetrain = True
+
+    def __init__(self, angle_degrees, speed=50, timeout_ms=5000):
+        self.angle_degrees = angle_degrees
+        self.speed = speed
+        self.timeout_ms = timeout_ms
+        self.name = "Turn " + str(angle_degrees) + " @" + str(speed)
+
+    def start(self):
+        self.timed_out = False
+        drivetrain.start_turn_for(self.angle_degrees, self.speed, self.timeout_ms)
+
+    def update(self):
+        return drivetrain.update_motion()
+
+    def finish(self):
+        self.timed_out = drivetrain.last_motion_timed_out
+
+    def validate(self):
+        if not 0 < self.speed <= 100:
+            raise ValueError("Turn speed must be between 0 and 100")
+        if self.timeout_ms <= 0:
+            raise ValueError("Turn timeout must be positive")
+
+class SetIntake(RoutineStep):
+    """Change the block manipulation system state"""
+    sets_intake = True
+
+    def __init__(self, state):
+        self.state = state
+        self.name = "Intake state " + str(state)
+
+    def start(self):
+        block_manipulation_system.set_state(self.state)
+
+    def validate(self):
+        if self.state not in block_manipulation_system_states():
+            raise ValueError("Unknown block manipulation state: " + str(self.state))
+
+class Wait(RoutineStep):
+    """Wait for a fixed time"""
+    def __init__(self, duration_ms):
+        self.duration_ms = duration_ms
+        self.name = "Wait " + str(duration_ms) + "ms"
+        self._start_time = 0
+
+    def start(self):
+        self._start_time = brain.timer.time()
+
+    def update(self):
+        return brain.timer.time() - self._start_time >= self.duration_ms
+
+    def validate(self):
+        if self.duration_ms < 0:
+            raise ValueError("Wait duration can't be negative")
+
+class WaitUntil(RoutineStep):
+    """Wait until a completion condition is met, or a timeout expires"""
+    def __init__(self, condition, timeout_ms, min_time_ms=0, name="Wait until"):
+        self.condition = condition
+        self.timeout_ms = timeout_ms
+        self.min_time_ms = min_time_ms
+        self.name = name
+        self._start_time = 0
+
+    def start(self):
+        self.condition.reset()
+        self.timed_out = False
+        self._start_time = brain.timer.time()
+
+    def update(self):
+        elapsed = brain.timer.time() - self._start_time
+        if self.condition.is_met() and elapsed >= self.min_time_ms:
+            return True
+        if elapsed >= self.timeout_ms:
+            self.timed_out = True
+            logger.debug("Completion condition timed out after " + str(int(elapsed)) + "ms", ScreenTarget.BRAIN)
+            return True
+        return False
+
+    def validate(self):
+        if self.timeout_ms <= 0 or self.min_time_ms > self.timeout_ms:
+            raise ValueError("WaitUntil needs a positive timeout no shorter than its minimum time")
+
+class Sequence(RoutineStep):
+    """Run steps one after another"""
+    def __init__(self, *steps):
+        self.steps = steps
+        self._index = 0
+
+    def start(self):
+        self._index = 0
+        if self.steps:
+            RoutineExecutor.start_step(self.steps[0])
+
+    def update(self):
+        while self._index < len(self.steps):
+            step = self.steps[self._index]
+            if not step.update():
+                return False
+            RoutineExecutor.finish_step(step)
+            self._index += 1
+            if self._index < len(self.steps):
+                # Start the next step straight away; it gets its first update on the next cycle
+                RoutineExecutor.start_step(self.steps[self._index])
+                return False
+        return True
+
+    def children(self):
+        return self.steps
+
+class Parallel(RoutineStep):
+    """Run steps at the same time. Done once all of them are done."""
+    def __init__(self, *steps):
+        self.steps = steps
+        self._done = [False] * len(steps)
+
+    def start(self):
+        for i in range(len(self.steps)):
+            self._done[i] = False
+            RoutineExecutor.start_step(self.steps[i])
+
+    def update(self):
+        all_done = True
+        for i in range(len(self.steps)):
+            if self._done[i]:
+                continue
+            step = self.steps[i]
+            if step.update():
+                RoutineExecutor.finish_step(step)
+                self._done[i] = True
+            else:
+                all_done = False
+        return all_done
+
+    def validate(self):
+        # Only one branch may use each subsystem at a time
+        drivetrain_branches = 0
+        intake_branches = 0
+        for step in self.steps:
+            if routine_uses(step, "uses_drivetrain"):
+                drivetrain_branches += 1
+            if routine_uses(step, "sets_intake"):
+                intake_branches += 1
+        if drivetrain_branches > 1:
+            raise ValueError("Parallel group drives the drivetrain from more than one branch")
+        if intake_branches > 1:
+            raise ValueError("Parallel group sets the intake state from more than one branch")
+
+    def children(self):
+        return self.steps
+
+class Routine(Sequence):
+    """A complete autonomous routine. Built and validated ahead of time, then run by RoutineExecutor."""
+    def __init__(self, name, *steps):
+        super().__init__(*steps)
+        self.name = name
+
+    def validate(self):
+        """Validate every step in the routine. Raises ValueError describing the first problem found."""
+        pending = list(self.steps)
+        while pending:
+            step = pending.pop()
+            step.validate()
+            pending.extend(step.children())
+
+def routine_uses(step, flag):
+    """Check if a step, or any step inside it, has the given flag set"""
+    if getattr(step, flag):
+        return True
+    for child in step.children():
+        if routine_uses(child, flag):
+            return True
+    return False
+
+def block_manipulation_system_states():
+    """Get all valid BlockManipulationSystem states"""
+    State = BlockManipulationSystem.State
+    return (State.IDLE, State.INTAKING, State.OUTPUTTING_LOW, State.OUTPUTTING_MEDIUM, State.OUTPUTTING_HIGH)
+
+class RoutineExecutor:
+    """Runs a routine, ticking every active step and the block manipulation system each cycle"""
+    @staticmethod
+    def run(routine):
+        """Run a routine to completion. Blocks until it is done."""
+        RoutineExecutor.start_step(routine)
+        while True:
+            done = routine.update()
+            block_manipulation_system.update()
+            Scheduler.tick()
+            if done:
+                break
+            # Collect garbage in the time between ticks
+            pause = MemoryManager.collect_in_slack(AutonSettings.EXECUTOR_TICK_MS)
+            wait(max(AutonSettings.EXECUTOR_TICK_MS - pause, 0), MSEC)
+        RoutineExecutor.finish_step(routine)
+
+    @staticmethod
+    def start_step(step):
+        """Start a step, recording its start time if it is a single action"""
+        if not step.children():
+            AutonProfiler.step_started(step)
+        step.start()
+
+    @staticmethod
+    def finish_step(step):
+        """Finish a step, recording its end time if it is a single action"""
+        step.finish()
+        if not step.children():
+            AutonProfiler.step_finished(step)
+
+class AutonProfiler:
+    """Records when each autonomous step starts and ends, and reports how the autonomous period was used"""
+    MAX_STEPS = 64  # Steps beyond this are not recorded
+    FILENAME = "auton_profile.csv"
+
+    _routine_name = ""
+    _start_time = 0
+    _end_time = 0
+    _ended = True
+    _report_pending = False
+    _count = 0
+    _steps = [None] * MAX_STEPS
+    _step_start_times = [0] * MAX_STEPS
+    _step_end_times = [0] * MAX_STEPS
+
+    @classmethod
+    def begin(cls):
+        """Start profiling an autonomous period"""
+        cls._routine_name = "None"
+        cls._count = 0
+        cls._start_time = brain.timer.time()
+        cls._end_time = cls._start_time
+        cls._ended = False
+        cls._report_pending = True
+
+    @classmethod
+    def set_routine(cls, routine_name):
+        """Record which routine is running"""
+        cls._routine_name = routine_name
+
+    @classmethod
+    def end(cls):
+        """Stop profiling the autonomous period"""
+        cls._end_time = brain.timer.time()
+        cls._ended = True
+
+    @classmethod
+    def report_if_pending(cls):
+        """
+        Show and save the profile if it hasn't been reported yet. Covers autonomous periods that were
+        cut off by the field before the routine finished.
+        """
+        if not cls._report_pending:
+            return
+        if not cls._ended:
+            cls._end_time = min(brain.timer.time(), cls._start_time + AutonSettings.AUTON_PERIOD_MS)
+            cls._ended = True
+        cls._report_pending = False
+        try:
+            cls.show()
+            cls.save()
+        except Exception as e:
+            logger.error("Autonomous profile report failed: " + str(e), ScreenTarget.BRAIN)
+
+    @classmethod
+    def step_started(cls, step):
+        """Record the start of a step"""
+        if cls._count >= cls.MAX_STEPS:
+            return
+        cls._steps[cls._count] = step
+        cls._step_start_times[cls._count] = brain.timer.time()
+        cls._step_end_times[cls._count] = -1
+        cls._count += 1
+
+    @classmethod
+    def step_finished(cls, step):
+        """Record the end of a step"""
+        current_time = brain.timer.time()
+        for i in range(cls._count - 1, -1, -1):
+            if cls._steps[i] is step and cls._step_end_times[i] < 0:
+                cls._step_end_times[i] = current_time
+                return
+
+    @classmethod
+    def _duration(cls, i):
+        """Get how long a recorded step ran, counting unfinished steps up to the end of the period"""
+        end_time = cls._step_end_times[i] if cls._step_end_times[i] >= 0 else cls._end_time
+        return end_time - cls._step_start_times[i]
+
+    @classmethod
+    def get_summary(cls):
+        """Get (total elapsed ms, ms spent in steps that timed out, remaining slack ms)"""
+        total = cls._end_time - cls._start_time
+        lost_to_timeouts = 0
+        for i in range(cls._count):
+            if cls._steps[i].timed_out:
+                lost_to_timeouts += cls._duration(i)
+        return total, lost_to_timeouts, AutonSettings.AUTON_PERIOD_MS - total
+
+    @classmethod
+    def show(cls, max_steps=5):
+        """Log the summary and the slowest steps to the brain screen"""
+        total, lost_to_timeouts, slack = cls.get_summary()
+        logger.brain_line = logger.max_brain_lines + 1  # Start the report on a fresh page
+        logger.info("Auton " + str(int(total)) + "ms, slack " + str(int(slack)) + "ms", ScreenTarget.BRAIN)
+        logger.info("Lost to timeouts: " + str(int(lost_to_timeouts)) + "ms", ScreenTarget.BRAIN)
+
+        slowest = sorted(range(cls._count), key=cls._duration, reverse=True)
+        for i in slowest[:max_steps]:
+            timeout_note = " (timeout)" if cls._steps[i].timed_out else ""
+            logger.info(str(int(cls._duration(i))) + "ms " + cls._steps[i].name + timeout_note, ScreenTarget.BRAIN)
+
+    @classmethod
+    def save(cls):
+        """Save the per-step breakdown to the SD card as CSV"""
+        if not brain.sdcard.is_inserted():
+            logger.warning("No SD card - autonomous profile not saved", ScreenTarget.BRAIN)
+            return
+
+        total, lost_to_timeouts, slack = cls.get_summary()
+        lines = ["routine,step,start_ms,end_ms,duration_ms,timed_out"]
+        for i in range(cls._count):
+            start_ms = int(cls._step_start_times[i] - cls._start_time)
+            duration_ms = int(cls._duration(i))
+            lines.append(cls._routine_name + "," + cls._steps[i].name.replace(",", " ") + "," + str(start_ms) + "," +
+                         str(start_ms + duration_ms) + "," + str(duration_ms) + "," + str(int(cls._steps[i].timed_out)))
+        lines.append(cls._routine_name + ",TOTAL,0," + str(int(total)) + "," + str(int(total)) + ",0")
+        lines.append(cls._routine_name + ",LOST_TO_TIMEOUTS,,," + str(int(lost_to_timeouts)) + ",")
+        lines.append(cls._routine_name + ",SLACK,,," + str(int(slack)) + ",")
+
+        brain.sdcard.savefile(cls.FILENAME, bytearray("\n".join(lines) + "\n", "utf-8"))
+
+
+
+# =============================================================================
+# RECORD AND PLAYBACK
+# =============================================================================
+
+# Recording file layout: a 6 byte header followed by one 4 byte frame per tick.
+#   Header: "TR", format version, tick length (ms), frame count (2 bytes, little endian)
+#   Frame:  forward, strafe, turn (signed bytes, -100 to 100), block manipulation state
+class DriveRecording:
+    MAGIC = b"TR"
+    VERSION = 1
+    HEADER_SIZE = 6
+    FRAME_SIZE = 4
+
+    @staticmethod
+    def to_byte(value):
+        """Convert a -100 to 100 drive command to a byte"""
+        value = int(value)
+        if value > 100:
+            value = 100
+        elif value < -100:
+            value = -100
+        return value & 0xFF
+
+    @staticmethod
+    def from_byte(value):
+        """Convert a byte back to a -100 to 100 drive command"""
+        return value - 256 if value > 127 else value
+
+class DriveRecorder:
+    """
+    Records the commanded drive and block manipulation state every driver control tick, and saves it to
+    the SD card once RecordingSettings.MAX_DURATION_MS has been recorded. Movements run by the fine
+    control buttons are not recorded. The SD card write runs on a worker thread so that it doesn't
+    hold up the driver control tick.
+    """
+    recording = False
+    _buffer = None
+    _count = 0
+    _max_frames = 0
+    _unsaved = None     # Finished recording waiting to be saved: (buffer, tick count)
+
+    @classmethod
+    def start(cls):
+        """Start a new recording"""
+        cls._max_frames = RecordingSettings.MAX_DURATION_MS // RecordingSettings.TICK_MS
+        cls._buffer = bytearray(DriveRecording.HEADER_SIZE + cls._max_frames * DriveRecording.FRAME_SIZE)
+        cls._count = 0
+        cls.recording = True
+        logger.info("Recording driver control", ScreenTarget.BOTH)
+
+    @classmethod
+    def record_tick(cls, forward, strafe, turn, state):
+        """Record one tick. Saves the recording once it is full."""
+        if not cls.recording:
+            return
+
+        offset = DriveRecording.HEADER_SIZE + cls._count * DriveRecording.FRAME_SIZE
+        cls._buffer[offset] = DriveRecording.to_byte(forward)
+        cls._buffer[offset + 1] = DriveRecording.to_byte(strafe)
+        cls._buffer[offset + 2] = DriveRecording.to_byte(turn)
+        cls._buffer[offset + 3] = state
+        cls._count += 1
+
+        if cls._count >= cls._max_frames:
+            cls.stop()
+
+    @classmethod
+    def stop(cls):
+        """Stop recording and queue the recording to be saved to the SD card"""
+        if not cls.recording:
+            return
+        cls.recording = False
+
+        buffer = cls._buffer
+        buffer[0] = DriveRecording.MAGIC[0]
+        buffer[1] = DriveRecording.MAGIC[1]
+        buffer[2] = DriveRecording.VERSION
+        buffer[3] = RecordingSettings.TICK_MS
+        buffer[4] = cls._count & 0xFF
+        buffer[5] = cls._count >> 8
+
+        cls._unsaved = (buffer, cls._count)
+        if not WorkerPool.submit(cls.save_unsaved):
+            logger.debug("Recording will be saved when driver control ends")
+
+    @classmethod
+    def save_unsaved(cls):
+        """Save the finished recording to the SD card, if there is one that hasn't been saved"""
+        if cls._unsaved is None:
+            return
+        buffer, count = cls._unsaved
+        cls._unsaved = None
+
+        if not brain.sdcard.is_inserted():
+            logger.error("No SD card - recording not saved", ScreenTarget.BOTH)
+            return
+        brain.sdcard.savefile(RecordingSettings.FILENAME, buffer)
+        logger.info("Recording saved (" + str(count) + " ticks)", ScreenTarget.BOTH)
+
+class Playback(RoutineStep):
+    """
+    Replays a driver control recording with the timing it was recorded at. The recording is loaded
+    once with load(); replaying it allocates nothing.
+    """
+    name = "Playback"
+    uses_drivetrain = True
+    sets_intake = True
+
+    def __init__(self):
+        self._data = None
+        self._count = 0
+        self._tick_ms = RecordingSettings.TICK_MS
+        self._frame = -1
+        self._start_time = 0
+
+    def load(self):
+        """Load the recording from the SD card. Returns True if a valid recording was loaded."""
+        self._data = None
+        self._count = 0
+        if not brain.sdcard.is_inserted():
+            return False
+
+        data = brain.sdcard.loadfile(RecordingSettings.FILENAME)
+        if len(data) < DriveRecording.HEADER_SIZE or data[0] != DriveRecording.MAGIC[0] or \
+            data[1] != DriveRecording.MAGIC[1] or data[2] != DriveRecording.VERSION:
+            return False
+
+        count = data[4] | (data[5] << 8)
+        if len(data) < DriveRecording.HEADER_SIZE + count * DriveRecording.FRAME_SIZE or data[3] == 0:
+            return False
+
+        self._data = data
+        self._count = count
+        self._tick_ms = data[3]
+        return True
+
+    def start(self):
+        self._frame = -1
+        self._start_time = brain.timer.time()
+
+    def update(self):
+        if self._data is None:
+            return True
+
+        # Pick the frame from the elapsed time so that late cycles don't stretch the replay
+        frame = int((brain.timer.time() - self._start_time) // self._tick_ms)
+        if frame >= self._count:
+            return True
+        if frame != self._frame:
+            self._frame = frame
+            data = self._data
+            offset = DriveRecording.HEADER_SIZE + frame * DriveRecording.FRAME_SIZE
+            drivetrain.drive(
+                DriveRecording.from_byte(data[offset]),
+                DriveRecording.from_byte(data[offset + 1]),
+                DriveRecording.from_byte(data[offset + 2])
+            )
+            block_manipulation_system.set_state(data[offset + 3])
+        return False
+
+    def finish(self):
+        drivetrain.stop()
+        block_manipulation_system.set_state(BlockManipulationSystem.State.IDLE)
 
 
 
@@ -755,142 +2556,322 @@ block_manipulation_system = BlockManipulationSystem()
 # =============================================================================
 
 class Autonomous:
+    routines = None  # Prepared routines keyed by starting side. Built by prepare().
+    supervisor = None
+
     @classmethod
     def start(cls):
         """Start autonomous mode code. This function should not return."""
         logger.info("=== AUTONOMOUS MODE STARTED ===")
+        ConfigurationScreen.notify_competition_started()
+        ensure_block_manipulation_system()
+        AutonProfiler.begin()
 
+        # A match starts with autonomous
+        MemoryManager.reset_stats()
+        MemoryManager.start_control()
+
+        if cls.supervisor is None:
+            cls.supervisor = TaskSupervisor(
+                "Autonomous", cls._run_selected_routine, SupervisorSettings.AUTONOMOUS_MAX_RESTARTS, cls._emergency_stop
+            )
         try:
-            # Example autonomous routine with logging
-            logger.info("Starting autonomous routine")
+            cls.supervisor.run()
+            AutonProfiler.end()
+            logger.info("=== AUTONOMOUS MODE ENDED ===")
+            AutonProfiler.report_if_pending()
+        finally:
+            # Also runs when the field ends autonomous and stops this thread
+            MemoryManager.stop_control()
+            MemoryManager.report()
 
-            if RobotState.auton_mode == "SIMPLE":
-                logger.info("Running simple autonomous routine")
-                drivetrain.drive_for_blind(100, 0, 50)
-                logger.info("Simple autonomous routine completed")
-            else:
-                logger.info("Running complex autonomous routine")
+    @staticmethod
+    def _emergency_stop():
+        """Stop everything after the routine crashed"""
+        logger.error("Emergency stop activated")
+        drivetrain.stop()
+        block_manipulation_system.set_state(BlockManipulationSystem.State.IDLE)
+        block_manipulation_system.update()
 
-                current_alliance_color = RobotState.current_alliance_color = AllianceColor("unknown")  # Set to unknown to disable color-based rejection
+    @classmethod
+    def _run_selected_routine(cls):
+        """Run the routine selected on the configuration screen"""
+        # Example autonomous routine with logging
+        logger.info("Starting autonomous routine")
+
+        state = RobotState.get()
+        if state.auton_mode == "SIMPLE":
+            logger.info("Running simple autonomous routine")
+            cls.run_routine("SIMPLE")
+            logger.info("Simple autonomous routine completed")
+        elif state.auton_mode == "PLAYBACK":
+            logger.info("Running recorded autonomous routine")
+            cls.run_routine("PLAYBACK")
+            logger.info("Recorded autonomous routine completed")
+        else:
+            logger.info("Running complex autonomous routine")
 
-                if RobotState.starting_side == "RIGHT":
+            # Disable color-based rejection while the routine collects blocks; the selected alliance color is kept
+            RobotState.update(color_rejection_enabled=False)
+            try:
+                if state.starting_side == "RIGHT":
                     cls.run_right_side_routine()
                 else:
                     cls.run_left_side_routine()
+            finally:
+                RobotState.update(color_rejection_enabled=True)
 
-                RobotState.current_alliance_color = current_alliance_color  # Restore alliance color
+            logger.info("Complex autonomous routine completed")
 
-                logger.info("Complex autonomous routine completed")
+        logger.info("Autonomous routine completed successfully")
 
-            logger.info("Autonomous routine completed successfully")
-
-        except Exception as e:
-            logger.error("Autonomous routine failed: " + str(e))
-            logger.error("Emergency stop activated")
-        logger.info("=== AUTONOMOUS MODE ENDED ===")
+    @staticmethod
+    def capture_complete():
+        """Completion condition for picking up blocks"""
+        return AnyOf(
+            BlocksCounted(AutonSettings.CAPTURE_BLOCK_COUNT),
+            AllOf(NoProximity(AutonSettings.CAPTURE_CLEAR_MS), IntakeUnloaded(AutonSettings.CAPTURE_CLEAR_MS))
+        )
 
     @staticmethod
-    def run_right_side_routine():
+    def output_complete():
+        """Completion condition for scoring blocks"""
+        return AllOf(NoProximity(AutonSettings.OUTPUT_CLEAR_MS), IntakeUnloaded(AutonSettings.OUTPUT_CLEAR_MS))
+
+    @classmethod
+    def prepare(cls):
+        """Build and validate the autonomous routines ahead of time. Called from pre_auton."""
+        routines = {}
+        builders = (
+            ("RIGHT", cls.build_right_side_routine),
+            ("LEFT", cls.build_left_side_routine),
+            ("SIMPLE", cls.build_simple_routine),
+            ("PLAYBACK", cls.build_playback_routine),
+        )
+        for key, build in builders:
+            routine = build()
+            try:
+                routine.validate()
+            except ValueError as e:
+                logger.error(routine.name + " routine is invalid: " + str(e))
+                continue
+            routines[key] = routine
+        cls.routines = routines
+
+    @classmethod
+    def run_routine(cls, key):
+        """Run a prepared routine. Key is the starting side ("RIGHT" or "LEFT"), "SIMPLE" or "PLAYBACK"."""
+        if cls.routines is None:
+            cls.prepare()
+        if key not in cls.routines:
+            raise ValueError("No valid " + key + " routine")
+        routine = cls.routines[key]
+        AutonProfiler.set_routine(routine.name)
+        RoutineExecutor.run(routine)
+
+    @classmethod
+    def run_right_side_routine(cls):
         """Run autonomous routine for right side starting position"""
-        # Move to blocks
-        drivetrain.drive_for_blind(580, 150, 50)
-        
-        # Pick up blocks
-        block_manipulation_system.set_and_update_state(BlockManipulationSystem.State.INTAKING)
-        wait(100, MSEC)  # Simulate time taken to intake blocks
-        drivetrain.drive_for_blind(630, 0, 10)
-        wait(2000, MSEC)  # Wait for capture system
-        block_manipulation_system.set_and_update_state(BlockManipulationSystem.State.IDLE)
-
-        # Reorient towards goal
-        drivetrain.turn_for(-45, 50)
-        drivetrain.drive_for_blind(230, 0, 50)
-        # drivetrain.drive_for_blind(-10, -50, 50)
-
-        # Score blocks
-        block_manipulation_system.set_and_update_state(BlockManipulationSystem.State.OUTPUTTING_LOW)
-        wait(5000, MSEC)  # Simulate time taken to output blocks
-        block_manipulation_system.set_and_update_state(BlockManipulationSystem.State.IDLE)
-
-        # for _ in range(3):
-        #     block_manipulation_system.set_and_update_state(BlockManipulationSystem.State.OUTPUTTING_LOW)
-        #     wait(1000, MSEC)
-        #     block_manipulation_system.set_and_update_state(BlockManipulationSystem.State.IDLE)
-
-        #     wait(500, MSEC)
-            
-        #     drivetrain.drive_for_blind(-100, 0, 100)
-        #     for _ in range(3):
-        #         # Shake
-        #         drivetrain.drive_for_blind(50, 0, 100)
-        #         drivetrain.drive_for_blind(-50, 0, 100)
+        cls.run_routine("RIGHT")
 
-        #     wait(100, MSEC)
-        #     drivetrain.drive_for_blind(100, 0, 100)
+    @classmethod
+    def run_left_side_routine(cls):
+        """Run autonomous routine for left side starting position"""
+        cls.run_routine("LEFT")
 
     @staticmethod
-    def run_left_side_routine():
-        """Run autonomous routine for left side starting position"""
-        # Move to blocks
-        drivetrain.drive_for_blind(580, -150, 50)
-        
-        # Pick up blocks
-        block_manipulation_system.set_and_update_state(BlockManipulationSystem.State.INTAKING)
-        wait(100, MSEC)  # Simulate time taken to intake blocks
-        drivetrain.drive_for_blind(630, 0, 10)
-        wait(2000, MSEC)  # Wait for capture system
-        block_manipulation_system.set_and_update_state(BlockManipulationSystem.State.IDLE)
-
-        # Reorient towards goal
-        drivetrain.turn_for(45, 50)
-        drivetrain.drive_for_blind(240, 0, 50)
-        # drivetrain.drive_for_blind(0, 100, 50)
-
-        # Score blocks
-        block_manipulation_system.set_and_update_state(BlockManipulationSystem.State.OUTPUTTING_MEDIUM)
-        wait(5000, MSEC)  # Simulate time taken to output blocks
-        block_manipulation_system.set_and_update_state(BlockManipulationSystem.State.IDLE)
+    def build_simple_routine():
+        """Build the simple autonomous routine"""
+        return Routine("Simple", Drive(100, 0, 50))
+
+    @staticmethod
+    def build_playback_routine():
+        """Build the routine that replays the driver control recording on the SD card"""
+        playback = Playback()
+        if not playback.load():
+            logger.warning("No valid driver control recording on SD card", ScreenTarget.BRAIN)
+        return Routine("Playback", playback)
+
+    @classmethod
+    def build_right_side_routine(cls):
+        """Build the autonomous routine for right side starting position"""
+        State = BlockManipulationSystem.State
+        return Routine(
+            "Right side",
+
+            # Move to blocks, spinning up the intake on the way
+            Parallel(
+                Drive(580, 150, 50),
+                SetIntake(State.INTAKING),
+            ),
+
+            # Pick up blocks
+            Drive(630, 0, 10),
+
+            # Reorient towards goal while the capture system finishes
+            Parallel(
+                Sequence(
+                    WaitUntil(cls.capture_complete(), AutonSettings.CAPTURE_TIMEOUT_MS, name="Wait for capture"),
+                    SetIntake(State.IDLE),
+                ),
+                Turn(-45, 50),
+            ),
+            Drive(230, 0, 50),
+            # Drive(-10, -50, 50),
+
+            # Score blocks
+            SetIntake(State.OUTPUTTING_LOW),
+            WaitUntil(cls.output_complete(), AutonSettings.OUTPUT_TIMEOUT_MS, AutonSettings.OUTPUT_MIN_MS, "Wait for output"),
+            SetIntake(State.IDLE),
+        )
+
+    @classmethod
+    def build_left_side_routine(cls):
+        """Build the autonomous routine for left side starting position"""
+        State = BlockManipulationSystem.State
+        return Routine(
+            "Left side",
+
+            # Move to blocks, spinning up the intake on the way
+            Parallel(
+                Drive(580, -150, 50),
+                SetIntake(State.INTAKING),
+            ),
+
+            # Pick up blocks
+            Drive(630, 0, 10),
+
+            # Reorient towards goal while the capture system finishes
+            Parallel(
+                Sequence(
+                    WaitUntil(cls.capture_complete(), AutonSettings.CAPTURE_TIMEOUT_MS, name="Wait for capture"),
+                    SetIntake(State.IDLE),
+                ),
+                Turn(45, 50),
+            ),
+            Drive(240, 0, 50),
+            # Drive(0, 100, 50),
+
+            # Score blocks
+            SetIntake(State.OUTPUTTING_MEDIUM),
+            WaitUntil(cls.output_complete(), AutonSettings.OUTPUT_TIMEOUT_MS, AutonSettings.OUTPUT_MIN_MS, "Wait for output"),
+            SetIntake(State.IDLE),
+        )
 
 class DriverControl:
     running = False
     _last_input_log_time = 0
 
+    # Drive command sent on the last tick (for recording)
+    _forward = 0
+    _strafe = 0
+    _turn = 0
+    _last_thermal_readout_time = 0
+    _thermal_warning_shown = False
+
+    supervisor = None
+    _callbacks_registered = False
+
+    # Loop timing (shown on the diagnostics tab)
+    loop_time_ms = 0        # Time the last tick took
+    max_loop_time_ms = 0    # Longest tick since driver control started
+    late_ticks = 0          # Ticks that overran the loop period
+
     @classmethod
     def start(cls):
         """Start driver control mode code. This function should not return."""
         logger.info("=== DRIVER CONTROL MODE STARTED ===", ScreenTarget.BOTH)
+        ConfigurationScreen.notify_competition_started()
+        ensure_block_manipulation_system()
+
+        # Report the autonomous profile if the field ended autonomous before the routine finished
+        AutonProfiler.report_if_pending()
 
-        # Register callbacks for buttons
-        cls._register_button_callbacks()
+        # Register callbacks for buttons (once; they stay registered if driver control starts again)
+        if not cls._callbacks_registered:
+            cls._register_button_callbacks()
+            cls._callbacks_registered = True
 
         # Start main driver control loop
         cls.running = True
 
+        # Color rejection is always on in driver control, even if autonomous was cut off before re-enabling it
+        state = RobotState.update(color_rejection_enabled=True)
+        if state.recording_enabled and not DriveRecorder.recording:
+            DriveRecorder.start()
+
+        MemoryManager.start_control()
+
+        if cls.supervisor is None:
+            cls.supervisor = TaskSupervisor(
+                "Driver control", cls._run_loop, SupervisorSettings.DRIVER_CONTROL_MAX_RESTARTS, cls._stop_for_safety
+            )
         try:
-            drivetrain.set_stopping_mode(RobotState.current_braking_mode)
+            cls.supervisor.run()
+        finally:
+            # Also runs when the field ends driver control and stops this thread
+            MemoryManager.stop_control()
+            MemoryManager.report()
+            DriveRecorder.save_unsaved()  # In case the worker queue was full when the recording finished
 
-            while cls.running:
-                cls._update_drivetrain()
-                cls._update_block_manipulation_systems_state()
-                wait(20, MSEC) # Run the loop every 20 milliseconds (50 times per second)
+    @staticmethod
+    def _stop_for_safety():
+        """Stop the robot after driver control crashed"""
+        drivetrain.stop()
+        block_manipulation_system.set_state(BlockManipulationSystem.State.IDLE)
+        block_manipulation_system.update()
+        logger.critical("Robot stopped for safety", ScreenTarget.BOTH)
 
-        except Exception as e:
-            logger.critical("Driver control crashed: " + str(e))
-            logger.critical("Robot stopped for safety", ScreenTarget.BOTH)
-            logger.error("Restarting driver control mode...", ScreenTarget.BOTH)
-            cls.start()  # Restart driver control mode
+    @classmethod
+    def _run_loop(cls):
+        """Driver control loop. Runs under the supervisor, which restarts it if it raises."""
+        drivetrain.set_stopping_mode(RobotState.get().current_braking_mode)
+
+        next_tick_time = brain.timer.time()
+        while cls.running:
+            tick_start_time = brain.timer.time()
+
+            cls._update_drivetrain()
+            cls._update_block_manipulation_systems_state()
+            cls._update_thermal_readout()
+            Scheduler.tick()
+            DriveRecorder.record_tick(cls._forward, cls._strafe, cls._turn, block_manipulation_system.get_state())
+
+            tick_end_time = brain.timer.time()
+            cls.loop_time_ms = tick_end_time - tick_start_time
+            if cls.loop_time_ms > cls.max_loop_time_ms:
+                cls.max_loop_time_ms = cls.loop_time_ms
+
+            # Run the loop every 20 milliseconds (50 times per second), measured from the start of each tick
+            # so that the period stays fixed for recordings
+            next_tick_time += RecordingSettings.TICK_MS
+
+            # Collect garbage in the time left before the next tick
+            if MemoryManager.collect_in_slack(next_tick_time - tick_end_time):
+                tick_end_time = brain.timer.time()
+
+            delay = next_tick_time - tick_end_time
+            if delay > 0:
+                wait(delay, MSEC)
+            else:
+                cls.late_ticks += 1
+                next_tick_time = tick_end_time  # Running late; don't try to catch up
 
     @classmethod
     def _register_button_callbacks(cls):
         """Register button callbacks for driver control mode"""
         
         # Configuration
-        controller.get_button(ControllerSettings.COLOR_SWITCH_BUTTON).pressed(cls.switch_alliance_color)
+        ButtonGesture(
+            controller.get_button(ControllerSettings.COLOR_SWITCH_BUTTON),
+            on_short_press=cls.switch_alliance_color,
+            on_long_press=cls.disable_color_detection
+        )
 
         # Driving
         controller.get_button(ControllerSettings.BRAKING_SWITCH_BUTTON).pressed(cls.switch_braking_mode) 
-        controller.get_button(ControllerSettings.FC_FORWARD_BUTTON).pressed(lambda: drivetrain.drive_for_blind(100, 0))
-        controller.get_button(ControllerSettings.FC_BACKWARD_BUTTON).pressed(lambda: drivetrain.drive_for_blind(-100, 0))
+        controller.get_button(ControllerSettings.FC_FORWARD_BUTTON).pressed(cls.fine_control_forward)
+        controller.get_button(ControllerSettings.FC_BACKWARD_BUTTON).pressed(cls.fine_control_backward)
         
         # Features
         controller.get_button(ControllerSettings.DESCORER_TRIGGER_BUTTON).pressed(cls.trigger_descorer)
@@ -901,6 +2882,7 @@ class DriverControl:
         """To be called repeatedly in driver control mode to update the drivetrain"""
 
         if drivetrain.movement_override:
+            cls._forward = cls._strafe = cls._turn = 0
             return  # Skip manual control if movement override is active
         
         # Get joystick values with deadzone applied
@@ -911,7 +2893,7 @@ class DriverControl:
 
         # Log significant inputs occasionally (not every loop to avoid spam)
         current_time = brain.timer.time()
-        if (abs(forward) > 50 or abs(strafe) > 50 or abs(turn) > 50) and \
+        if logger.is_enabled_for(LogLevel.DEBUG) and (abs(forward) > 50 or abs(strafe) > 50 or abs(turn) > 50) and \
         (current_time - cls._last_input_log_time > 2000):  # Log every 2 seconds max
             debug_msg = "Driver input: F:" + str(int(forward)) + " S:" + str(int(strafe)) + " T:" + str(int(turn))
             logger.debug(debug_msg, ScreenTarget.BRAIN)
@@ -922,6 +2904,10 @@ class DriverControl:
         strafe *= DrivetrainSettings.STRAFE_SPEED_MODIFIER
         turn *= DrivetrainSettings.TURN_SPEED_MODIFIER
 
+        cls._forward = forward
+        cls._strafe = strafe
+        cls._turn = turn
+
         # Command the drivetrain to move
         try:
             drivetrain.drive(forward, strafe, turn)
@@ -944,49 +2930,66 @@ class DriverControl:
 
         block_manipulation_system.update()
 
+    @classmethod
+    def _update_thermal_readout(cls):
+        """To be called repeatedly in driver control mode to show the intake's thermal headroom on the controller"""
+        current_time = brain.timer.time()
+        if current_time - cls._last_thermal_readout_time < IntakeSettings.THERMAL_READOUT_INTERVAL_MS:
+            return
+        cls._last_thermal_readout_time = current_time
+
+        headroom = block_manipulation_system.get_thermal_headroom()
+
+        # The logger owns the first line of the controller screen, so the readout goes on the last one
+        controller.screen.clear_line(3)
+        controller.screen.set_cursor(3, 1)
+        controller.screen.print("Intake temp: +" + str(int(headroom)) + "C")
+
+        if headroom <= IntakeSettings.THERMAL_WARNING_HEADROOM_C and not cls._thermal_warning_shown:
+            logger.warning("Intake motors near thermal limit", ScreenTarget.BOTH)
+            cls._thermal_warning_shown = True
+        elif headroom > IntakeSettings.THERMAL_WARNING_HEADROOM_C:
+            cls._thermal_warning_shown = False
+
     @staticmethod
     def change_starting_side(value):
         """Change the starting side of the robot"""
-        RobotState.starting_side.set(value)
-        logger.info("Starting side set to " + str(RobotState.starting_side), ScreenTarget.BRAIN)
-        logger.info("Starting side: " + str(RobotState.starting_side), ScreenTarget.CONTROLLER)
+        state = RobotState.update(starting_side=Side(value))
+        logger.info("Starting side set to " + str(state.starting_side), ScreenTarget.BRAIN)
+        logger.info("Starting side: " + str(state.starting_side), ScreenTarget.CONTROLLER)
 
     @staticmethod
     def switch_alliance_color():
-        """Switch the current alliance color"""
-        LONG_PRESS_THRESHOLD_MS = 1000  # 1 second threshold for long press
+        """Switch the current alliance color (short press of the color switch button)"""
+        color = RobotState.get().current_alliance_color
 
         # Define color if not defined already
-        if RobotState.current_alliance_color == AllianceColor("unknown"):
-            RobotState.current_alliance_color.set_to_default()
+        if color == AllianceColor("unknown"):
+            color = AllianceColor()
+            color.set_to_default()
         
         # Toggle Color
-        RobotState.current_alliance_color = ~RobotState.current_alliance_color
-
-        logger.info("Alliance color switched to " + str(RobotState.current_alliance_color), ScreenTarget.BRAIN)
-        logger.info(str(RobotState.current_alliance_color) + " alliance selected", ScreenTarget.CONTROLLER)
+        state = RobotState.update(current_alliance_color=~color)
 
-        # =============================== LONG PRESS FUNCTIONALITY ========================================
-        init_time = brain.timer.time()
-        while controller.get_button(ControllerSettings.COLOR_SWITCH_BUTTON).pressing():
-            wait(10, MSEC)
-            if brain.timer.time() - init_time > LONG_PRESS_THRESHOLD_MS:  # Early exit for long press
-                break
+        logger.info("Alliance color switched to " + str(state.current_alliance_color), ScreenTarget.BRAIN)
+        logger.info(str(state.current_alliance_color) + " alliance selected", ScreenTarget.CONTROLLER)
 
-        if brain.timer.time() - init_time > LONG_PRESS_THRESHOLD_MS:  # Long press detected
-            RobotState.current_alliance_color = AllianceColor("unknown")
-            logger.warning("Alliance color switched to UNKNOWN; color detection disabled.", ScreenTarget.BRAIN)
-            logger.warning("Color detection disabled.", ScreenTarget.CONTROLLER)
+    @staticmethod
+    def disable_color_detection():
+        """Set the alliance color to unknown, which disables color detection (long press of the color switch button)"""
+        RobotState.update(current_alliance_color=AllianceColor("unknown"))
+        logger.warning("Alliance color switched to UNKNOWN; color detection disabled.", ScreenTarget.BRAIN)
+        logger.warning("Color detection disabled.", ScreenTarget.CONTROLLER)
         
     @staticmethod
     def switch_braking_mode():
         """Switch the drivetrain braking mode between BRAKE and COAST"""
-        if RobotState.current_braking_mode == BRAKE:
+        if RobotState.get().current_braking_mode == BRAKE:
             new_mode = COAST
         else:
             new_mode = BRAKE
 
-        RobotState.current_braking_mode = new_mode
+        RobotState.update(current_braking_mode=new_mode)
         drivetrain.set_stopping_mode(new_mode)
 
         str_name = "BRAKE" if new_mode == BRAKE else "COAST"
@@ -994,21 +2997,45 @@ class DriverControl:
         logger.info("Drivetrain braking mode switched to " + str_name, ScreenTarget.BRAIN)
         logger.info(str_name + " braking mode.", ScreenTarget.CONTROLLER)
 
+    @staticmethod
+    def fine_control_forward():
+        """Drive forward a short fixed distance (runs on a worker thread since it blocks)"""
+        WorkerPool.submit(DriverControl._drive_fine_control_forward)
+
+    @staticmethod
+    def fine_control_backward():
+        """Drive backward a short fixed distance (runs on a worker thread since it blocks)"""
+        WorkerPool.submit(DriverControl._drive_fine_control_backward)
+
+    @staticmethod
+    def _drive_fine_control_forward():
+        drivetrain.drive_for_blind(100, 0)
+
+    @staticmethod
+    def _drive_fine_control_backward():
+        drivetrain.drive_for_blind(-100, 0)
+
+    _descorer_close_entry = None
+
     @classmethod
     def trigger_descorer(cls):
-        """Trigger the descorer solenoid in a separate thread."""
-        cls._TriggerDescorer()
-    class _TriggerDescorer:
-        def __init__(self):
-            """Trigger the descorer solenoid in a separate thread."""
-            Thread(self._trigger_descorer_thread)
-
-        def _trigger_descorer_thread(self):
-            """Trigger the descorer solenoid. This function is blocking, so it should be run in a separate thread."""
-            Solenoids.descorer_solenoid.open()
-            logger.debug("Descorer triggered", ScreenTarget.BOTH)
-            wait(500, MSEC)  # Keep descorer active for 500 milliseconds
-            Solenoids.descorer_solenoid.close()
+        """Open the descorer solenoid and schedule it to close 500 milliseconds later"""
+        Solenoids.descorer_solenoid.open()
+        logger.debug("Descorer triggered", ScreenTarget.BOTH)
+
+        # Pressing again while open keeps it open for another 500 milliseconds. The earlier close is only
+        # cancelled once the new one is scheduled, so the solenoid always has a close pending.
+        entry = Scheduler.schedule(500, cls._close_descorer)
+        if entry is not None:
+            Scheduler.cancel(cls._descorer_close_entry)
+            cls._descorer_close_entry = entry
+        elif cls._descorer_close_entry is None:
+            cls._close_descorer()
+
+    @classmethod
+    def _close_descorer(cls):
+        cls._descorer_close_entry = None
+        Solenoids.descorer_solenoid.close()
 
     @staticmethod
     def toggle_match_load_unloader():
@@ -1021,6 +3048,117 @@ class DriverControl:
             logger.info("Match load unloader deployed", ScreenTarget.BOTH)
 
 
+# =============================================================================
+# PERSISTENT CONFIGURATION
+# =============================================================================
+
+class ConfigStore:
+    """
+    Saves the robot configuration to the SD card so it survives power cycles.
+
+    File layout: "TC", format version, payload length, payload, 2 byte checksum (Fletcher-16 over everything before it).
+    Payload: alliance color code, starting side code, auton mode, braking mode.
+
+    Recording is not saved: a power cycle always turns it off, so a robot can't be left recording over its playback
+    routine at a match.
+    """
+    FILENAME = "robot_config.bin"
+    MAGIC = b"TC"
+    VERSION = 1
+    PAYLOAD_LENGTH = 4
+
+    AUTON_MODES = ("COMPLEX", "SIMPLE", "PLAYBACK")
+    BRAKING_MODES = (COAST, BRAKE, HOLD)
+
+    _last_saved = None
+
+    @staticmethod
+    def checksum(data, end):
+        """Fletcher-16 checksum of data[0:end]"""
+        sum1 = 0
+        sum2 = 0
+        for i in range(end):
+            sum1 = (sum1 + data[i]) % 255
+            sum2 = (sum2 + sum1) % 255
+        return (sum2 << 8) | sum1
+
+    @classmethod
+    def encode(cls):
+        """Encode the current configuration to the file format"""
+        payload_length = cls.PAYLOAD_LENGTH
+        data = bytearray(4 + payload_length + 2)
+        data[0] = cls.MAGIC[0]
+        data[1] = cls.MAGIC[1]
+        data[2] = cls.VERSION
+        data[3] = payload_length
+        state = RobotState.get()
+        data[4] = state.current_alliance_color.code
+        data[5] = state.starting_side.code
+        data[6] = cls.AUTON_MODES.index(state.auton_mode)
+        data[7] = cls.BRAKING_MODES.index(state.current_braking_mode)
+
+        checksum = cls.checksum(data, 4 + payload_length)
+        data[4 + payload_length] = checksum & 0xFF
+        data[5 + payload_length] = checksum >> 8
+        return data
+
+    @classmethod
+    def save(cls):
+        """Save the current configuration to the SD card if it changed since the last save"""
+        try:
+            data = cls.encode()
+            if data == cls._last_saved:
+                return
+            if not brain.sdcard.is_inserted():
+                return
+            brain.sdcard.savefile(cls.FILENAME, data)
+            cls._last_saved = data
+        except Exception as e:
+            logger.error("Failed to save configuration: " + str(e))
+
+    @classmethod
+    def load(cls):
+        """
+        Load the saved configuration from the SD card. Falls back to the defaults if the file is missing or invalid.
+
+        Returns:
+            True if a saved configuration was applied
+        """
+        if not brain.sdcard.is_inserted():
+            return False
+
+        data = brain.sdcard.loadfile(cls.FILENAME)
+        if len(data) < 4 or data[0] != cls.MAGIC[0] or data[1] != cls.MAGIC[1] or data[2] != cls.VERSION:
+            if len(data) > 0:
+                logger.warning("Saved configuration not recognised - using defaults")
+            return False
+
+        payload_length = data[3]
+        if payload_length < cls.PAYLOAD_LENGTH or len(data) < 4 + payload_length + 2:
+            logger.warning("Saved configuration truncated - using defaults")
+            return False
+        stored_checksum = data[4 + payload_length] | (data[5 + payload_length] << 8)
+        if stored_checksum != cls.checksum(data, 4 + payload_length):
+            logger.warning("Saved configuration corrupt - using defaults")
+            return False
+
+        if data[4] >= len(AllianceColor.NAMES) or data[5] >= len(Side.NAMES) or \
+            data[6] >= len(cls.AUTON_MODES) or data[7] >= len(cls.BRAKING_MODES):
+            logger.warning("Saved configuration invalid - using defaults")
+            return False
+
+        RobotState.update(
+            current_alliance_color=AllianceColor(AllianceColor.NAMES[data[4]]),
+            starting_side=Side(Side.NAMES[data[5]]),
+            auton_mode=cls.AUTON_MODES[data[6]],
+            current_braking_mode=cls.BRAKING_MODES[data[7]]
+        )
+
+        cls._last_saved = bytearray(data[0:4 + payload_length + 2])
+        logger.info("Loaded saved configuration")
+        return True
+
+
 # =============================================================================
 # CONFIGURATION SCREENS
 # =============================================================================
@@ -1028,6 +3166,8 @@ class DriverControl:
 # Components
 class Label:
     """Label for displaying text on the screen"""
+    __slots__ = ("text", "x", "y", "color")
+
     def __init__(self, text, x, y, color=Color.WHITE):
         """
         Initialize a label with text and position
@@ -1050,6 +3190,15 @@ class Label:
         brain_instance.screen.print_at(self.text, x=text_x, y=text_y)
 
 class Button:
+    """
+    Touch button. Its position and size are read by both drawing and the parent screen's hit testing; buttons
+    don't move once created.
+    """
+    __slots__ = (
+        "parent", "index", "label", "x", "y", "width", "height", "fill_color", "pen_color",
+        "callback", "render_callback", "appearance_callback", "drawn_appearance"
+    )
+
     def __init__(self, parent: ConfigurationScreen, tab_name, label, x, y, width, height, fill_color=Color.BLACK, pen_color=Color.WHITE):
         """
         Initialize a button with position and dimensions
@@ -1067,7 +3216,6 @@ class Button:
         """
 
         self.parent = parent
-        self.tab_name = tab_name
         self.label = label
         self.x = x
         self.y = y
@@ -1078,11 +3226,11 @@ class Button:
 
         self.callback = None
         self.render_callback = None
+        self.appearance_callback = None
+        self.drawn_appearance = None  # (label, fill_color, pen_color) currently on screen, None if not drawn
         
-        # Add button to the parent's button dictionary
-        if tab_name not in parent.buttons:
-            parent.buttons[tab_name] = []
-        parent.buttons[tab_name].append(self)
+        # Add button to the parent's button arrays
+        self.index = parent._add_button(self, tab_name)
 
     def is_pressed(self, touch_x, touch_y):
         """
@@ -1092,7 +3240,9 @@ class Button:
             touch_x: X coordinate of the touch
             touch_y: Y coordinate of the touch
         """
-        return (self.x <= touch_x <= self.x + self.width) and (self.y <= touch_y <= self.y + self.height)
+        x = self.x
+        y = self.y
+        return x <= touch_x <= x + self.width and y <= touch_y <= y + self.height
     
     def draw(self, brain_instance: Brain, **kwargs):
         """
@@ -1113,18 +3263,66 @@ class Button:
         label = kwargs.get("label", label)           
 
         # Draw Rectangle
+        x = self.x
+        y = self.y
+        width = self.width
+        height = self.height
         brain_instance.screen.set_fill_color(fill_color)
         brain_instance.screen.set_pen_color(pen_color)
-        brain_instance.screen.draw_rectangle(self.x, self.y, self.width, self.height)
+        brain_instance.screen.draw_rectangle(x, y, width, height)
 
         # Add text
         if label is not None:
             text_color = Color.WHITE if fill_color != Color.WHITE else Color.BLACK
             brain_instance.screen.set_pen_color(text_color)
-            center_x, center_y = ConfigurationScreen._calculate_center_for_rect(self.x, self.y, self.width, self.height)
+            center_x, center_y = ConfigurationScreen._calculate_center_for_rect(x, y, width, height)
             text_x, text_y = ConfigurationScreen._calculate_center_for_text(brain_instance, center_x, center_y, label)
             brain_instance.screen.print_at(label, x=text_x, y=text_y)
 
+    def get_appearance(self):
+        """Get the (label, fill_color, pen_color) the button should currently be drawn with"""
+        if self.appearance_callback is not None:
+            return self.appearance_callback()
+        return (self.label, self.fill_color, self.pen_color)
+
+    def set_appearance_callback(self, appearance_callback):
+        """
+        Set a function that returns the button's current (label, fill_color, pen_color)
+
+        Args:
+            appearance_callback: Function called on every render to find out if the button has changed
+        """
+        self.appearance_callback = appearance_callback
+
+    def invalidate(self):
+        """Mark the button as not drawn so the next redraw draws it"""
+        self.drawn_appearance = None
+
+    def redraw(self, brain_instance: Brain):
+        """
+        Draw the button only if its appearance changed since it was last drawn
+
+        Args:
+            brain_instance: Brain instance to draw on
+
+        Returns:
+            True if the button was drawn
+        """
+        appearance = self.get_appearance()
+        if appearance == self.drawn_appearance:
+            return False
+
+        if self.drawn_appearance is not None:
+            # Erase the old button first, a transparent fill would leave it showing through
+            brain_instance.screen.set_fill_color(Color.BLACK)
+            brain_instance.screen.set_pen_color(Color.BLACK)
+            brain_instance.screen.draw_rectangle(self.x, self.y, self.width, self.height)
+
+        label, fill_color, pen_color = appearance
+        self.draw(brain_instance, label=label, fill_color=fill_color, pen_color=pen_color)
+        self.drawn_appearance = appearance
+        return True
+
     def set_callback(self, callback, render_callback):
         """
         Set a callback function to be called when the button is pressed
@@ -1160,16 +3358,41 @@ class ConfigurationScreen:
     PIXELS_PER_CELL_HEIGHT = 20
     TAB_HEIGHT = 30
     DONE_BUTTON_HEIGHT = 30
+
+    # Touch hit testing. Buttons are indexed into a grid of square cells so a touch only checks the buttons
+    # overlapping its cell.
+    HIT_CELL_SIZE = 40
+    HIT_GRID_COLUMNS = SCREEN_WIDTH // HIT_CELL_SIZE   # 12
+    HIT_GRID_ROWS = SCREEN_HEIGHT // HIT_CELL_SIZE     # 6
+
+    # Button groups are stored as small integer codes. Tab groups follow in tab order.
+    GROUP_TABS = 0
+    GROUP_GLOBAL = 1
+    FIRST_TAB_GROUP = 2
+
+    # Seconds after the last touch before the screen closes once a competition mode has started
+    EXIT_TIMEOUT_SEC = 5.0
+
+    active = None  # The configuration screen currently shown, if any
     
-    # Tab Classes. Must implement:
+    # Font used for all text. Text sizes are cached per (text, font).
+    FONT = FontType.MONO20
+    _text_size_cache = {}
+
+    # Tab Classes. Tabs are created the first time they are shown. Must implement:
+    # - NAME class attribute (shown on the tab button).
     # - __init__(parent: ConfigurationScreen) method.
-    # - draw(brain_instance: Brain) method.
+    # - draw(brain_instance: Brain) method. Draws static content only; only called when the whole screen is redrawn.
+    #   Buttons are redrawn by the configuration screen when their appearance changes.
     # - self.name attribute.
     class MainSettingsTab:
         """Tab for main robot settings (starting side and alliance color)"""
+        NAME = "Main Settings"
+        __slots__ = ("parent", "name", "left_btn", "right_btn", "blue_btn", "red_btn")
+
         def __init__(self, parent: ConfigurationScreen):
             self.parent = parent
-            self.name = "Main Settings"
+            self.name = self.NAME
 
             margin = 10
             buttons_width = (parent.SCREEN_WIDTH - (2 * margin)) // 2 - margin # 220
@@ -1182,13 +3405,19 @@ class ConfigurationScreen:
                 parent, self.name, "LEFT", margin, row_top + margin,
                 buttons_width, buttons_height, Color.BLACK, Color.WHITE
             )
-            self.left_btn.set_callback(lambda: RobotState.starting_side.set("LEFT"), parent.render)
+            self.left_btn.set_callback(lambda: RobotState.update(starting_side=Side("LEFT")), parent.render)
+            self.left_btn.set_appearance_callback(
+                lambda: ("LEFT", Color.GREEN if RobotState.get().starting_side == "LEFT" else Color.TRANSPARENT, Color.WHITE)
+            )
             
             self.right_btn = Button( # 250/480 - 470/480, 40/240 - 110/240, width: 220, height: 70
                 parent, self.name, "RIGHT", parent.SCREEN_WIDTH - margin - buttons_width, row_top + margin,
                 buttons_width, buttons_height, Color.BLACK, Color.WHITE
             )
-            self.right_btn.set_callback(lambda: RobotState.starting_side.set("RIGHT"), parent.render)
+            self.right_btn.set_callback(lambda: RobotState.update(starting_side=Side("RIGHT")), parent.render)
+            self.right_btn.set_appearance_callback(
+                lambda: ("RIGHT", Color.GREEN if RobotState.get().starting_side == "RIGHT" else Color.TRANSPARENT, Color.WHITE)
+            )
 
             # Next row
             row_top = parent.TAB_HEIGHT + margin + buttons_height + margin
@@ -1197,35 +3426,32 @@ class ConfigurationScreen:
                 parent, self.name, "BLUE", margin, row_top + margin,
                 buttons_width, buttons_height, Color.BLACK, Color.WHITE
                 )
-            self.blue_btn.set_callback(lambda: RobotState.current_alliance_color.set("BLUE"), parent.render)
+            self.blue_btn.set_callback(lambda: RobotState.update(current_alliance_color=AllianceColor("BLUE")), parent.render)
+            self.blue_btn.set_appearance_callback(
+                lambda: ("BLUE", Color.BLUE if str(RobotState.get().current_alliance_color) == "BLUE" else Color.TRANSPARENT, Color.WHITE)
+            )
             
             self.red_btn = Button( # 250/480 - 470/480, 140/240 - 220/240
                 parent, self.name, "RED", parent.SCREEN_WIDTH - margin - buttons_width, row_top + margin,
                 buttons_width, buttons_height, Color.BLACK, Color.WHITE
             )
-            self.red_btn.set_callback(lambda: RobotState.current_alliance_color.set("RED"), parent.render)
+            self.red_btn.set_callback(lambda: RobotState.update(current_alliance_color=AllianceColor("RED")), parent.render)
+            self.red_btn.set_appearance_callback(
+                lambda: ("RED", Color.RED if str(RobotState.get().current_alliance_color) == "RED" else Color.TRANSPARENT, Color.WHITE)
+            )
         
         def draw(self, brain_instance: Brain):
-            """Draw the tab content with current state"""
-            
-            # Draw buttons with state-dependent colors
-            left_color = Color.GREEN if RobotState.starting_side == "LEFT" else Color.TRANSPARENT
-            self.left_btn.draw(brain_instance, fill_color=left_color)
-            
-            right_color = Color.GREEN if RobotState.starting_side == "RIGHT" else Color.TRANSPARENT
-            self.right_btn.draw(brain_instance, fill_color=right_color)
-            
-            blue_color = Color.BLUE if str(RobotState.current_alliance_color) == "BLUE" else Color.TRANSPARENT
-            self.blue_btn.draw(brain_instance, fill_color=blue_color)
-            
-            red_color = Color.RED if str(RobotState.current_alliance_color) == "RED" else Color.TRANSPARENT
-            self.red_btn.draw(brain_instance, fill_color=red_color)
+            """Draw the static tab content (the buttons are drawn by the configuration screen)"""
+            pass
     
     class OtherConfigsTab:
-        """Tab for other configurations (currently unimplemented)"""
+        """Tab for other configurations (autonomous mode and driver control recording)"""
+        NAME = "Other Configs"
+        __slots__ = ("parent", "name", "title_label", "auton_mode_btn", "recording_btn")
+
         def __init__(self, parent: ConfigurationScreen):
             self.parent = parent
-            self.name = "Other Configs"
+            self.name = self.NAME
 
             margin = 10
             
@@ -1241,7 +3467,14 @@ class ConfigurationScreen:
                 parent, self.name, margin, y_offset
             )
 
+            y_offset += 60
+            self.recording_btn = self.RecordingButton(
+                parent, self.name, margin, y_offset
+            )
+
         class AutonModeButton(Button):
+            __slots__ = ()
+
             def __init__(self, config_screen: ConfigurationScreen, tab_name, margin, y_offset):
                 super().__init__(
                     config_screen, tab_name, self.get_name(),
@@ -1251,26 +3484,141 @@ class ConfigurationScreen:
                 self.set_callback(self.auton_mode_btn_callback, config_screen.render)
 
             def get_name(self):
-                return "Auton Mode: " + str(RobotState.auton_mode)
+                return "Auton Mode: " + str(RobotState.get().auton_mode)
 
             def auton_mode_btn_color(self):
                 """Get the fill color for the auton mode button based on current selection"""
-                return Color.GREEN if RobotState.auton_mode == "COMPLEX" else Color.RED
+                auton_mode = RobotState.get().auton_mode
+                if auton_mode == "COMPLEX":
+                    return Color.GREEN
+                elif auton_mode == "PLAYBACK":
+                    return Color.ORANGE
+                return Color.RED
             
             def auton_mode_btn_callback(self):
-                """Callback to toggle the auton mode"""
-                if RobotState.auton_mode == "SIMPLE":
-                    setattr(RobotState, "auton_mode", "COMPLEX")
+                """Callback to cycle the auton mode"""
+                auton_mode = RobotState.get().auton_mode
+                if auton_mode == "COMPLEX":
+                    RobotState.update(auton_mode="SIMPLE")
+                elif auton_mode == "SIMPLE":
+                    RobotState.update(auton_mode="PLAYBACK")
                 else:
-                    setattr(RobotState, "auton_mode", "SIMPLE")
+                    RobotState.update(auton_mode="COMPLEX")
+
+            def get_appearance(self):
+                return (self.get_name(), self.auton_mode_btn_color(), self.pen_color)
+
+        class RecordingButton(Button):
+            __slots__ = ()
+
+            def __init__(self, config_screen: ConfigurationScreen, tab_name, margin, y_offset):
+                super().__init__(
+                    config_screen, tab_name, self.get_name(),
+                    margin, y_offset,
+                    config_screen.SCREEN_WIDTH - (2 * margin), 50
+                )
+                self.set_callback(self.recording_btn_callback, config_screen.render)
+
+            def get_name(self):
+                return "Record Driver: " + ("ON" if RobotState.get().recording_enabled else "OFF")
+
+            def recording_btn_callback(self):
+                """Callback to toggle driver control recording"""
+                RobotState.update(recording_enabled=not RobotState.get().recording_enabled)
 
-            def run_draw(self, brain_instance: Brain):
-                self.draw(brain_instance, label=self.get_name(), fill_color=self.auton_mode_btn_color())
+            def get_appearance(self):
+                fill_color = Color.ORANGE if RobotState.get().recording_enabled else Color.BLACK
+                return (self.get_name(), fill_color, self.pen_color)
 
         def draw(self, brain_instance: Brain):
-            """Draw the tab content (currently empty)"""
+            """Draw the static tab content (the buttons are drawn by the configuration screen)"""
             self.title_label.draw(brain_instance)
-            self.auton_mode_btn.run_draw(brain_instance)
+
+    class DiagnosticsTab:
+        """
+        Tab with live robot readings. While the tab is shown, a separate thread redraws the readings at
+        FRAME_MS intervals so the control loops never wait on the screen.
+        """
+        NAME = "Diagnostics"
+        FRAME_MS = 200      # 5 frames per second
+        ROW_COUNT = 8
+        ROW_CHARACTERS = 46  # Rows are padded so shorter text covers the previous frame
+        __slots__ = ("parent", "name", "thread_active", "drawn_rows")
+
+        def __init__(self, parent: ConfigurationScreen):
+            self.parent = parent
+            self.name = self.NAME
+            self.thread_active = False
+            self.drawn_rows = [None] * self.ROW_COUNT
+
+        def draw(self, brain_instance: Brain):
+            """Draw the tab and start the thread that keeps the readings up to date"""
+            self.drawn_rows = [None] * self.ROW_COUNT
+            self._draw_readings()
+            if not self.thread_active:
+                self.thread_active = True
+                Thread(self._run_thread)
+
+        def _run_thread(self):
+            """Redraw the readings until the tab is no longer shown"""
+            try:
+                while self.parent.thread_running and self.parent.current_tab == self.name:
+                    if self._draw_readings():
+                        self.parent.brain.screen.render()
+                    wait(self.FRAME_MS, MSEC)
+            finally:
+                self.thread_active = False
+
+        @staticmethod
+        def _motor_reading(name, motor):
+            """Format a motor's temperature and current"""
+            return name + " " + str(int(motor.temperature(TemperatureUnits.CELSIUS))) + "C " + \
+                str(round(motor.current(CurrentUnits.AMP), 1)) + "A"
+
+        @staticmethod
+        def _headroom_reading():
+            """Format the intake thermal headroom. The block manipulation system is created by the competition modes,
+            not by this tab, so before then there is no reading."""
+            if block_manipulation_system is None:
+                return "n/a"
+            return str(int(block_manipulation_system.get_thermal_headroom())) + "C"
+
+        def _get_rows(self):
+            """Get the text of every row"""
+            return (
+                "Loop " + str(int(DriverControl.loop_time_ms)) + "ms  max " + str(int(DriverControl.max_loop_time_ms)) +
+                    "ms  late " + str(DriverControl.late_ticks) + "  crashes " + str(len(TaskSupervisor.crash_history)),
+                "Battery " + str(round(brain.battery.voltage(), 1)) + "V " + str(round(brain.battery.current(), 1)) + "A  " +
+                    MemoryManager.get_summary(),
+                "Heading " + (str(round(Sensors.inertia_sensor.heading(), 1)) if Sensors.is_heading_ready() else "calibrating") +
+                    "  Hue L " + str(int(Sensors.intake_optical_sensor_left.hue())) +
+                    " R " + str(int(Sensors.intake_optical_sensor_right.hue())),
+                self._motor_reading("Drive L", Motors.left_motor_group) + "  " + self._motor_reading("R", Motors.right_motor_group),
+                self._motor_reading("Strafe", Motors.strafe_motor),
+                self._motor_reading("Intake", Motors.bottom_intake_motor) + "  " + self._motor_reading("Top", Motors.top_intake_motor),
+                self._motor_reading("Unloader", Motors.unloading_motor) + "  Headroom " + self._headroom_reading(),
+                Startup.get_summary(),
+            )
+
+        def _draw_readings(self):
+            """
+            Draw the rows that changed since the last frame
+
+            Returns:
+                True if anything was drawn
+            """
+            screen = self.parent.brain.screen
+            changed = False
+            screen.set_fill_color(Color.BLACK)
+            screen.set_pen_color(Color.WHITE)
+            for i, text in enumerate(self._get_rows()):
+                if text == self.drawn_rows[i]:
+                    continue
+                padding = self.ROW_CHARACTERS - len(text)
+                screen.print_at(text + " " * padding if padding > 0 else text, x=10, y=50 + i * 20, opaque=True)
+                self.drawn_rows[i] = text
+                changed = True
+            return changed
     
     # ConfigurationScreen Methods
     def __init__(self, brain_instance: Brain, logger_instance: Logger, competition_instance):
@@ -1279,15 +3627,20 @@ class ConfigurationScreen:
         self.comp = competition_instance
         
         self.current_tab = "Main Settings"
+        self.drawn_tab = None  # Tab currently on screen, None forces a full redraw
         self.thread_running = True
         self.time_since_last_render = None
-        self.buttons: dict[str, list[Button]] = {}
+        self.exit_thread = None
         
-        # Create tab instances
-        self.tab_instances = [
-            self.MainSettingsTab(self),
-            self.OtherConfigsTab(self)
-        ]
+        # Tabs, in display order. Instances are created the first time a tab is shown.
+        self.tab_classes = (self.MainSettingsTab, self.OtherConfigsTab, self.DiagnosticsTab)
+        self.tab_instances = {}
+
+        # Buttons, indexed by creation order
+        group_count = self.FIRST_TAB_GROUP + len(self.tab_classes)
+        self.buttons: list[Button] = []
+        self.group_buttons = [bytearray() for _ in range(group_count)]  # Button indexes in each group
+        self.hit_index = [None] * group_count  # Button indexes for each grid cell, per group. None until indexed.
         
         # Create tab switching buttons
         self._init_tab_buttons()
@@ -1295,22 +3648,63 @@ class ConfigurationScreen:
         # Create global buttons (Done button)
         self._init_global_buttons()
 
+        self._index_buttons(self.GROUP_TABS)
+        self._index_buttons(self.GROUP_GLOBAL)
+
         # Set up touch callback
         brain_instance.screen.pressed(self._touch_callback)
     
     def _init_tab_buttons(self):
         """Initialize tab switching buttons"""
-        num_tabs = len(self.tab_instances)
+        num_tabs = len(self.tab_classes)
         tab_width = self.SCREEN_WIDTH // num_tabs
         
-        for i, tab_instance in enumerate(self.tab_instances):
+        for i, tab_class in enumerate(self.tab_classes):
             x = i * tab_width
             button = Button(
-                self, "TABS", tab_instance.name, x, 0, tab_width,
+                self, "TABS", tab_class.NAME, x, 0, tab_width,
                 self.TAB_HEIGHT, Color.BLACK, Color.WHITE
             )
-            button.set_callback(lambda name=tab_instance.name: setattr(self, "current_tab", name), self.render)
-    
+            button.set_callback(lambda name=tab_class.NAME: setattr(self, "current_tab", name), self.render)
+            button.set_appearance_callback(
+                lambda name=tab_class.NAME: (name, Color.WHITE if name == self.current_tab else Color.BLACK, Color.WHITE)
+            )
+
+    def _get_tab(self, name):
+        """Get a tab instance, creating it the first time it is needed"""
+        tab_instance = self.tab_instances.get(name)
+        if tab_instance is None:
+            for tab_class in self.tab_classes:
+                if tab_class.NAME == name:
+                    tab_instance = tab_class(self)
+                    self.tab_instances[name] = tab_instance
+                    self._index_buttons(self._get_group(name))
+                    break
+        return tab_instance
+
+    def _get_group(self, name):
+        """Get the code of a button group from its name (a tab name, "TABS" or "GLOBAL")"""
+        if name == "TABS":
+            return self.GROUP_TABS
+        if name == "GLOBAL":
+            return self.GROUP_GLOBAL
+        for i, tab_class in enumerate(self.tab_classes):
+            if tab_class.NAME == name:
+                return self.FIRST_TAB_GROUP + i
+        raise ValueError("Unknown button group: " + str(name))
+
+    def _add_button(self, button, group_name):
+        """
+        Add a button to the button arrays
+
+        Returns:
+            The button's index
+        """
+        index = len(self.buttons)
+        self.buttons.append(button)
+        self.group_buttons[self._get_group(group_name)].append(index)
+        return index
+
     def _init_global_buttons(self):
         """Initialize global buttons (Done button)"""
         done_button = Button(
@@ -1318,112 +3712,151 @@ class ConfigurationScreen:
             self.SCREEN_HEIGHT - self.DONE_BUTTON_HEIGHT,
             200, self.DONE_BUTTON_HEIGHT, Color.PURPLE, Color.WHITE
         )
-        done_button.set_callback(lambda: setattr(self, 'thread_running', False), self.render)
+        done_button.set_callback(self._close, None)
+
+    def _index_buttons(self, group):
+        """Index every button in a group into the hit test grid cells it overlaps"""
+        cell = self.HIT_CELL_SIZE
+        grid = [None] * (self.HIT_GRID_COLUMNS * self.HIT_GRID_ROWS)
+        for index in self.group_buttons[group]:
+            button = self.buttons[index]
+            x, y, width, height = button.x, button.y, button.width, button.height
+            first_column = max(0, x // cell)
+            last_column = min(self.HIT_GRID_COLUMNS - 1, (x + width) // cell)
+            first_row = max(0, y // cell)
+            last_row = min(self.HIT_GRID_ROWS - 1, (y + height) // cell)
+            for row in range(first_row, last_row + 1):
+                for column in range(first_column, last_column + 1):
+                    cell_index = row * self.HIT_GRID_COLUMNS + column
+                    if grid[cell_index] is None:
+                        grid[cell_index] = bytearray()
+                    grid[cell_index].append(index)
+        self.hit_index[group] = grid
+
+    def _find_button(self, x, y):
+        """Find the button at a touch position. Returns None if no button was touched."""
+        column = min(self.HIT_GRID_COLUMNS - 1, max(0, x // self.HIT_CELL_SIZE))
+        row = min(self.HIT_GRID_ROWS - 1, max(0, y // self.HIT_CELL_SIZE))
+        cell_index = row * self.HIT_GRID_COLUMNS + column
+
+        # Tab buttons, then current tab buttons, then global buttons
+        for group in (self.GROUP_TABS, self._get_group(self.current_tab), self.GROUP_GLOBAL):
+            grid = self.hit_index[group]
+            if grid is None or grid[cell_index] is None:
+                continue
+            for index in grid[cell_index]:
+                button = self.buttons[index]
+                if button.is_pressed(x, y):
+                    return button
+        return None
 
     def _touch_callback(self):
         """Handle touch events on the screen"""
-        x = self.brain.screen.x_position()
-        y = self.brain.screen.y_position()
+        if not self.thread_running:
+            return  # The screen is closed; its buttons are no longer shown
 
-        # Check tab buttons
-        if "TABS" in self.buttons:
-            for button in self.buttons["TABS"]:
-                if button.is_pressed(x, y):
-                    button.run_callback()
-                    return
-        
-        # Check current tab buttons
-        if self.current_tab in self.buttons:
-            for button in self.buttons[self.current_tab]:
-                if button.is_pressed(x, y):
-                    button.run_callback()
-                    return
-        
-        # Check global buttons
-        if "GLOBAL" in self.buttons:
-            for button in self.buttons["GLOBAL"]:
-                if button.is_pressed(x, y):
-                    button.run_callback()
-                    return
+        button = self._find_button(self.brain.screen.x_position(), self.brain.screen.y_position())
+        if button is not None:
+            button.run_callback()
+            ConfigStore.save()
 
     def render(self):
-        """Render the entire configuration screen"""
+        """Render the configuration screen, redrawing only the buttons that changed"""
         if self.thread_running is False:
             return
-        
-        self.brain.screen.clear_screen()
-        
-        # Draw tab buttons with state-dependent colors
-        if "TABS" in self.buttons:
-            for button in self.buttons["TABS"]:
-                fill_color = Color.WHITE if button.label == self.current_tab else Color.BLACK
-                button.draw(self.brain, fill_color=fill_color)
-        
-        # Draw current tab content
-        for tab_instance in self.tab_instances:
-            if tab_instance.name == self.current_tab:
-                tab_instance.draw(self.brain)
-                break
-        
-        # Draw global buttons
-        if "GLOBAL" in self.buttons:
-            for button in self.buttons["GLOBAL"]:
-                button.draw(self.brain)
+
+        changed = False
+
+        # Switching tabs (or the first render) redraws everything
+        if self.drawn_tab != self.current_tab:
+            self.brain.screen.clear_screen()
+            self.brain.screen.set_font(self.FONT)
+            for button in self.buttons:
+                button.invalidate()
+
+            # Draw current tab static content
+            self._get_tab(self.current_tab).draw(self.brain)
+
+            self.drawn_tab = self.current_tab
+            changed = True
+
+        # Redraw tab buttons, current tab buttons and global buttons that changed
+        for group in (self.GROUP_TABS, self._get_group(self.current_tab), self.GROUP_GLOBAL):
+            for index in self.group_buttons[group]:
+                if self.buttons[index].redraw(self.brain):
+                    changed = True
 
         self.time_since_last_render = self.brain.timer.time(SECONDS)
 
-        self.brain.screen.render() # Render screen
-    
-    def _should_exit(self):
-        """Check if we should exit the configuration screen"""
-        # Check if competition mode has started
-        mode_started = self.comp.is_autonomous() or self.comp.is_driver_control()
-        
-        if mode_started:
-            if self.time_since_last_render is None:
-                return False  # First render hasn't happened yet
-            
-            # If mode started, check 5 second timeout since last touch
-            current_time = self.brain.timer.time(SECONDS)
-            time_since_render = current_time - self.time_since_last_render
-            if time_since_render >= 5.0:
-                return True
-        
-        return False
+        if changed:
+            self.brain.screen.render() # Render screen
     
-    def _run_thread(self):
-        """Main thread function for the configuration screen"""
-        try:
-            # Disable brain logging while config screen is active
-            self.logger.brain_logging_enabled = False
+    @classmethod
+    def notify_competition_started(cls):
+        """Called when a competition mode starts. The active screen closes 5 seconds after its last touch."""
+        if cls.active is not None:
+            cls.active._start_exit_timer()
+
+    def _start_exit_timer(self):
+        """Start the thread that closes the screen once it has not been touched for EXIT_TIMEOUT_SEC"""
+        if self.thread_running and self.exit_thread is None:
+            self.exit_thread = Thread(self._exit_thread)
+
+    def _exit_thread(self):
+        """Sleep until the exit deadline, then close the screen. Touches push the deadline back."""
+        while self.thread_running:
+            # The diagnostics tab stays open during practice. On a field or competition switch, the match always wins.
+            if self.current_tab == self.DiagnosticsTab.NAME and \
+                not (self.comp.is_field_control() or self.comp.is_competition_switch()):
+                wait(self.EXIT_TIMEOUT_SEC, SECONDS)
+                continue
+
+            last_render = self.time_since_last_render
+            if last_render is None:
+                last_render = self.brain.timer.time(SECONDS)
+            remaining = last_render + self.EXIT_TIMEOUT_SEC - self.brain.timer.time(SECONDS)
+            if remaining <= 0:
+                break
+            wait(remaining, SECONDS)
+        self._close()
 
-            # Draw initial screen
-            self.render()
-            
-            # Log to controller only
-            self.logger.info("Configuration screen active", ScreenTarget.CONTROLLER)
-            
-            # Keep the screen interactive
-            while self.thread_running:
-                if self._should_exit():
-                    break
-                
-                wait(50, MSEC)
+    def _close(self):
+        """Close the configuration screen and hand the brain screen back to the logger"""
+        if not self.thread_running:
+            return
+        self.thread_running = False
+        if ConfigurationScreen.active is self:
+            ConfigurationScreen.active = None
 
-        finally:
-            # Re-enable brain logging
-            self.logger.brain_logging_enabled = True
-            self.logger.brain_line = 1
+        # Re-enable brain logging
+        self.logger.brain_logging_enabled = True
+        self.logger.brain_line = 1
 
-            # Reset text styles
-            self.brain.screen.set_cursor(0, 0)
-            self.brain.screen.set_fill_color(Color.TRANSPARENT)
+        # Reset text styles
+        self.brain.screen.set_cursor(0, 0)
+        self.brain.screen.set_fill_color(Color.TRANSPARENT)
 
-            # Clear screen and log final settings
-            self.brain.screen.clear_screen()
-            self.logger.info("Config complete - Side: " + str(RobotState.starting_side) + " Color: " + str(RobotState.current_alliance_color))
-            
-            self.thread_running = False
+        # Clear screen and log final settings
+        self.brain.screen.clear_screen()
+        state = RobotState.get()
+        self.logger.info("Config complete - Side: " + str(state.starting_side) + " Color: " + str(state.current_alliance_color))
+
+    def _run_thread(self):
+        """Thread function that shows the configuration screen. Everything after this is driven by touch and competition events."""
+        # Disable brain logging while config screen is active
+        self.logger.brain_logging_enabled = False
+        ConfigurationScreen.active = self
+
+        # Draw initial screen
+        self.render()
+        Startup.mark_interactive()
+
+        # Log to controller only
+        self.logger.info("Configuration screen active", ScreenTarget.CONTROLLER)
+
+        # A competition mode may already be running (e.g. the program was restarted during a match)
+        if self.comp.is_autonomous() or self.comp.is_driver_control():
+            self._start_exit_timer()
     
     def run(self):
         """Run the configuration screen in a separate thread"""
@@ -1438,11 +3871,20 @@ class ConfigurationScreen:
         center_y = y + (height // 2)
         return center_x, center_y
 
+    @classmethod
+    def _get_text_size(cls, brain_instance: Brain, text):
+        """Get the (width, height) of text in pixels. Sizes are measured once per text and font."""
+        key = (text, cls.FONT)
+        size = cls._text_size_cache.get(key)
+        if size is None:
+            size = (brain_instance.screen.get_string_width(text), brain_instance.screen.get_string_height(text))
+            cls._text_size_cache[key] = size
+        return size
+
     @staticmethod
     def _calculate_center_for_text(brain_instance: Brain, x, y, text):
         """Calculate the top-left position for text centered at a point. Returns coordinates for print_at (in pixels)."""
-        text_width = brain_instance.screen.get_string_width(text)
-        text_height = brain_instance.screen.get_string_height(text)
+        text_width, text_height = ConfigurationScreen._get_text_size(brain_instance, text)
         text_x = x - (text_width // 2)
         # print_at positions from top of text, so we need to adjust for vertical centering
         text_y = y + (text_height // 2)
@@ -1450,14 +3892,21 @@ class ConfigurationScreen:
 
 
 def pre_auton():
-    """Called before autonomous - setup configuration screen"""
-    pass
+    """Called before autonomous - prepare the autonomous routines once the rest of startup is done"""
+    def prepare():
+        if Autonomous.routines is None:
+            Autonomous.prepare()
+            Startup.mark("Autonomous routines")
+    Thread(prepare)
 
 
 # =============================================================================
 # PROGRAM STARTUP
 # =============================================================================
 
+# Start telemetry first so the startup messages are streamed too
+Telemetry.start()
+
 # Initialize logger after all components are set up
 logger.info("Logger initialized")
 
@@ -1467,6 +3916,17 @@ battery_voltage = str(round(brain.battery.voltage(), 1))
 battery_current = str(round(brain.battery.current(), 1))
 logger.info("Battery: " + battery_voltage + "V " + battery_current + "A")
 
+# Calibration takes about 2 seconds; start it first so it overlaps with everything else
+Startup.start_calibration()
+Startup.mark("Calibration started")
+
+Sensors.initialize_sensors()
+Startup.mark("Optical sensors")
+
+# Restore the configuration saved on the SD card before anything uses it
+ConfigStore.load()
+Startup.mark("Config load")
+
 # Create competition instance
 comp = Competition(DriverControl.start, Autonomous.start)
 
@@ -1477,5 +3937,6 @@ pre_auton()
 # In competition mode, it stays until Done is pressed or 5 seconds after last touch
 config_screen = ConfigurationScreen(brain, logger, comp)
 config_screen.run()
+Startup.mark("Config screen built")
 
 logger.info("Robot initialized and ready", ScreenTarget.BOTH)
\ No newline at end of file
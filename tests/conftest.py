@@ -0,0 +1,32 @@
+"""Shared fixtures: each test gets a fresh simulated robot with src/main.py loaded."""
+
+import os
+import sys
+
+import pytest
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if REPO_ROOT not in sys.path:
+    sys.path.insert(0, REPO_ROOT)
+
+from sim.harness import Simulation  # noqa: E402
+
+STARTUP_MS = 3000
+
+
+def start(sd_files=None, **kwargs):
+    """Load the program on a new simulated robot and let it finish starting up"""
+    sim = Simulation(sd_files=sd_files, **kwargs)
+    sim.load()
+    sim.advance(STARTUP_MS)
+    return sim
+
+
+@pytest.fixture
+def sim():
+    return start()
+
+
+@pytest.fixture
+def program(sim):
+    return sim.program
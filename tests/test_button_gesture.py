@@ -0,0 +1,120 @@
+"""ButtonGesture timing, with the Scheduler ticked by driver control."""
+
+import pytest
+
+from conftest import start
+
+
+@pytest.fixture
+def sim():
+    sim = start()
+    sim.competition.field_control = True
+    sim.competition.start_driver_control()
+    sim.advance(100)
+    return sim
+
+
+class Recorder:
+    def __init__(self, sim):
+        self.sim = sim
+        self.events = []
+
+    def action(self, name):
+        return lambda: self.events.append((name, self.sim.now_ms))
+
+
+def watch(sim, **actions):
+    recorder = Recorder(sim)
+    button = sim.controller.buttonB
+    sim.program.ButtonGesture(button, **{key: recorder.action(name) for key, name in actions.items()})
+    return recorder, button
+
+
+def tap(sim, button, hold_ms=100):
+    button.set(True)
+    sim.advance(hold_ms)
+    button.set(False)
+
+
+def names(recorder):
+    return [name for name, _ in recorder.events]
+
+
+def test_short_press_only_fires_on_press(sim):
+    recorder, button = watch(sim, on_short_press="short")
+    button.set(True)
+    sim.advance(20)
+    assert names(recorder) == ["short"]
+    button.set(False)
+    sim.advance(500)
+    assert names(recorder) == ["short"]
+
+
+def test_short_press_with_long_press_fires_on_release(sim):
+    recorder, button = watch(sim, on_short_press="short", on_long_press="long")
+    button.set(True)
+    sim.advance(200)
+    assert names(recorder) == []
+    button.set(False)
+    sim.advance(20)
+    assert names(recorder) == ["short"]
+
+
+def test_long_press(sim):
+    settings = sim.program.ControllerSettings
+    recorder, button = watch(sim, on_short_press="short", on_long_press="long")
+    pressed_at = sim.now_ms
+    button.set(True)
+    sim.advance(settings.LONG_PRESS_MS + 100)
+    assert names(recorder) == ["long"]
+    assert recorder.events[0][1] - pressed_at <= settings.LONG_PRESS_MS + 30  # Fires while still held
+    button.set(False)
+    sim.advance(500)
+    assert names(recorder) == ["long"]
+
+
+def test_short_press_waits_for_double_tap_timeout(sim):
+    settings = sim.program.ControllerSettings
+    recorder, button = watch(sim, on_short_press="short", on_double_tap="double")
+    tap(sim, button)
+    released_at = sim.now_ms
+    sim.advance(settings.DOUBLE_TAP_MS - 50)
+    assert names(recorder) == []
+    sim.advance(100)
+    assert names(recorder) == ["short"]
+    assert recorder.events[0][1] - released_at >= settings.DOUBLE_TAP_MS
+
+
+def test_double_tap(sim):
+    recorder, button = watch(sim, on_short_press="short", on_double_tap="double")
+    tap(sim, button)
+    sim.advance(100)
+    tap(sim, button)
+    sim.advance(1000)
+    assert names(recorder) == ["double"]
+
+
+def test_slow_taps_are_two_short_presses(sim):
+    settings = sim.program.ControllerSettings
+    recorder, button = watch(sim, on_short_press="short", on_double_tap="double")
+    tap(sim, button)
+    sim.advance(settings.DOUBLE_TAP_MS + 100)
+    tap(sim, button)
+    sim.advance(settings.DOUBLE_TAP_MS + 100)
+    assert names(recorder) == ["short", "short"]
+
+
+def test_short_press_not_lost_when_scheduler_is_full(sim):
+    program = sim.program
+    recorder, button = watch(sim, on_short_press="short", on_double_tap="double")
+    fillers = []
+    while True:
+        entry = program.Scheduler.schedule(60000, lambda: None)
+        if entry is None:
+            break
+        fillers.append(entry)
+    tap(sim, button)
+    sim.advance(20)
+    assert names(recorder) == ["short"]
+    for entry in fillers:
+        program.Scheduler.cancel(entry)
@@ -0,0 +1,23 @@
+"""Configuration screen hit testing: each button is found from its own geometry."""
+
+
+def test_every_indexed_button_is_found_at_its_center(program):
+    screen = program.config_screen
+    for button in list(screen.buttons):
+        center_x = button.x + button.width // 2
+        center_y = button.y + button.height // 2
+        group = [g for g, indexes in enumerate(screen.group_buttons) if button.index in indexes][0]
+        if screen.hit_index[group] is None:
+            continue  # Tab not shown yet
+        if group >= screen.FIRST_TAB_GROUP and screen._get_group(screen.current_tab) != group:
+            continue  # Only the current tab's buttons can be hit
+        assert screen._find_button(center_x, center_y) is button
+
+
+def test_tapping_a_tab_switches_to_it(sim, program):
+    screen = program.config_screen
+    tab = [button for button in screen.buttons if button.label == "Diagnostics"][0]
+    sim.touch(tab.x + tab.width // 2, tab.y + tab.height // 2)
+    sim.advance(100)
+    assert screen.current_tab == "Diagnostics"
+    assert not tab.is_pressed(tab.x + tab.width + 1, tab.y)
@@ -0,0 +1,91 @@
+"""ConfigStore: the saved configuration round-trips, and bad files fall back to the defaults."""
+
+import vex
+
+from conftest import start
+
+
+def saved_file(program):
+    return bytes(program.ConfigStore.encode())
+
+
+def with_checksum(program, data):
+    """Recompute the file checksum after editing the payload"""
+    data = bytearray(data)
+    end = 4 + data[3]
+    checksum = program.ConfigStore.checksum(data, end)
+    data[end] = checksum & 0xFF
+    data[end + 1] = checksum >> 8
+    return bytes(data)
+
+
+def load(data):
+    return start(sd_files={"robot_config.bin": data}).program
+
+
+def test_round_trip(program):
+    program.RobotState.update(
+        current_alliance_color=program.AllianceColor("BLUE"),
+        starting_side=program.Side("LEFT"),
+        auton_mode="PLAYBACK",
+        current_braking_mode=vex.HOLD,
+    )
+
+    loaded = load(saved_file(program))
+    state = loaded.RobotState.get()
+    assert str(state.current_alliance_color) == "BLUE"
+    assert str(state.starting_side) == "LEFT"
+    assert state.auton_mode == "PLAYBACK"
+    assert state.current_braking_mode == vex.HOLD
+
+
+def test_colors_and_sides_use_their_codes(program):
+    for color in program.AllianceColor.NAMES:
+        for side in program.Side.NAMES:
+            program.RobotState.update(current_alliance_color=program.AllianceColor(color), starting_side=program.Side(side))
+            data = saved_file(program)
+            assert data[4] == program.AllianceColor(color).code
+            assert data[5] == program.Side(side).code
+            state = load(data).RobotState.get()
+            assert str(state.current_alliance_color) == color
+            assert str(state.starting_side) == side
+
+
+def test_recording_is_not_saved(program):
+    program.RobotState.update(recording_enabled=True)
+    assert load(saved_file(program)).RobotState.get().recording_enabled is False
+
+
+def assert_defaults(loaded, defaults):
+    state = loaded.RobotState.get()
+    assert str(state.current_alliance_color) == str(defaults.current_alliance_color)
+    assert state.auton_mode == defaults.auton_mode
+
+
+def test_corrupt_file_uses_defaults(program):
+    defaults = program.RobotState.get()
+    program.RobotState.update(auton_mode="SIMPLE")
+    data = bytearray(saved_file(program))
+    data[6] ^= 0x01
+    assert_defaults(load(bytes(data)), defaults)
+
+
+def test_truncated_file_uses_defaults(program):
+    defaults = program.RobotState.get()
+    program.RobotState.update(auton_mode="SIMPLE")
+    assert_defaults(load(saved_file(program)[:-3]), defaults)
+
+
+def test_unknown_version_uses_defaults(program):
+    defaults = program.RobotState.get()
+    program.RobotState.update(auton_mode="SIMPLE")
+    data = bytearray(saved_file(program))
+    data[2] = program.ConfigStore.VERSION + 1
+    assert_defaults(load(with_checksum(program, data)), defaults)
+
+
+def test_out_of_range_value_uses_defaults(program):
+    defaults = program.RobotState.get()
+    data = bytearray(saved_file(program))
+    data[4] = len(program.AllianceColor.NAMES)
+    assert_defaults(load(with_checksum(program, data)), defaults)
@@ -0,0 +1,84 @@
+"""Routine steps: they reset their per-run state, since routines are built once and run again, and never block."""
+
+from sim.harness import Simulation
+import vex
+
+
+def run(sim, step, limit_ms=10000):
+    step.start()
+    run_until_done(sim, step, limit_ms)
+
+
+def run_until_done(sim, step, limit_ms=10000):
+    elapsed = 0
+    while not step.update():
+        sim.advance(10)
+        elapsed += 10
+        assert elapsed < limit_ms
+    step.finish()
+
+
+def test_turn_timeout_is_cleared_on_the_next_run(sim, program):
+    step = program.Turn(180, speed=50, timeout_ms=50)
+    run(sim, step)
+    assert step.timed_out
+
+    step.timeout_ms = 5000
+    step.start()
+    assert not step.timed_out  # A run cut off by the field before finish() must not report the old timeout
+    while not step.update():
+        sim.advance(10)
+    step.finish()
+    assert not step.timed_out
+
+
+def test_drive_timeout_is_cleared_on_the_next_run(program):
+    step = program.Drive(100, 0)
+    step.timed_out = True
+    step.start()
+    assert not step.timed_out
+    program.drivetrain.stop()
+
+
+def test_wait_until_restarts_its_timer(sim, program):
+    class Never:
+        def reset(self):
+            pass
+
+        def is_met(self):
+            return False
+
+    step = program.WaitUntil(Never(), timeout_ms=100)
+    run(sim, step)
+    assert step.timed_out
+    sim.advance(500)
+    step.start()
+    assert not step.timed_out
+    assert not step.update()  # Timed from this start, not the last one
+
+
+def test_turn_waits_for_calibration_without_blocking():
+    sim = Simulation()
+    program = sim.load()  # The inertial sensor is still calibrating
+    assert not program.Sensors.is_heading_ready()
+
+    step = program.Turn(90, timeout_ms=5000)
+    started_at = sim.now_ms
+    step.start()
+    assert sim.now_ms == started_at
+    assert not step.update()
+    assert program.Motors.left_motor_group.velocity(vex.PERCENT) == 0
+
+    run_until_done(sim, step)
+    assert program.Sensors.is_heading_ready()
+    assert not step.timed_out
+
+
+def test_turn_times_out_while_waiting_for_calibration():
+    sim = Simulation()
+    program = sim.load()
+    step = program.Turn(90, timeout_ms=100)
+    step.start()
+    run_until_done(sim, step)
+    assert step.timed_out
+    assert not program.drivetrain.movement_override
@@ -0,0 +1,141 @@
+"""Scheduler timer wheel: timing, wraparound, a full wheel and cancelling. Ticked by hand, outside the control loops."""
+
+import pytest
+
+
+class Calls:
+    def __init__(self, sim):
+        self.sim = sim
+        self.times = []
+
+    def __call__(self):
+        self.times.append(self.sim.now_ms)
+
+
+def advance_ticking(sim, duration_ms, step_ms=10):
+    for _ in range(duration_ms // step_ms):
+        sim.advance(step_ms)
+        sim.program.Scheduler.tick()
+
+
+def fill(scheduler):
+    """Schedule far-off actions until the wheel is full. Returns them."""
+    entries = []
+    while True:
+        entry = scheduler.schedule(60000, lambda: None)
+        if entry is None:
+            return entries
+        entries.append(entry)
+
+
+@pytest.fixture
+def scheduler(program):
+    return program.Scheduler
+
+
+def test_runs_after_delay(sim, scheduler):
+    calls = Calls(sim)
+    start = sim.now_ms
+    scheduler.schedule(100, calls)
+    advance_ticking(sim, 90)
+    assert calls.times == []
+    advance_ticking(sim, 30)
+    assert len(calls.times) == 1
+    assert 100 <= calls.times[0] - start <= 110
+
+
+def test_delay_longer_than_one_revolution(sim, program, scheduler):
+    settings = program.SchedulerSettings
+    delay = settings.SLOT_MS * settings.SLOT_COUNT * 2 + 50
+    calls = Calls(sim)
+    start = sim.now_ms
+    scheduler.schedule(delay, calls)
+    advance_ticking(sim, delay - 20)
+    assert calls.times == []
+    advance_ticking(sim, 40)
+    assert len(calls.times) == 1
+    assert calls.times[0] - start >= delay
+
+
+def test_runs_after_a_long_gap_between_ticks(sim, scheduler):
+    calls = Calls(sim)
+    scheduler.schedule(100, calls)
+    scheduler.tick()
+    sim.advance(3000)
+    scheduler.tick()
+    assert len(calls.times) == 1
+
+
+def test_full_wheel(sim, program, scheduler):
+    free = len(scheduler._free_entries)
+    entries = fill(scheduler)
+    assert len(entries) == free
+    assert scheduler.schedule(10, Calls(sim)) is None
+
+    for entry in entries:
+        scheduler.cancel(entry)
+    assert len(scheduler._free_entries) == free
+    calls = Calls(sim)
+    assert scheduler.schedule(10, calls) is not None
+    advance_ticking(sim, 30)
+    assert len(calls.times) == 1
+
+
+def test_cancel(sim, scheduler):
+    free = len(scheduler._free_entries)
+    calls = Calls(sim)
+    entry = scheduler.schedule(100, calls)
+    scheduler.cancel(entry)
+    assert len(scheduler._free_entries) == free  # Returned to the pool straight away, not when its slot comes up
+    scheduler.cancel(entry)
+    assert len(scheduler._free_entries) == free
+    advance_ticking(sim, 200)
+    assert calls.times == []
+
+
+def test_cancel_from_an_action_in_the_same_slot(sim, scheduler):
+    free = len(scheduler._free_entries)
+    later = Calls(sim)
+    entries = []
+
+    def cancel_other():
+        scheduler.cancel(entries[1])
+
+    entries.append(scheduler.schedule(50, cancel_other))
+    entries.append(scheduler.schedule(50, later))
+    advance_ticking(sim, 100)
+    assert later.times == []
+    assert len(scheduler._free_entries) == free
+
+
+@pytest.fixture
+def descorer(program):
+    return program.Solenoids.descorer_solenoid
+
+
+def test_descorer_closes_after_retrigger(sim, program, scheduler, descorer):
+    program.DriverControl.trigger_descorer()
+    advance_ticking(sim, 300)
+    program.DriverControl.trigger_descorer()
+    advance_ticking(sim, 300)
+    assert descorer.value()  # The second press restarted the 500 ms
+    advance_ticking(sim, 300)
+    assert not descorer.value()
+
+
+def test_descorer_keeps_its_close_when_the_wheel_is_full(sim, program, scheduler, descorer):
+    program.DriverControl.trigger_descorer()
+    entries = fill(scheduler)
+    program.DriverControl.trigger_descorer()
+    advance_ticking(sim, 600)
+    assert not descorer.value()
+    for entry in entries:
+        scheduler.cancel(entry)
+
+
+def test_descorer_closes_at_once_when_the_wheel_is_full(sim, program, scheduler, descorer):
+    entries = fill(scheduler)
+    program.DriverControl.trigger_descorer()
+    assert not descorer.value()
+    for entry in entries:
+        scheduler.cancel(entry)
@@ -0,0 +1,14 @@
+"""Startup profile: every phase is reported once the inertial sensor is calibrated."""
+
+import vex
+
+
+def test_profile_saved_to_sd_card(sim, program):
+    data = vex.state().sd_files[program.Startup.FILENAME].decode()
+    lines = data.strip().split("\n")
+    assert lines[0] == "phase,end_ms,duration_ms,heap_bytes"
+    phases = [line.split(",")[0] for line in lines[1:]]
+    assert phases == [name for name, _, _ in program.Startup.phase_times]
+    assert "Config load" in phases
+    assert "Inertial calibrated" in phases
+
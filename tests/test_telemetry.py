@@ -0,0 +1,106 @@
+"""Telemetry frames written by the robot decode with tools/telemetry.py."""
+
+import io
+import os
+import sys
+
+from conftest import REPO_ROOT, start
+
+TOOLS_DIR = os.path.join(REPO_ROOT, "tools")
+if TOOLS_DIR not in sys.path:
+    sys.path.insert(0, TOOLS_DIR)
+
+import telemetry  # noqa: E402
+
+
+def decode(serial):
+    decoder = telemetry.TelemetryDecoder()
+    return decoder, decoder.feed(serial.getvalue())
+
+
+def test_round_trip():
+    serial = io.BytesIO()
+    sim = start(serial=serial)
+    program = sim.program
+    sim.run_autonomous(2000)
+    program.logger.warning("Test message")
+    sim.advance(500)
+
+    decoder, frames = decode(serial)
+    assert decoder.bad_frames == 0
+    assert decoder.lost_frames == 0
+    assert decoder.unknown_samples == 0
+
+    channels = [frame for frame in frames if frame.kind == telemetry.CHANNELS]
+    assert channels
+    assert [name for name, _ in channels[0].data] == list(program.TelemetrySettings.CHANNELS)
+
+    samples = [frame for frame in frames if frame.kind == telemetry.SAMPLE]
+    assert len(samples) > 10
+    assert all(len(frame.data) == len(program.TelemetrySettings.CHANNELS) for frame in samples)
+    times = [frame.time_ms for frame in frames]
+    assert times == sorted(times)
+
+    logs = [frame.data for frame in frames if frame.kind == telemetry.LOG]
+    assert logs[0] == (program.LogLevel.INFO, "Logger initialized")
+    assert (program.LogLevel.WARNING, "Test message") in logs
+
+
+def test_long_message_is_truncated():
+    serial = io.BytesIO()
+    sim = start(serial=serial)
+    program = sim.program
+    program.logger.info("x" * 500)
+    sim.advance(500)
+
+    decoder, frames = decode(serial)
+    assert decoder.bad_frames == 0
+    logs = [frame.data[1] for frame in frames if frame.kind == telemetry.LOG]
+    size = program.TelemetryFrame.MAX_PAYLOAD - program.TelemetryFrame.FIELDS_SIZE - 1
+    assert "x" * size in logs
+
+
+def test_full_queue_drops_frames(program):
+    telemetry_class = program.Telemetry
+    dropped = telemetry_class.dropped_frames
+    for i in range(program.TelemetrySettings.QUEUE_SIZE + 5):
+        telemetry_class.log(program.LogLevel.INFO, "message " + str(i))
+    assert telemetry_class.dropped_frames > dropped
+    assert telemetry_class._count == program.TelemetrySettings.QUEUE_SIZE
+
+
+def test_nothing_queued_when_not_running(program):
+    telemetry_class = program.Telemetry
+    telemetry_class.running = False
+    sequence = telemetry_class._sequence
+    count = telemetry_class._count
+    program.logger.info("Not sent")
+    assert telemetry_class._sequence == sequence
+    assert telemetry_class._count == count
+
+
+def test_block_system_before_first_update():
+    serial = io.BytesIO()
+    sim = start(serial=serial)
+    program = sim.program
+    program.ensure_block_manipulation_system()  # Created, but not ticked yet
+    assert program.block_manipulation_system.get_state() is None
+    sim.advance(500)
+    assert program.Telemetry.running
+    assert sim.kernel.errors == []
+
+    decoder, frames = decode(serial)
+    index = [name for name, _ in decoder.channels].index("bms_state")
+    samples = [frame for frame in frames if frame.kind == telemetry.SAMPLE]
+    assert samples[-1].data[index] == 0
+
+
+def test_failing_channel_stops_telemetry(program, sim):
+    telemetry_class = program.Telemetry
+    telemetry_class._channels = (("broken", 1, lambda: 1 / 0),)
+    sim.advance(500)
+    assert not telemetry_class.running
+    assert sim.kernel.errors == []
+    count = telemetry_class._count
+    program.logger.info("Not queued")
+    assert telemetry_class._count == count
@@ -0,0 +1,339 @@
+"""Benchmark the control loop hot paths of src/main.py in the simulator.
+
+Each benchmark calls one function of the robot program repeatedly and reports
+the time per call, the device API calls it makes and the memory it allocates.
+Results can be saved as JSON and compared against a saved baseline; a slowdown
+beyond the threshold that is also more than MIN_REGRESSION_US fails the run
+(exit status 1). The floor keeps timer noise on the fastest benchmarks, a
+microsecond or two, from failing a run.
+
+Each timing round of a benchmark is followed by a round of a fixed reference
+workload, and comparisons use the median ratio of the two. A machine that is
+busier or clocked lower than when the baseline was saved slows both down, so
+the comparison isn't thrown off by it.
+
+Usage::
+
+    python tools/bench.py                                   # Print results
+    python tools/bench.py --output baseline.json            # Save results
+    python tools/bench.py --baseline baseline.json          # Compare, fail on >25% and >2 us slowdown
+    python tools/bench.py --baseline baseline.json --threshold 0.1 --output latest.json
+
+Times depend on the computer, so baselines should be recorded on the machine
+that compares against them. Device calls and allocations are deterministic.
+
+CPython can't count individual allocations, so the allocation figures come from
+tracemalloc: ``alloc_bytes`` is the most memory a call had allocated at once
+(its temporaries) and ``retained_bytes`` is what was still allocated after it
+returned.
+"""
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+import tracemalloc
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if REPO_ROOT not in sys.path:
+    sys.path.insert(0, REPO_ROOT)
+
+from sim.harness import Simulation  # noqa: E402
+import vex  # noqa: E402  (the simulated vex module, importable once sim.harness is loaded)
+
+DEFAULT_THRESHOLD = 0.25    # Fail if a benchmark is more than 25% slower than the baseline...
+MIN_REGRESSION_US = 2.0     # ...and more than this many microseconds slower per call
+WARMUP_CALLS = 50
+ROUNDS = 15                 # Timing rounds; the median round is reported
+MIN_ROUND_SEC = 0.05        # Each round runs enough calls to take at least this long
+RETRIES = 2                 # Times a benchmark that looks slower than the baseline is timed again
+STARTUP_MS = 3000           # Virtual time to let the program start (config screen shown, IMU calibrated)
+
+
+# =============================================================================
+# BENCHMARKS
+# =============================================================================
+
+def build_benchmarks(program, sim):
+    """Set up the robot program for benchmarking and return (name, function) pairs."""
+    program.ensure_block_manipulation_system()
+    bms = program.block_manipulation_system
+    screen = program.config_screen
+    logger = program.logger
+    driver = program.DriverControl
+    settings = program.ControllerSettings
+    controller = sim.controller
+
+    # Driving forward and turning, intaking, with color rejection active
+    controller.axis3.set(80)
+    controller.axis1.set(30)
+    controller.get_button(settings.INTAKE_BUTTON).set(True)
+    program.RobotState.update(color_rejection_enabled=True)
+    bms.set_and_update_state(program.BlockManipulationSystem.State.INTAKING)
+
+    def driver_tick():
+        driver._update_drivetrain()
+        driver._update_block_manipulation_systems_state()
+        driver._update_thermal_readout()
+        program.Scheduler.tick()
+        program.DriveRecorder.record_tick(driver._forward, driver._strafe, driver._turn, bms.get_state())
+
+    def log_to(target):
+        def log():
+            logger._log_internal(program.LogLevel.INFO, "Benchmark message", target)
+        return log
+
+    def log_brain():
+        logger.brain_logging_enabled = True  # The configuration screen turns brain logging off
+        logger._log_internal(program.LogLevel.INFO, "Benchmark message", program.ScreenTarget.BRAIN)
+
+    def render_full():
+        screen.drawn_tab = None
+        screen.render()
+
+    def touch():
+        # The RED button on the main tab; the color is already RED, so only the redraw and save check run.
+        # The touch position is set directly; screen.touch() would also start the program's touch callback thread.
+        sim.brain.screen.touch_x = 360
+        sim.brain.screen.touch_y = 170
+        screen._touch_callback()
+
+    screen.current_tab = program.ConfigurationScreen.MainSettingsTab.NAME
+    screen.render()
+    program.RobotState.update(current_alliance_color=program.AllianceColor("RED"))
+
+    ScreenTarget = program.ScreenTarget
+    return [
+        ("driver.tick", driver_tick),
+        ("driver.update_drivetrain", driver._update_drivetrain),
+        ("driver.update_block_manipulation_systems_state", driver._update_block_manipulation_systems_state),
+        ("intaking.check_current_block", bms._intaking._check_current_block),
+        ("logger.log_internal.brain", log_brain),
+        ("logger.log_internal.controller", log_to(ScreenTarget.CONTROLLER)),
+        ("logger.log_internal.both", log_to(ScreenTarget.BOTH)),
+        ("config_screen.render", screen.render),
+        ("config_screen.render_full", render_full),
+        ("config_screen.touch_callback", touch),
+    ]
+
+
+# =============================================================================
+# MEASUREMENT
+# =============================================================================
+
+class _Reference:
+    """Fixed pure Python workload: attribute reads, method calls and arithmetic, like the robot program."""
+
+    def __init__(self):
+        self.values = list(range(16))
+        self.total = 0
+
+    def step(self, value):
+        return value * 3 % 7
+
+    def run(self):
+        total = 0
+        for value in self.values:
+            total += self.step(value)
+        self.total = total
+
+
+_reference = _Reference().run
+
+
+def calls_per_round(function):
+    """Find a call count that makes one round take at least MIN_ROUND_SEC"""
+    calls = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(calls):
+            function()
+        if time.perf_counter() - start >= MIN_ROUND_SEC:
+            return calls
+        calls *= 2
+
+
+def time_round(function, calls):
+    start = time.perf_counter()
+    for _ in range(calls):
+        function()
+    return (time.perf_counter() - start) / calls
+
+
+def time_per_call(function):
+    """Time a function, alternating its rounds with rounds of the reference workload.
+
+    Returns:
+        (median time per call in microseconds, median ratio of the function's time to the reference's)
+    """
+    for _ in range(WARMUP_CALLS):
+        function()
+    calls = calls_per_round(function)
+    reference_calls = calls_per_round(_reference)
+
+    times = []
+    ratios = []
+    for _ in range(ROUNDS):
+        elapsed = time_round(function, calls)
+        times.append(elapsed)
+        ratios.append(elapsed / time_round(_reference, reference_calls))
+    return statistics.median(times) * 1e6, statistics.median(ratios)
+
+
+def count_per_call(function, calls=100):
+    """Count device calls and allocations per call, averaged over ``calls`` calls."""
+    sim_state = vex.state()
+    device_calls = sim_state.device_calls
+    for _ in range(calls):
+        function()
+    device_calls = (sim_state.device_calls - device_calls) / calls
+
+    alloc_bytes = 0
+    retained_bytes = 0
+    tracemalloc.start()
+    try:
+        for _ in range(calls):
+            before = tracemalloc.get_traced_memory()[0]
+            tracemalloc.reset_peak()
+            function()
+            current, peak = tracemalloc.get_traced_memory()
+            alloc_bytes += peak - before
+            retained_bytes += current - before
+    finally:
+        tracemalloc.stop()
+    return device_calls, alloc_bytes / calls, retained_bytes / calls
+
+
+def change_from(result, base):
+    """Slowdown from a baseline result: (fractional change, microseconds per call).
+
+    The change is measured relative to the reference workload; the baseline
+    time is scaled by the same factor to get the difference in microseconds.
+    """
+    change = result["relative"] / base["relative"] - 1.0 if base.get("relative") else 0.0
+    expected_us = result["us_per_call"] / (1.0 + change)
+    return change, result["us_per_call"] - expected_us
+
+
+def is_regression(result, base, threshold, min_us=MIN_REGRESSION_US):
+    """Whether a result is slower than the baseline by more than both the threshold and min_us"""
+    change, change_us = change_from(result, base)
+    return change > threshold and change_us > min_us
+
+
+def run_benchmarks(names=None, baseline=None, threshold=DEFAULT_THRESHOLD, min_us=MIN_REGRESSION_US):
+    """Run the benchmarks (all, or those whose name starts with one of ``names``) and return the results.
+
+    Benchmarks that look slower than ``baseline`` are timed again (up to RETRIES
+    times) and the best result is kept, so one noisy run doesn't fail the run.
+    """
+    base_benchmarks = baseline.get("benchmarks", {}) if baseline else {}
+    sim = Simulation()
+    program = sim.load()
+    sim.advance(STARTUP_MS)
+
+    results = {}
+    for name, function in build_benchmarks(program, sim):
+        if names and not any(name.startswith(n) for n in names):
+            continue
+        device_calls, alloc_bytes, retained_bytes = count_per_call(function)
+        us_per_call, relative = time_per_call(function)
+        result = {"us_per_call": round(us_per_call, 3), "relative": round(relative, 4)}
+        base = base_benchmarks.get(name)
+        if base is not None:
+            for _ in range(RETRIES):
+                if not is_regression(result, base, threshold, min_us):
+                    break
+                us_per_call, relative = time_per_call(function)
+                if relative < result["relative"]:
+                    result = {"us_per_call": round(us_per_call, 3), "relative": round(relative, 4)}
+        result.update({
+            "device_calls": round(device_calls, 2),
+            "alloc_bytes": round(alloc_bytes, 1),
+            "retained_bytes": round(retained_bytes, 1),
+        })
+        results[name] = result
+    if sim.kernel.errors:
+        raise RuntimeError("simulated threads crashed during the benchmark: " + repr(sim.kernel.errors))
+    return {
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "benchmarks": results,
+    }
+
+
+def compare(results, baseline, threshold, min_us=MIN_REGRESSION_US):
+    """Compare results with a baseline. Returns the names of benchmarks slower by more than ``threshold`` and
+    ``min_us``."""
+    regressions = []
+    base_benchmarks = baseline.get("benchmarks", {})
+    for name, result in results["benchmarks"].items():
+        base = base_benchmarks.get(name)
+        if base is None:
+            continue
+        if "relative" not in base:
+            continue  # Saved by an older version of this tool
+        change, _ = change_from(result, base)
+        if is_regression(result, base, threshold, min_us):
+            regressions.append(name)
+        result["change"] = round(change, 3)
+        result["baseline_us_per_call"] = base["us_per_call"]
+    return regressions
+
+
+def print_results(results, regressions=()):
+    width = max(len(name) for name in results["benchmarks"]) if results["benchmarks"] else 10
+    print(name_column("benchmark", width) + "     us/call  change  dev calls  alloc B  retain B")
+    for name, result in results["benchmarks"].items():
+        change = result.get("change")
+        change_text = "" if change is None else ("%+.0f%%" % (change * 100))
+        flag = "  SLOWER" if name in regressions else ""
+        print(name_column(name, width) + "%12.2f  %6s  %9.1f  %7.0f  %8.0f%s" % (
+            result["us_per_call"], change_text, result["device_calls"], result["alloc_bytes"],
+            result["retained_bytes"], flag))
+
+
+def name_column(text, width):
+    return text + " " * (width - len(text))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("names", nargs="*", help="only run benchmarks whose name starts with one of these")
+    parser.add_argument("--output", help="save the results to this JSON file")
+    parser.add_argument("--baseline", help="compare against results saved with --output")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="fractional slowdown that fails the run (default %(default)s)")
+    parser.add_argument("--min-us", type=float, default=MIN_REGRESSION_US,
+                        help="smallest slowdown per call in microseconds that fails the run (default %(default)s)")
+    args = parser.parse_args(argv)
+
+    baseline = None
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+
+    results = run_benchmarks(args.names, baseline, args.threshold, args.min_us)
+
+    regressions = []
+    if baseline is not None:
+        regressions = compare(results, baseline, args.threshold, args.min_us)
+    print_results(results, regressions)
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2, sort_keys=True)
+            f.write("\n")
+
+    if regressions:
+        print("\n" + str(len(regressions)) + " benchmark(s) slower than the baseline by more than "
+              + str(int(args.threshold * 100)) + "% and " + str(args.min_us) + " us: " + ", ".join(regressions))
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
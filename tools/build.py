@@ -0,0 +1,318 @@
+"""Build the deployable robot program from src/main.py.
+
+The build removes docstrings, comments and type annotations, replaces reads of
+the ControllerSettings and DrivetrainSettings constants with their values,
+and writes the result with one space per indent level. The output is then run
+in the simulator next to the source (same matches, same inputs) and every
+device call, serial byte, SD card file and the final field state must match.
+
+Usage::
+
+    python tools/build.py                           # Write build/main.py, check it, report the savings
+    python tools/build.py --output deploy/main.py
+    python tools/build.py --no-check                # Skip the simulator check
+
+To upload the build, point "main" in .vscode/vex_project_settings.json at
+build/main.py (or copy it over the project's main file on a deploy branch).
+
+Settings that the program changes at run time are not folded: anything
+assigned outside its class, and anything named in a string (it may be read
+or set by name with getattr or setattr). Tools that change settings on a loaded
+program (``montecarlo.py --set``) should use the source, since folded values
+can't be changed after the build.
+"""
+
+import argparse
+import ast
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+TOOLS_DIR = os.path.dirname(os.path.abspath(__file__))
+for path in (REPO_ROOT, TOOLS_DIR):
+    if path not in sys.path:
+        sys.path.insert(0, path)
+
+from sim.harness import MAIN_PATH, Simulation, compile_program  # noqa: E402
+from latency import control_inputs, random_trace  # noqa: E402
+import vex  # noqa: E402  (the simulated vex module, importable once sim.harness is loaded)
+
+DEFAULT_OUTPUT = os.path.join(REPO_ROOT, "build", "main.py")
+FOLDED_CLASSES = ("ControllerSettings", "DrivetrainSettings")
+
+STARTUP_MS = 3000
+CHECK_DRIVER_MS = 30000
+# Configuration screen taps before each checked match: Other Configs tab, auton mode, Main tab, RED
+CONFIG_TOUCHES = ((240, 15), (240, 95), (80, 15), (360, 170))
+
+
+# =============================================================================
+# TRANSFORMS
+# =============================================================================
+
+class _Stripper(ast.NodeTransformer):
+    """Removes docstrings (and any other bare string statements) and type annotations."""
+
+    def generic_visit(self, node):
+        super().generic_visit(node)
+        if "body" in node._fields and isinstance(node.body, list) and not node.body:
+            node.body.append(ast.Pass())
+        return node
+
+    def visit_Expr(self, node):
+        if isinstance(node.value, ast.Constant) and isinstance(node.value.value, str):
+            return None
+        return self.generic_visit(node)
+
+    def visit_FunctionDef(self, node):
+        node.returns = None
+        arguments = node.args
+        for arg in arguments.posonlyargs + arguments.args + arguments.kwonlyargs:
+            arg.annotation = None
+        for arg in (arguments.vararg, arguments.kwarg):
+            if arg is not None:
+                arg.annotation = None
+        return self.generic_visit(node)
+
+    def visit_AnnAssign(self, node):
+        if node.value is None:
+            return None  # A bare annotation declares nothing at run time
+        return ast.copy_location(ast.Assign(targets=[node.target], value=self.visit(node.value)), node)
+
+
+class _SettingsFolder(ast.NodeTransformer):
+    """Replaces ``Class.ATTRIBUTE`` reads with the constant's value."""
+
+    def __init__(self, constants):
+        self.constants = constants  # (class name, attribute) -> value
+        self.folded = 0
+
+    def visit_Attribute(self, node):
+        if isinstance(node.ctx, ast.Load) and isinstance(node.value, ast.Name):
+            key = (node.value.id, node.attr)
+            if key in self.constants:
+                self.folded += 1
+                return ast.copy_location(ast.Constant(self.constants[key]), node)
+        return self.generic_visit(node)
+
+
+def foldable_constants(tree, class_names):
+    """Find the literal class attributes of ``class_names`` that are never changed at run time.
+
+    Returns:
+        ({(class name, attribute): value}, [attributes left alone because they may change])
+    """
+    names_in_strings = set()
+    assigned = set()
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Constant) and isinstance(node.value, str):
+            names_in_strings.add(node.value)
+        elif isinstance(node, ast.Attribute) and isinstance(node.ctx, (ast.Store, ast.Del)) \
+                and isinstance(node.value, ast.Name):
+            assigned.add((node.value.id, node.attr))
+
+    constants = {}
+    kept = []
+    for node in tree.body:
+        if not isinstance(node, ast.ClassDef) or node.name not in class_names:
+            continue
+        for statement in node.body:
+            if not isinstance(statement, ast.Assign) or len(statement.targets) != 1 \
+                    or not isinstance(statement.targets[0], ast.Name):
+                continue
+            attribute = statement.targets[0].id
+            try:
+                value = ast.literal_eval(statement.value)
+            except ValueError:
+                continue
+            if not isinstance(value, (bool, int, float, str)):
+                continue
+            if attribute in names_in_strings or (node.name, attribute) in assigned:
+                kept.append(node.name + "." + attribute)
+                continue
+            constants[(node.name, attribute)] = value
+    return constants, kept
+
+
+def reindent(text):
+    """Use one space per indent level. ast.unparse indents by four and writes strings on one line."""
+    lines = []
+    for line in text.split("\n"):
+        stripped = line.lstrip(" ")
+        lines.append(" " * ((len(line) - len(stripped)) // 4) + stripped)
+    return "\n".join(lines)
+
+
+def build(source):
+    """Build the deployable program from the source text. Returns (output text, build info)."""
+    tree = ast.parse(source)
+    tree = _Stripper().visit(tree)
+    constants, kept = foldable_constants(tree, FOLDED_CLASSES)
+    folder = _SettingsFolder(constants)
+    tree = ast.fix_missing_locations(folder.visit(tree))
+
+    output = reindent(ast.unparse(tree)) + "\n"
+    if ast.dump(ast.parse(output)) != ast.dump(tree):
+        raise RuntimeError("the reindented output doesn't parse back to the same program")
+    return output, {"constants": len(constants), "folded_reads": folder.folded, "kept": kept}
+
+
+# =============================================================================
+# SIMULATOR CHECK
+# =============================================================================
+
+def run_scenario(code, side, trace, sd_files):
+    """Run one match and return everything observable: device calls, serial output, SD card and field state."""
+    serial = _Sink()
+    sim = Simulation(serial=serial, sd_files=sd_files)
+    vex.state().call_log = []
+    program = sim.load(code=code)
+    program.RobotState.update(starting_side=program.Side(side))
+    sim.advance(STARTUP_MS)
+    for x, y in CONFIG_TOUCHES:
+        sim.touch(x, y)
+        sim.advance(200)
+    sim.run_autonomous()
+    sim.run_driver_control(CHECK_DRIVER_MS, trace)
+    world = sim.world
+    return {
+        "device calls": vex.state().call_log,
+        "serial output": bytes(serial.data),
+        "SD card": dict(vex.state().sd_files),
+        "final pose": (world.x_mm, world.y_mm, world.heading_deg),
+        "blocks": (len(world.stored), len(world.scored)),
+        "crashed threads": [repr(error) for error in sim.kernel.errors],
+    }
+
+
+class _Sink:
+    def __init__(self):
+        self.data = bytearray()
+
+    def write(self, data):
+        self.data += data
+        return len(data)
+
+    def flush(self):
+        pass
+
+
+def first_difference(expected, actual):
+    """Describe the first difference between two scenario results, or return None if they match."""
+    for key in expected:
+        a, b = expected[key], actual[key]
+        if a == b:
+            continue
+        if isinstance(a, (list, bytes)):
+            for i, (x, y) in enumerate(zip(a, b)):
+                if x != y:
+                    return key + " differ at item " + str(i) + ": " + repr(x)[:200] + " != " + repr(y)[:200]
+            return key + " differ in length: " + str(len(a)) + " != " + str(len(b))
+        return key + " differ: " + repr(a)[:200] + " != " + repr(b)[:200]
+    return None
+
+
+def check(source_code, built_code, seed=1):
+    """Run the source and the build through the same matches. Returns a list of difference descriptions."""
+    program = Simulation().load(code=source_code)
+    trace = random_trace(control_inputs(program.ControllerSettings), 3, seed)
+    differences = []
+    sd_files = None
+    for side in ("LEFT", "RIGHT"):
+        # The second match starts from the SD card the first one saved, like a power cycle
+        expected = run_scenario(source_code, side, trace, sd_files)
+        actual = run_scenario(built_code, side, trace, sd_files)
+        difference = first_difference(expected, actual)
+        if difference is not None:
+            differences.append(side + " match: " + difference)
+        if expected["crashed threads"]:
+            differences.append(side + " match: threads crashed: " + ", ".join(expected["crashed threads"]))
+        sd_files = expected["SD card"]
+    return differences
+
+
+# =============================================================================
+# REPORT
+# =============================================================================
+
+def mpy_cross(path):
+    """Compile with mpy-cross if it is installed. Returns (milliseconds, .mpy size in bytes) or None."""
+    executable = shutil.which("mpy-cross")
+    if executable is None:
+        return None
+    with tempfile.TemporaryDirectory() as directory:
+        output = os.path.join(directory, "main.mpy")
+        start = time.perf_counter()
+        subprocess.run([executable, "-o", output, path], check=True)
+        elapsed = time.perf_counter() - start
+        return elapsed * 1000, os.path.getsize(output)
+
+
+def reduction(before, after):
+    return "%.0f%%" % ((1.0 - after / before) * 100) if before else "-"
+
+
+def print_report(source_path, source, output_path, output, info):
+    source_bytes = len(source.encode())
+    output_bytes = len(output.encode())
+    print("%-22s %12s %12s %10s" % ("", "source", "build", "reduction"))
+    print("%-22s %12d %12d %10s" % ("upload size (bytes)", source_bytes, output_bytes,
+                                    reduction(source_bytes, output_bytes)))
+    print("%-22s %12d %12d %10s" % ("lines", source.count("\n") + 1, output.count("\n"),
+                                    reduction(source.count("\n") + 1, output.count("\n"))))
+    source_mpy = mpy_cross(source_path)
+    if source_mpy is not None:
+        output_mpy = mpy_cross(output_path)
+        print("%-22s %12.1f %12.1f %10s" % ("mpy-cross time (ms)", source_mpy[0], output_mpy[0],
+                                            reduction(source_mpy[0], output_mpy[0])))
+        print("%-22s %12d %12d %10s" % (".mpy size (bytes)", source_mpy[1], output_mpy[1],
+                                        reduction(source_mpy[1], output_mpy[1])))
+    print()
+    print("Folded " + str(info["folded_reads"]) + " reads of " + str(info["constants"]) + " settings constants")
+    if info["kept"]:
+        print("Not folded (changed at run time): " + ", ".join(info["kept"]))
+    if source_mpy is None:
+        print("mpy-cross not found; compile time and .mpy size not measured.")
+
+
+# =============================================================================
+# MAIN
+# =============================================================================
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--source", default=MAIN_PATH, help="program to build (default src/main.py)")
+    parser.add_argument("--output", default=DEFAULT_OUTPUT, help="where to write the build (default build/main.py)")
+    parser.add_argument("--no-check", dest="check", action="store_false", help="skip the simulator check")
+    parser.add_argument("--seed", type=int, default=1, help="seed of the driver input trace used by the check")
+    args = parser.parse_args(argv)
+
+    with open(args.source, newline="") as f:
+        source = f.read()
+    output, info = build(source)
+
+    directory = os.path.dirname(os.path.abspath(args.output))
+    os.makedirs(directory, exist_ok=True)
+    with open(args.output, "w", newline="\n") as f:
+        f.write(output)
+    print("Wrote " + os.path.relpath(args.output))
+
+    if args.check:
+        differences = check(compile_program(args.source, source), compile_program(args.output, output), args.seed)
+        if differences:
+            print("The build behaves differently from the source in the simulator:")
+            for difference in differences:
+                print("  " + difference)
+            return 1
+        print("Simulator check passed: the build matches the source in two matches")
+    print()
+    print_report(args.source, source, args.output, output, info)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
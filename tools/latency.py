@@ -0,0 +1,235 @@
+"""Measure input-to-actuation latency of driver control in the simulator.
+
+A timestamped controller input trace is replayed into driver control while the
+simulated ``vex`` module logs every device call. For each input change the
+harness finds the first motor or solenoid command that differs from the one
+before the input, and reports the latency distribution per control.
+
+Usage::
+
+    python tools/latency.py                         # Random trace, 40 changes per control
+    python tools/latency.py --events 100 --seed 3
+    python tools/latency.py --trace trace.json      # [[time_ms, control, value], ...]
+    python tools/latency.py --json latency.json
+
+In a trace, ``control`` is an axis number (1-4) or a button name as used in
+ControllerSettings ("R1", "X", ...) and ``value`` is the axis position or 1/0
+for pressed/released. Times are from the start of driver control.
+
+Device calls take no virtual time in the simulator, so the latencies come from
+the structure of the program: loop periods, callback threads, waits and the
+scheduler.
+"""
+
+import argparse
+import bisect
+import json
+import os
+import random
+import sys
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if REPO_ROOT not in sys.path:
+    sys.path.insert(0, REPO_ROOT)
+
+from sim.harness import InputEvent, Simulation  # noqa: E402
+import vex  # noqa: E402  (the simulated vex module, importable once sim.harness is loaded)
+from vex import RobotGeometry  # noqa: E402
+
+STARTUP_MS = 3000           # Virtual time to let the program start before driver control
+TRACE_START_MS = 1000       # First input change, after driver control has settled
+RESPONSE_WINDOW_MS = 500    # Input changes with no matching command within this time count as missed
+COMMANDS = ("spin", "spin_for", "stop", "open", "close")
+
+
+def motors(*ports):
+    return tuple("motor" + str(port) for port in ports)
+
+
+DRIVE_MOTORS = motors(*(RobotGeometry.LEFT_DRIVE_PORTS + RobotGeometry.RIGHT_DRIVE_PORTS))
+STRAFE_MOTORS = motors(*RobotGeometry.STRAFE_PORTS)
+INTAKE_MOTORS = motors(RobotGeometry.BOTTOM_INTAKE_PORT, RobotGeometry.TOP_INTAKE_PORT, RobotGeometry.UNLOADING_PORT)
+
+# Measured controls: name -> (ControllerSettings attribute, devices it commands, whether releasing it commands them,
+# value used when generating a trace)
+CONTROLS = {
+    "forward": ("FORWARD_BACKWARD_AXIS", DRIVE_MOTORS, True, 80),
+    "turn": ("TURN_AXIS", DRIVE_MOTORS, True, 60),
+    "strafe": ("STRAFE_RIGHT_BUTTON", STRAFE_MOTORS, True, 1),
+    "intake": ("INTAKE_BUTTON", INTAKE_MOTORS, True, 1),
+    "output low": ("OUTPUT_LOW_BUTTON", INTAKE_MOTORS, True, 1),
+    "output medium": ("OUTPUT_MEDIUM_BUTTON", INTAKE_MOTORS, True, 1),
+    "output high": ("OUTPUT_HIGH_BUTTON", INTAKE_MOTORS, True, 1),
+    "descorer": ("DESCORER_TRIGGER_BUTTON", ("pneumatics.f",), False, 1),
+    "match load unloader": ("MATCH_LOAD_UNLOADER_TOGGLE_BUTTON", ("pneumatics.c",), False, 1),
+}
+
+
+# =============================================================================
+# TRACES
+# =============================================================================
+
+def control_inputs(settings):
+    """Map each measured control name to its controller input (axis number or button name)."""
+    return {name: getattr(settings, spec[0]) for name, spec in CONTROLS.items()}
+
+
+def random_trace(inputs, events_per_control, seed):
+    """Press and release (or move and centre) each control in a random order at random times.
+
+    Only one control is active at a time, and times fall anywhere within the
+    driver loop period, so the trace samples every phase of the loop.
+    """
+    rng = random.Random(seed)
+    order = [name for name in CONTROLS for _ in range(events_per_control)]
+    rng.shuffle(order)
+    trace = []
+    time_ms = TRACE_START_MS
+    for name in order:
+        value = CONTROLS[name][3]
+        trace.append(InputEvent(round(time_ms, 2), inputs[name], value))
+        time_ms += rng.uniform(150, 400)
+        trace.append(InputEvent(round(time_ms, 2), inputs[name], 0))
+        time_ms += rng.uniform(600, 900)
+    return trace
+
+
+def load_trace(path):
+    with open(path) as f:
+        return [InputEvent(time_ms, control, value) for time_ms, control, value in json.load(f)]
+
+
+# =============================================================================
+# MEASUREMENT
+# =============================================================================
+
+def run_trace(trace=None, events_per_control=40, seed=1):
+    """Replay a trace (or a random one if None) into driver control.
+
+    Returns:
+        (trace, driver control start time, device call log, control inputs)
+    """
+    sim = Simulation()
+    program = sim.load()
+    inputs = control_inputs(program.ControllerSettings)
+    if trace is None:
+        trace = random_trace(inputs, events_per_control, seed)
+    sim.advance(STARTUP_MS)
+    vex.state().call_log = []
+    start_ms = sim.now_ms
+    duration = max(event.time_ms for event in trace) + RESPONSE_WINDOW_MS if trace else 0
+    sim.run_driver_control(duration, trace)
+    if sim.kernel.errors:
+        raise RuntimeError("simulated threads crashed during the run: " + repr(sim.kernel.errors))
+    return trace, start_ms, vex.state().call_log, inputs
+
+
+def command_history(call_log):
+    """Group the actuation commands in a call log by device: device -> (times, commands)."""
+    history = {}
+    for time_ms, device, method, args in call_log:
+        if method not in COMMANDS:
+            continue
+        times, commands = history.setdefault(device, ([], []))
+        times.append(time_ms)
+        commands.append((method, args))
+    return history
+
+
+def response_time(history, devices, time_ms):
+    """Time of the first command on any of ``devices`` at or after ``time_ms`` that changes what it was told."""
+    first = None
+    for device in devices:
+        times, commands = history.get(device, ((), ()))
+        i = bisect.bisect_left(times, time_ms)
+        previous = commands[i - 1] if i > 0 else None
+        while i < len(times) and times[i] - time_ms <= RESPONSE_WINDOW_MS:
+            if commands[i] != previous:
+                if first is None or times[i] < first:
+                    first = times[i]
+                break
+            i += 1
+    return first
+
+
+def measure(trace=None, events_per_control=40, seed=1):
+    """Replay a trace (or a random one if None) and return {control name: (latencies in ms, missed count)}."""
+    trace, start_ms, call_log, inputs = run_trace(trace, events_per_control, seed)
+    history = command_history(call_log)
+    by_input = {control_input: name for name, control_input in inputs.items()}
+
+    results = {name: ([], 0) for name in CONTROLS}
+    last_value = {}
+    for event in sorted(trace, key=lambda e: e.time_ms):
+        name = by_input.get(event.control)
+        previous = last_value.get(event.control, 0)
+        last_value[event.control] = event.value
+        if name is None or event.value == previous:
+            continue
+        _, devices, on_release, _ = CONTROLS[name]
+        if not event.value and not on_release:
+            continue
+        time_ms = start_ms + event.time_ms
+        latencies, missed = results[name]
+        response = response_time(history, devices, time_ms)
+        if response is None:
+            results[name] = (latencies, missed + 1)
+        else:
+            latencies.append(response - time_ms)
+    return results
+
+
+def percentile(sorted_values, fraction):
+    if not sorted_values:
+        return None
+    return sorted_values[min(len(sorted_values) - 1, int(fraction * len(sorted_values)))]
+
+
+def summarize(results):
+    summary = {}
+    for name, (latencies, missed) in results.items():
+        values = sorted(latencies)
+        if not values and not missed:
+            continue
+        summary[name] = {
+            "count": len(values),
+            "missed": missed,
+            "min_ms": values[0] if values else None,
+            "median_ms": percentile(values, 0.5),
+            "p90_ms": percentile(values, 0.9),
+            "max_ms": values[-1] if values else None,
+            "mean_ms": round(sum(values) / len(values), 2) if values else None,
+        }
+    return summary
+
+
+def print_summary(summary):
+    width = max([len(name) for name in summary] + [7])
+    print("control" + " " * (width - 7) + "  count  missed     min  median     p90     max    mean")
+    for name, row in summary.items():
+        cells = []
+        for key in ("min_ms", "median_ms", "p90_ms", "max_ms", "mean_ms"):
+            cells.append("       -" if row[key] is None else "%8.1f" % row[key])
+        print(name + " " * (width - len(name)) + "  %5d  %6d" % (row["count"], row["missed"]) + "".join(cells))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--trace", help="JSON input trace to replay instead of a random one")
+    parser.add_argument("--events", type=int, default=40, help="changes per control in the random trace")
+    parser.add_argument("--seed", type=int, default=1, help="random trace seed")
+    parser.add_argument("--json", help="save the summary to this JSON file")
+    args = parser.parse_args(argv)
+
+    trace = load_trace(args.trace) if args.trace else None
+    summary = summarize(measure(trace, args.events, args.seed))
+    print_summary(summary)
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(summary, f, indent=2)
+            f.write("\n")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,258 @@
+"""Monte Carlo evaluation of the autonomous routines under randomized noise.
+
+Each run loads src/main.py in a fresh simulation with randomized wheel slip,
+inertial drift, battery sag and optical sensor noise (``Noise.randomized``),
+runs the complex autonomous routine for the chosen starting side and records
+the final pose, the completion time and which steps timed out. Runs are spread
+over a process pool, one per CPU core by default.
+
+Usage::
+
+    python tools/montecarlo.py --runs 2000                  # Both sides
+    python tools/montecarlo.py --side RIGHT --scale 1.5     # Wider noise
+    python tools/montecarlo.py --set AutonSettings.OUTPUT_TIMEOUT_MS=1500 --json right.json
+    python tools/montecarlo.py --runs 500 --csv runs.csv    # One row per run
+
+``--set`` changes a setting (a class attribute of the robot program) before the
+program starts, so speeds and tolerances can be compared without field time.
+Runs are reproducible: run ``i`` uses noise drawn from seed ``seed + i``.
+"""
+
+import argparse
+import csv
+import json
+import math
+import multiprocessing
+import os
+import random
+import sys
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if REPO_ROOT not in sys.path:
+    sys.path.insert(0, REPO_ROOT)
+
+from sim.harness import AUTONOMOUS_MS, Simulation, compile_program  # noqa: E402
+from vex import Noise  # noqa: E402
+
+STARTUP_MS = 3000           # Virtual time to let the program start (IMU calibrated, routines prepared)
+TASKS_PER_WORKER = 50       # Worker processes are replaced after this many runs to keep memory flat
+
+_code = None                # The compiled robot program, compiled once per worker process
+
+
+# =============================================================================
+# SINGLE RUN
+# =============================================================================
+
+def parse_setting(text):
+    """Parse "Class.ATTRIBUTE=value" into (class name, attribute, value)."""
+    target, _, value = text.partition("=")
+    class_name, _, attribute = target.partition(".")
+    if not class_name or not attribute or not value:
+        raise argparse.ArgumentTypeError("expected Class.ATTRIBUTE=value, got " + repr(text))
+    try:
+        value = json.loads(value)
+    except ValueError:
+        pass  # Plain strings don't need quotes
+    return class_name, attribute, value
+
+
+def run_once(job):
+    """Run one autonomous period. ``job`` is (run index, side, seed, noise scale, settings)."""
+    global _code
+    index, side, seed, scale, settings = job
+    if _code is None:
+        _code = compile_program()
+
+    noise = Noise.randomized(random.Random(seed), scale)
+    sim = Simulation(noise=noise)
+    program = sim.load(code=_code)
+    for class_name, attribute, value in settings:
+        target = getattr(program, class_name, None)
+        if target is None or not hasattr(target, attribute):
+            raise ValueError("Unknown setting: " + class_name + "." + attribute)
+        setattr(target, attribute, value)
+    program.RobotState.update(auton_mode="COMPLEX", starting_side=program.Side(side))
+    sim.advance(STARTUP_MS)
+    sim.run_autonomous()
+
+    profiler = program.AutonProfiler
+    timed_out = [profiler._steps[i].name for i in range(profiler._count) if profiler._steps[i].timed_out]
+    world = sim.world
+    return {
+        "run": index,
+        "side": side,
+        "seed": seed,
+        "completed": profiler._ended,
+        "time_ms": profiler._end_time - profiler._start_time if profiler._ended else AUTONOMOUS_MS,
+        "timeouts": len(timed_out),
+        "timed_out_steps": ";".join(timed_out),
+        "x_mm": round(world.x_mm, 1),
+        "y_mm": round(world.y_mm, 1),
+        "heading_deg": round(world.heading_deg, 2),
+        "blocks_stored": len(world.stored),
+        "blocks_scored": len(world.scored),
+        "crashed": bool(sim.kernel.errors),
+    }
+
+
+# =============================================================================
+# STATISTICS
+# =============================================================================
+
+def mean(values):
+    return sum(values) / len(values) if values else 0.0
+
+
+def std(values):
+    if len(values) < 2:
+        return 0.0
+    m = mean(values)
+    return math.sqrt(sum((v - m) ** 2 for v in values) / (len(values) - 1))
+
+
+def percentile(values, fraction):
+    values = sorted(values)
+    if not values:
+        return 0.0
+    return values[min(len(values) - 1, int(fraction * len(values)))]
+
+
+def heading_errors(headings):
+    """Signed differences (-180..180) from the circular mean heading."""
+    s = sum(math.sin(math.radians(h)) for h in headings)
+    c = sum(math.cos(math.radians(h)) for h in headings)
+    centre = math.degrees(math.atan2(s, c))
+    return centre % 360.0, [(h - centre + 180.0) % 360.0 - 180.0 for h in headings]
+
+
+def summarize(runs):
+    """Summarize the runs for one starting side."""
+    xs = [r["x_mm"] for r in runs]
+    ys = [r["y_mm"] for r in runs]
+    mean_heading, heading_error = heading_errors([r["heading_deg"] for r in runs])
+    mean_x, mean_y = mean(xs), mean(ys)
+    distances = [math.hypot(x - mean_x, y - mean_y) for x, y in zip(xs, ys)]
+    completed_times = [r["time_ms"] for r in runs if r["completed"]]
+    step_timeouts = {}
+    for r in runs:
+        for name in filter(None, r["timed_out_steps"].split(";")):
+            step_timeouts[name] = step_timeouts.get(name, 0) + 1
+    scored = [r["blocks_scored"] for r in runs]
+    scored_counts = {}
+    for count in scored:
+        scored_counts[count] = scored_counts.get(count, 0) + 1
+    return {
+        "runs": len(runs),
+        "completion_rate": mean([1.0 if r["completed"] else 0.0 for r in runs]),
+        "time_ms": {
+            "mean": round(mean(completed_times), 1),
+            "median": percentile(completed_times, 0.5),
+            "p90": percentile(completed_times, 0.9),
+            "max": max(completed_times) if completed_times else None,
+        },
+        "timeout_rate": mean([1.0 if r["timeouts"] else 0.0 for r in runs]),
+        "timeouts_per_run": round(mean([r["timeouts"] for r in runs]), 3),
+        "step_timeout_rates": {name: count / len(runs) for name, count in sorted(step_timeouts.items())},
+        # Steps that timed out in every run: their target or timeout is wrong, not just unlucky
+        "always_timed_out": [name for name, count in sorted(step_timeouts.items()) if count == len(runs)],
+        "pose": {
+            "mean_x_mm": round(mean_x, 1),
+            "mean_y_mm": round(mean_y, 1),
+            "mean_heading_deg": round(mean_heading, 2),
+            "std_x_mm": round(std(xs), 1),
+            "std_y_mm": round(std(ys), 1),
+            "std_heading_deg": round(std(heading_error), 2),
+            "p90_position_error_mm": round(percentile(distances, 0.9), 1),
+            "max_position_error_mm": round(max(distances), 1) if distances else 0.0,
+        },
+        "blocks_scored": {
+            "mean": round(mean(scored), 2),
+            "std": round(std(scored), 2),
+            "min": min(scored) if scored else 0,
+            "max": max(scored) if scored else 0,
+            "distribution": {count: n / len(runs) for count, n in sorted(scored_counts.items())},
+        },
+        "blocks_stored_mean": round(mean([r["blocks_stored"] for r in runs]), 2),
+        "crashes": sum(1 for r in runs if r["crashed"]),
+    }
+
+
+def print_summary(side, summary):
+    pose = summary["pose"]
+    times = summary["time_ms"]
+    print(side + " side: " + str(summary["runs"]) + " runs")
+    print("  completed      %5.1f%%   time mean %.0f ms, median %s, p90 %s, max %s" % (
+        summary["completion_rate"] * 100, times["mean"], times["median"], times["p90"], times["max"]))
+    print("  timeouts       %5.1f%% of runs, %.2f steps per run" % (summary["timeout_rate"] * 100,
+                                                                     summary["timeouts_per_run"]))
+    for name, rate in summary["step_timeout_rates"].items():
+        print("    %5.1f%%  %s" % (rate * 100, name))
+    print("  final pose     x %.0f +/- %.0f mm, y %.0f +/- %.0f mm, heading %.1f +/- %.1f deg" % (
+        pose["mean_x_mm"], pose["std_x_mm"], pose["mean_y_mm"], pose["std_y_mm"],
+        pose["mean_heading_deg"], pose["std_heading_deg"]))
+    print("  position error p90 %.0f mm, max %.0f mm" % (pose["p90_position_error_mm"], pose["max_position_error_mm"]))
+    scored = summary["blocks_scored"]
+    print("  blocks scored  %.2f +/- %.2f (min %d, max %d)" % (scored["mean"], scored["std"], scored["min"], scored["max"]))
+    print("    " + "  ".join("%d: %.1f%%" % (count, rate * 100) for count, rate in scored["distribution"].items()))
+    if summary["blocks_stored_mean"]:
+        print("  blocks left in the robot  %.2f on average" % summary["blocks_stored_mean"])
+    for name in summary["always_timed_out"]:
+        print("  WARNING        \"" + name + "\" timed out in every run; check its target and timeout")
+    if summary["crashes"]:
+        print("  CRASHES        " + str(summary["crashes"]) + " runs had a thread crash")
+
+
+# =============================================================================
+# MAIN
+# =============================================================================
+
+def run_all(sides, runs, seed, scale, settings, workers):
+    """Run ``runs`` simulations per side on a process pool, returning the results in job order."""
+    jobs = []
+    for side in sides:
+        for i in range(runs):
+            jobs.append((len(jobs), side, seed + i, scale, settings))
+    if workers == 1:
+        return [run_once(job) for job in jobs]
+    with multiprocessing.Pool(workers, maxtasksperchild=TASKS_PER_WORKER) as pool:
+        return pool.map(run_once, jobs, chunksize=max(1, min(10, len(jobs) // (workers * 4))))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=1000, help="runs per starting side (default %(default)s)")
+    parser.add_argument("--side", choices=("LEFT", "RIGHT", "BOTH"), default="BOTH")
+    parser.add_argument("--scale", type=float, default=1.0, help="noise scale (default %(default)s)")
+    parser.add_argument("--seed", type=int, default=0, help="seed of the first run (default %(default)s)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="worker processes")
+    parser.add_argument("--set", dest="settings", action="append", type=parse_setting, default=[],
+                        metavar="CLASS.ATTR=VALUE", help="change a setting before the program starts")
+    parser.add_argument("--json", help="save the summary to this JSON file")
+    parser.add_argument("--csv", help="save every run to this CSV file")
+    args = parser.parse_args(argv)
+
+    sides = ("LEFT", "RIGHT") if args.side == "BOTH" else (args.side,)
+    results = run_all(sides, args.runs, args.seed, args.scale, args.settings, args.workers)
+
+    summaries = {}
+    for side in sides:
+        summaries[side] = summarize([r for r in results if r["side"] == side])
+        print_summary(side, summaries[side])
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({"scale": args.scale, "seed": args.seed,
+                       "settings": [c + "." + a + "=" + json.dumps(v) for c, a, v in args.settings],
+                       "sides": summaries}, f, indent=2)
+            f.write("\n")
+    if args.csv:
+        with open(args.csv, "w", newline="") as f:
+            writer = csv.DictWriter(f, fieldnames=list(results[0].keys()))
+            writer.writeheader()
+            writer.writerows(results)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,226 @@
+"""Profile a full simulated match, attributing CPU time and calls to each function.
+
+The match runs the usual way: startup and a few configuration screen touches,
+then autonomous, then driver control with a replayed controller trace. A
+profiler hook on every simulated thread (the main program, control loops,
+event callbacks and the program's own threads) records how long each function
+runs and how often it is called. Time is per-thread CPU time, so a thread
+waiting for its turn is not charged for it.
+
+Usage::
+
+    python tools/profile_match.py                           # Top functions by self time
+    python tools/profile_match.py --collapsed match.folded  # Flame graph input
+    python tools/profile_match.py --driver-ms 30000 --top 40 --trace trace.json
+
+The collapsed file has one ``thread;caller;...;function microseconds`` line per
+stack, the format read by flamegraph.pl, speedscope and inferno.
+
+Frames are labelled ``main:Class.method`` for the robot program,
+``vex:Class.method`` for the device stand-ins and ``py:`` for everything else.
+The simulator itself is not charged to anything, since it doesn't exist on the
+brain: its scheduling, physics and harness, and any code that isn't called by
+the robot program (such as the harness advancing the clock or a tool building
+its input trace). Every recorded stack starts in the robot program. Times are
+CPython times; use them to find hot spots, not to predict times on the brain.
+"""
+
+import argparse
+import os
+import sys
+import threading
+import time
+
+TOOLS_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_ROOT = os.path.dirname(TOOLS_DIR)
+for path in (REPO_ROOT, TOOLS_DIR):
+    if path not in sys.path:
+        sys.path.insert(0, path)
+
+from sim.harness import MAIN_PATH, Simulation  # noqa: E402
+from latency import control_inputs, load_trace, random_trace  # noqa: E402
+import vex  # noqa: E402  (the simulated vex module, importable once sim.harness is loaded)
+
+STARTUP_MS = 3000
+VEX_DIR = os.path.dirname(os.path.abspath(vex.__file__))
+# The simulator's scheduling, physics, harness and OS threads. Their own time is not charged to anything, and they
+# are left out of the call stacks of the functions they call.
+SIM_INTERNAL_FILES = (
+    os.path.join(VEX_DIR, "_kernel.py"), os.path.join(VEX_DIR, "_world.py"),
+    os.path.join(REPO_ROOT, "sim", "harness.py"), os.path.abspath(threading.__file__)
+)
+
+# Configuration screen taps before the match: Other Configs tab, auton mode, Main tab, LEFT, RED
+CONFIG_TOUCHES = ((240, 15), (240, 95), (240, 95), (80, 15), (100, 70), (360, 170))
+
+
+# =============================================================================
+# PROFILER
+# =============================================================================
+
+class _Frame:
+    __slots__ = ("path", "start_ns", "child_ns", "skipped_ns", "ignored")
+
+    def __init__(self, path, start_ns, ignored):
+        self.path = path            # Collapsed stack of the recorded frames up to and including this one
+        self.start_ns = start_ns
+        self.child_ns = 0           # Time spent in recorded callees
+        self.skipped_ns = 0         # Time spent in simulator internals below this frame
+        self.ignored = ignored      # Simulator internals: not recorded and not in the stack path
+
+
+class MatchProfiler:
+    """Collects self time per call stack and call counts per function across all threads."""
+
+    def __init__(self):
+        self.stack_ns = {}      # Collapsed stack -> self time in ns
+        self.calls = {}         # Function label -> call count
+        self.self_ns = {}       # Function label -> self time in ns
+        self.total_ns = {}      # Function label -> time including callees in ns (outermost call only)
+        self._local = threading.local()  # .stack: list of _Frame for the current thread
+        self._labels = {}       # Code object -> label
+        self._lock = threading.Lock()
+
+    def start(self):
+        threading.setprofile(self._profile)
+        sys.setprofile(self._profile)
+
+    def stop(self):
+        sys.setprofile(None)
+        threading.setprofile(None)
+
+    def _label(self, code):
+        label = self._labels.get(code)
+        if label is None:
+            filename = os.path.abspath(code.co_filename)
+            name = getattr(code, "co_qualname", code.co_name)
+            if filename in SIM_INTERNAL_FILES:
+                label = None
+            elif filename == MAIN_PATH:
+                label = "main:" + name
+            elif filename.startswith(VEX_DIR):
+                label = "vex:" + name
+            else:
+                label = "py:" + os.path.splitext(os.path.basename(filename))[0] + "." + name
+            self._labels[code] = label
+        return label
+
+    def _thread_stack(self):
+        stack = getattr(self._local, "stack", None)
+        if stack is None:
+            name = threading.current_thread().name
+            if name.startswith("sim:"):
+                name = name[4:]
+            stack = self._local.stack = [_Frame("thread:" + name, time.thread_time_ns(), False)]
+        return stack
+
+    def _profile(self, frame, event, arg):
+        if event == "call":
+            now = time.thread_time_ns()
+            stack = self._thread_stack()
+            parent = stack[-1]
+            label = self._label(frame.f_code)
+            # Only code called by the robot program is recorded; a stack's first recorded frame is the program's
+            ignored = label is None or (parent.path.find(";") < 0 and not label.startswith("main:"))
+            stack.append(_Frame(parent.path if ignored else parent.path + ";" + label, now, ignored))
+            if not ignored:
+                with self._lock:
+                    self.calls[label] = self.calls.get(label, 0) + 1
+        elif event == "return":
+            now = time.thread_time_ns()
+            stack = getattr(self._local, "stack", None)
+            if not stack or len(stack) < 2:
+                return  # Returning from a frame entered before profiling started
+            entry = stack.pop()
+            parent = stack[-1]
+            if entry.ignored:
+                # Hand the recorded callees to the parent and take the internal time out of the parent's span
+                parent.child_ns += entry.child_ns
+                parent.skipped_ns += now - entry.start_ns - entry.child_ns
+                return
+            elapsed = now - entry.start_ns - entry.skipped_ns
+            self_ns = elapsed - entry.child_ns
+            parent.child_ns += elapsed
+            parent.skipped_ns += entry.skipped_ns
+            label = entry.path.rsplit(";", 1)[1]
+            with self._lock:
+                self.stack_ns[entry.path] = self.stack_ns.get(entry.path, 0) + self_ns
+                self.self_ns[label] = self.self_ns.get(label, 0) + self_ns
+                if (";" + label + ";") not in (parent.path + ";"):
+                    self.total_ns[label] = self.total_ns.get(label, 0) + elapsed
+
+    def write_collapsed(self, path):
+        """Write the collapsed stacks (self time in microseconds) for flame graph tools."""
+        with open(path, "w") as f:
+            for stack, ns in sorted(self.stack_ns.items()):
+                us = ns // 1000
+                if us > 0:
+                    f.write(stack + " " + str(us) + "\n")
+
+    def thread_totals(self):
+        totals = {}
+        for stack, ns in self.stack_ns.items():
+            thread = stack.split(";", 1)[0]
+            totals[thread] = totals.get(thread, 0) + ns
+        return totals
+
+
+# =============================================================================
+# MATCH
+# =============================================================================
+
+def run_match(profiler, auton_ms, driver_ms, trace, seed):
+    sim = Simulation()
+    profiler.start()
+    try:
+        program = sim.load()
+        if trace is None:
+            events_per_control = max(1, int(driver_ms / 1000 / 9 / 1.2))  # Fill most of the driver period
+            trace = random_trace(control_inputs(program.ControllerSettings), events_per_control, seed)
+        sim.advance(STARTUP_MS)
+        for x, y in CONFIG_TOUCHES:
+            sim.touch(x, y)
+            sim.advance(200)
+        sim.run_autonomous(auton_ms)
+        sim.run_driver_control(driver_ms, [e for e in trace if e.time_ms < driver_ms])
+    finally:
+        profiler.stop()
+    if sim.kernel.errors:
+        print("warning: simulated threads crashed: " + repr(sim.kernel.errors), file=sys.stderr)
+    return sim
+
+
+def print_report(profiler, top):
+    total = sum(profiler.self_ns.values()) or 1
+    print("%-58s %10s %10s %9s %6s" % ("function", "self ms", "total ms", "calls", "self%"))
+    ranked = sorted(profiler.self_ns.items(), key=lambda item: item[1], reverse=True)
+    for label, ns in ranked[:top]:
+        print("%-58s %10.1f %10.1f %9d %5.1f%%" % (
+            label[:58], ns / 1e6, profiler.total_ns.get(label, 0) / 1e6, profiler.calls.get(label, 0), ns * 100.0 / total))
+    print()
+    print("%-58s %10s" % ("thread", "ms"))
+    for thread, ns in sorted(profiler.thread_totals().items(), key=lambda item: item[1], reverse=True)[:top]:
+        print("%-58s %10.1f" % (thread[:58], ns / 1e6))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--collapsed", help="write collapsed stacks for a flame graph to this file")
+    parser.add_argument("--top", type=int, default=25, help="functions to list (default %(default)s)")
+    parser.add_argument("--auton-ms", type=int, default=15000)
+    parser.add_argument("--driver-ms", type=int, default=105000)
+    parser.add_argument("--trace", help="JSON controller trace for driver control (see tools/latency.py)")
+    parser.add_argument("--seed", type=int, default=1, help="seed of the random driver trace")
+    args = parser.parse_args(argv)
+
+    profiler = MatchProfiler()
+    trace = load_trace(args.trace) if args.trace else None
+    run_match(profiler, args.auton_ms, args.driver_ms, trace, args.seed)
+    print_report(profiler, args.top)
+    if args.collapsed:
+        profiler.write_collapsed(args.collapsed)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,402 @@
+"""Read the robot's USB serial telemetry: live values, log messages, CSV and plots.
+
+The robot program streams binary frames (see Telemetry in src/main.py): a
+channel list, channel samples every TelemetrySettings.PERIOD_MS and every log
+message. This tool decodes the stream, prints log messages and the latest
+readings, and can save the samples as CSV or plot them live.
+
+Usage::
+
+    python tools/telemetry.py /dev/ttyACM1                  # Print logs and readings
+    python tools/telemetry.py /dev/ttyACM1 --csv run.csv    # ...and save every sample
+    python tools/telemetry.py /dev/ttyACM1 --plot heading,left_rpm,right_rpm --window 20
+    python tools/telemetry.py --sim --csv sim.csv           # A simulated match through a pseudo-terminal
+
+The brain shows up as two serial ports; telemetry is on the user port (usually
+the second one, e.g. /dev/ttyACM1 or the higher numbered COM port). pyserial is
+used to open the port if it is installed; without it only POSIX systems are
+supported. ``--plot`` needs matplotlib.
+
+``--sim`` runs src/main.py in the simulator in real time (or ``--speed``
+times faster), writing its serial output into a pseudo-terminal that is read
+exactly like a robot's port.
+"""
+
+import argparse
+import csv
+import os
+import select
+import sys
+import threading
+import time
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Frame layout constants, matching TelemetryFrame in src/main.py
+SYNC = b"\xa5\x5a"
+SAMPLE = 1
+CHANNELS = 2
+LOG = 3
+FIELDS_SIZE = 7             # Frame type, sequence number and time at the start of each payload
+LEVEL_NAMES = {1: "DEBUG", 2: "INFO", 3: "WARNING", 4: "ERROR", 5: "CRITICAL"}
+
+READ_TIMEOUT_SEC = 0.1
+STATUS_INTERVAL_SEC = 1.0   # How often the latest readings are printed
+
+
+# =============================================================================
+# DECODING
+# =============================================================================
+
+class Frame:
+    """A decoded frame. ``data`` is the readings (SAMPLE), [(name, scale)] (CHANNELS) or (level, message) (LOG)."""
+
+    __slots__ = ("kind", "sequence", "time_ms", "data")
+
+    def __init__(self, kind, sequence, time_ms, data):
+        self.kind = kind
+        self.sequence = sequence
+        self.time_ms = time_ms
+        self.data = data
+
+
+class TelemetryDecoder:
+    """Splits a byte stream into frames, skipping anything that isn't a valid frame (e.g. print() output)."""
+
+    def __init__(self):
+        self.channels = []          # (name, scale) from the last channel list
+        self.frames = 0             # Valid frames decoded
+        self.lost_frames = 0        # Sequence numbers never received: dropped on the robot or lost on the way
+        self.bad_frames = 0         # Frames with a wrong checksum
+        self.skipped_bytes = 0      # Bytes outside valid frames
+        self.unknown_samples = 0    # Samples received before a matching channel list
+        self._buffer = bytearray()
+        self._last_sequence = None
+
+    def feed(self, data):
+        """Add received bytes and return the frames completed by them."""
+        buffer = self._buffer
+        buffer += data
+        frames = []
+        i = 0
+        while True:
+            start = buffer.find(SYNC, i)
+            if start < 0:
+                # Keep a trailing first sync byte, its second byte may be in the next read
+                keep = 1 if buffer[-1:] == SYNC[:1] else 0
+                self.skipped_bytes += len(buffer) - i - keep
+                i = len(buffer) - keep
+                break
+            self.skipped_bytes += start - i
+            i = start
+            if len(buffer) < start + 3:
+                break
+            length = buffer[start + 2]
+            end = start + 3 + length
+            if length < FIELDS_SIZE:
+                self.skipped_bytes += 1
+                i = start + 1
+                continue
+            if len(buffer) < end + 1:
+                break
+            payload = bytes(buffer[start + 3:end])
+            if sum(payload) & 0xFF != buffer[end]:
+                self.bad_frames += 1
+                self.skipped_bytes += 1
+                i = start + 1
+                continue
+            i = end + 1
+            frame = self._decode(payload)
+            if frame is not None:
+                frames.append(frame)
+        del buffer[:i]
+        return frames
+
+    def _decode(self, payload):
+        kind = payload[0]
+        sequence = payload[1] | payload[2] << 8
+        time_ms = int.from_bytes(payload[3:7], "little")
+        body = payload[FIELDS_SIZE:]
+        self.frames += 1
+        if self._last_sequence is not None:
+            self.lost_frames += (sequence - self._last_sequence - 1) & 0xFFFF
+        self._last_sequence = sequence
+
+        if kind == SAMPLE:
+            if len(body) != 2 * len(self.channels) or not self.channels:
+                self.unknown_samples += 1
+                return None
+            readings = []
+            for index, (_, scale) in enumerate(self.channels):
+                value = int.from_bytes(body[2 * index:2 * index + 2], "little", signed=True)
+                readings.append(value / scale)
+            return Frame(SAMPLE, sequence, time_ms, readings)
+        if kind == CHANNELS:
+            channels = []
+            offset = 1
+            for _ in range(body[0] if body else 0):
+                scale, size = body[offset], body[offset + 1]
+                channels.append((body[offset + 2:offset + 2 + size].decode("ascii", "replace"), scale or 1))
+                offset += 2 + size
+            self.channels = channels
+            return Frame(CHANNELS, sequence, time_ms, channels)
+        if kind == LOG and body:
+            return Frame(LOG, sequence, time_ms, (body[0], body[1:].decode("utf-8", "replace")))
+        return None
+
+
+# =============================================================================
+# PORTS
+# =============================================================================
+
+def open_port(path):
+    """Open a serial port (or pty) for reading. Returns a function that returns the bytes received, b"" if
+    nothing arrived within READ_TIMEOUT_SEC, or None once the port is closed."""
+    try:
+        import serial  # pyserial, if installed; it also works on Windows
+    except ImportError:
+        serial = None
+
+    if serial is not None:
+        port = serial.Serial(path, 115200, timeout=READ_TIMEOUT_SEC)
+
+        def read_serial():
+            try:
+                return port.read(max(1, port.in_waiting))
+            except serial.SerialException:
+                return None
+        return read_serial
+
+    import tty
+    fd = os.open(path, os.O_RDONLY | os.O_NOCTTY)
+    tty.setraw(fd)  # No echo, line editing or newline translation
+
+    def read_fd():
+        if not select.select([fd], [], [], READ_TIMEOUT_SEC)[0]:
+            return b""
+        try:
+            data = os.read(fd, 4096)
+        except OSError:
+            data = b""  # Linux reports EIO once the other end of a pty is closed
+        return data or None
+    return read_fd
+
+
+def start_simulated_robot(speed, driver_ms, seed):
+    """Run a simulated match in a thread, writing its serial output to a new pty. Returns (pty path, thread)."""
+    master, slave = os.openpty()
+    path = os.ttyname(slave)
+    os.set_blocking(master, False)  # A full pty loses bytes instead of stopping the simulation
+
+    def run():
+        sys.path.insert(0, REPO_ROOT)
+        sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+        from sim.harness import Simulation
+        from latency import control_inputs, random_trace
+
+        sink = os.fdopen(master, "wb", buffering=0)
+        try:
+            sim = Simulation(serial=sink)
+            start = time.monotonic()
+
+            def pace(now_ms, dt_ms):
+                delay = start + now_ms / 1000.0 / speed - time.monotonic()
+                if delay > 0:
+                    time.sleep(delay)
+            sim.kernel.add_advance_hook(pace)
+
+            program = sim.load()
+            events_per_control = max(1, int(driver_ms / 1000 / 9 / 1.2))
+            trace = random_trace(control_inputs(program.ControllerSettings), events_per_control, seed)
+            sim.advance(3000)
+            sim.run_autonomous()
+            sim.run_driver_control(driver_ms, [e for e in trace if e.time_ms < driver_ms])
+            sim.advance(500)  # Let the last frames go out
+            if sim.serial.bytes_lost:
+                print("simulator: " + str(sim.serial.bytes_lost) + " bytes lost in a full pty", file=sys.stderr)
+        finally:
+            sink.close()
+            os.close(slave)
+
+    thread = threading.Thread(target=run, name="simulated robot", daemon=True)
+    thread.start()
+    return path, thread
+
+
+# =============================================================================
+# OUTPUT
+# =============================================================================
+
+class CsvWriter:
+    """Writes one row per sample. A new header row is written whenever the channel list changes."""
+
+    def __init__(self, path):
+        self.file = open(path, "w", newline="")
+        self.writer = csv.writer(self.file)
+        self.channels = None
+
+    def write(self, frame, channels):
+        if channels != self.channels:
+            self.channels = channels
+            self.writer.writerow(["time_ms", "sequence"] + [name for name, _ in channels])
+        self.writer.writerow([frame.time_ms, frame.sequence] + ["%g" % value for value in frame.data])
+
+    def close(self):
+        self.file.close()
+
+
+class LivePlot:
+    """Matplotlib window showing the last ``window_sec`` seconds of some channels, one axis per channel."""
+
+    def __init__(self, names, window_sec):
+        try:
+            import matplotlib.pyplot as pyplot
+            from matplotlib.animation import FuncAnimation
+        except ImportError:
+            raise SystemExit("--plot needs matplotlib (pip install matplotlib)")
+        self.pyplot = pyplot
+        self.FuncAnimation = FuncAnimation
+        self.names = names
+        self.window_ms = window_sec * 1000
+        self.times = []
+        self.values = {}            # Channel name -> list of readings, aligned with self.times
+        self.lock = threading.Lock()
+
+    def add(self, frame, channels):
+        with self.lock:
+            self.times.append(frame.time_ms)
+            for (name, _), value in zip(channels, frame.data):
+                self.values.setdefault(name, [None] * (len(self.times) - 1)).append(value)
+            for series in self.values.values():
+                if len(series) < len(self.times):
+                    series.append(None)
+            cutoff = frame.time_ms - self.window_ms
+            drop = 0
+            while drop < len(self.times) and self.times[drop] < cutoff:
+                drop += 1
+            if drop:
+                del self.times[:drop]
+                for series in self.values.values():
+                    del series[:drop]
+
+    def show(self, done):
+        """Show the window until it is closed. ``done`` is a threading.Event set when the stream ends."""
+        names = self.names
+        if not names:
+            while not self.values and not done.is_set():
+                time.sleep(0.1)
+            names = list(self.values)
+        figure, axes = self.pyplot.subplots(len(names), 1, sharex=True, squeeze=False)
+        lines = []
+        for axis, name in zip(axes[:, 0], names):
+            axis.set_ylabel(name)
+            lines.append(axis.plot([], [])[0])
+        axes[-1, 0].set_xlabel("time (s)")
+
+        def update(_):
+            with self.lock:
+                times = [t / 1000.0 for t in self.times]
+                for line, axis, name in zip(lines, axes[:, 0], names):
+                    line.set_data(times, self.values.get(name, [None] * len(times)))
+                    axis.relim()
+                    axis.autoscale_view()
+            return lines
+
+        animation = self.FuncAnimation(figure, update, interval=200, cache_frame_data=False)
+        self.pyplot.show()
+        return animation
+
+
+def format_readings(frame, channels):
+    return "%8.2fs  " % (frame.time_ms / 1000.0) + "  ".join(
+        name + " " + ("%g" % value) for (name, _), value in zip(channels, frame.data))
+
+
+def print_log(frame):
+    level, message = frame.data
+    print("%8.2fs  [%s] %s" % (frame.time_ms / 1000.0, LEVEL_NAMES.get(level, "UNKNOWN"), message))
+
+
+# =============================================================================
+# MAIN
+# =============================================================================
+
+def read_stream(read, decoder, on_frame, stop):
+    """Read and decode until the port closes or ``stop`` is set."""
+    while not stop.is_set():
+        data = read()
+        if data is None:
+            return
+        if data:
+            for frame in decoder.feed(data):
+                on_frame(frame)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("port", nargs="?", help="serial port of the brain, e.g. /dev/ttyACM1 or COM4")
+    parser.add_argument("--sim", action="store_true", help="read a simulated robot through a pseudo-terminal")
+    parser.add_argument("--speed", type=float, default=1.0, help="simulation speed, 1 is real time (--sim)")
+    parser.add_argument("--driver-ms", type=int, default=105000, help="driver control length (--sim)")
+    parser.add_argument("--seed", type=int, default=1, help="seed of the driver input trace (--sim)")
+    parser.add_argument("--csv", help="save every sample to this CSV file")
+    parser.add_argument("--plot", nargs="?", const="", metavar="CHANNELS",
+                        help="plot channels live (comma separated, default all); needs matplotlib")
+    parser.add_argument("--window", type=float, default=10.0, help="seconds shown in the plot")
+    parser.add_argument("--quiet", action="store_true", help="don't print log messages and readings")
+    args = parser.parse_args(argv)
+    if args.sim == bool(args.port):
+        parser.error("give a serial port or --sim")
+
+    simulator = None
+    path = args.port
+    if args.sim:
+        path, simulator = start_simulated_robot(args.speed, args.driver_ms, args.seed)
+    read = open_port(path)
+
+    decoder = TelemetryDecoder()
+    csv_writer = CsvWriter(args.csv) if args.csv else None
+    plot = LivePlot([name for name in args.plot.split(",") if name], args.window) if args.plot is not None else None
+    last_status = [0.0]
+
+    def on_frame(frame):
+        if frame.kind == SAMPLE:
+            if csv_writer is not None:
+                csv_writer.write(frame, decoder.channels)
+            if plot is not None:
+                plot.add(frame, decoder.channels)
+            now = time.monotonic()
+            if not args.quiet and now - last_status[0] >= STATUS_INTERVAL_SEC:
+                last_status[0] = now
+                print(format_readings(frame, decoder.channels))
+        elif frame.kind == LOG and not args.quiet:
+            print_log(frame)
+
+    stop = threading.Event()
+    try:
+        if plot is None:
+            read_stream(read, decoder, on_frame, stop)
+        else:
+            done = threading.Event()
+
+            def reader():
+                read_stream(read, decoder, on_frame, stop)
+                done.set()
+            threading.Thread(target=reader, name="reader", daemon=True).start()
+            plot.show(done)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        stop.set()
+        if csv_writer is not None:
+            csv_writer.close()
+
+    if simulator is not None:
+        simulator.join(timeout=1.0)
+    print("%d frames, %d lost, %d bad checksums, %d bytes skipped" % (
+        decoder.frames, decoder.lost_frames, decoder.bad_frames, decoder.skipped_bytes), file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())